@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Кеш готових відповідей
+Зберігає серіалізовані сторінки результатів з обмеженням за пам'яттю
+"""
+
+# Імпорт модуля для впорядкованого словника (порядок використання)
+from collections import OrderedDict
+# Імпорт модуля для синхронізації потоків
+import threading
+# Імпорт модуля для серіалізації ключа
+import json
+# Імпорт модуля для хешування ключа
+import hashlib
+# Імпорт модуля для шляхів дискового кешу
+import os
+# Імпорт стиснутих відповідей (формат записів на диску)
+from Project.compression import CompressedPayload
+# Імпорт дискового кешу другого рівня
+from Project.disk_cache import DiskCache
+
+# Усі створені кеші (назва -> кеш) для статистики
+registry = {}
+
+
+def make_key(*parts):
+    """
+    Нормалізований ключ кешу з довільних частин
+
+    Словники серіалізуються з відсортованими ключами, тому однакові
+    параметри в різному порядку дають однаковий ключ.
+
+    Параметри:
+        *parts: Частини ключа (версія каталогу, маршрут, параметри...)
+
+    Повертає:
+        str: Хеш ключа
+    """
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU кеш серіалізованих відповідей з бюджетом пам'яті
+    При перевищенні бюджету видаляються найдавніше використані записи
+
+    З disk_dir записи (CompressedPayload) також зберігаються на диску:
+    промах у пам'яті перевіряє диск, тому після перезапуску процесу
+    готові відповіді доступні одразу.
+    """
+
+    def __init__(self, name, max_bytes, disk_dir=None, disk_max_bytes=None):
+        """
+        Ініціалізація кешу
+
+        Параметри:
+            name (str): Назва кешу (для статистики)
+            max_bytes (int): Максимальний сумарний розмір записів у байтах
+            disk_dir (str): Директорія дискового кешу (None - лише пам'ять)
+            disk_max_bytes (int): Бюджет дискового кешу в байтах
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        # Другий рівень - файли в disk_dir/<назва кешу>
+        self.disk = DiskCache(os.path.join(disk_dir, name), disk_max_bytes) if disk_dir else None
+        self.disk_hits = 0
+        # Ключ -> відповідь (від найдавнішого до найновішого)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Лічильники звернень
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        registry[name] = self
+
+    def get(self, key):
+        """
+        Повертає збережену відповідь
+
+        Параметри:
+            key (str): Ключ з make_key
+
+        Повертає:
+            object: Відповідь або None якщо її немає в кеші
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            if self.disk is None:
+                self.misses += 1
+                return None
+
+        data = self.disk.get(key)
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        payload = CompressedPayload.from_bytes(data)
+        self._store(key, payload)
+        with self._lock:
+            self.disk_hits += 1
+        return payload
+
+    def put(self, key, payload):
+        """
+        Зберігає відповідь у кеші
+
+        Параметри:
+            key (str): Ключ з make_key
+            payload: Серіалізована відповідь (CompressedPayload, для кешу лише в пам'яті - будь-які дані з len)
+        """
+        self._store(key, payload)
+        if self.disk is not None:
+            self.disk.put(key, payload.to_bytes())
+
+    def _store(self, key, payload):
+        """Зберігає запис у пам'яті з витісненням за бюджетом"""
+        size = len(payload)
+        # Запис, більший за весь бюджет, не кешуємо
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = payload
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Видаляє всі записи"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def reset_stats(self):
+        """
+        Обнуляє лічильники звернень (у воркері після fork)
+        Блокування створюється заново: у момент fork його міг тримати
+        інший потік головного процесу
+        """
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Статистика кешу
+
+        Повертає:
+            dict: Кількість записів, розмір, звернення та витіснення
+        """
+        with self._lock:
+            stats = {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats()
+        return stats
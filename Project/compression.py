@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Стиснення відповідей
+Готові відповіді зберігаються разом зі стиснутими варіантами (gzip, brotli)
+"""
+
+# Імпорт модулів для стиснення gzip
+import gzip
+import zlib
+# Імпорт модуля для заголовка збереженої відповіді
+import json
+
+# Імпорт компонентів Flask
+from flask import Response, request
+# Імпорт вимірювання етапів запиту
+from Project.timing import span
+
+# Brotli використовується лише якщо бібліотеку встановлено
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Відповіді менші за цей розмір не стискаються (в байтах)
+MIN_COMPRESS_BYTES = 1024
+# Рівень стиснення gzip (стиснення виконується один раз на відповідь)
+GZIP_LEVEL = 6
+# Якість стиснення brotli (0-11; вищі рівні занадто повільні для великих сторінок)
+BROTLI_QUALITY = 5
+
+
+def compress(payload):
+    """
+    Стиснуті варіанти відповіді
+
+    Параметри:
+        payload (bytes): Відповідь
+
+    Повертає:
+        dict: Кодування ('br', 'gzip') -> стиснуті байти
+    """
+    if len(payload) < MIN_COMPRESS_BYTES:
+        return {}
+    encodings = {'gzip': gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        encodings['br'] = brotli.compress(payload, quality=BROTLI_QUALITY)
+    return encodings
+
+
+def accepted_encoding(available):
+    """
+    Найкраще кодування з доступних, яке приймає клієнт (Accept-Encoding)
+
+    Параметри:
+        available (iterable): Доступні кодування
+
+    Повертає:
+        str: 'br', 'gzip' або None (без стиснення)
+    """
+    accept = request.accept_encodings
+    for encoding in ('br', 'gzip'):
+        if encoding in available and accept[encoding]:
+            return encoding
+    return None
+
+
+class CompressedPayload:
+    """
+    Відповідь разом з її стиснутими варіантами
+    Стиснення виконується один раз, при створенні
+    """
+
+    def __init__(self, payload, mimetype):
+        """
+        Ініціалізація
+
+        Параметри:
+            payload (bytes): Нестиснута відповідь
+            mimetype (str): MIME тип відповіді
+        """
+        self.payload = payload
+        self.mimetype = mimetype
+        with span('compress'):
+            self.encodings = compress(payload)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Відновлює відповідь, збережену через to_bytes (без повторного стиснення)
+
+        Параметри:
+            data (bytes): Збережені дані
+
+        Повертає:
+            CompressedPayload: Відповідь
+        """
+        header, body = data.split(b'\n', 1)
+        header = json.loads(header)
+        payload = cls.__new__(cls)
+        payload.mimetype = header['mimetype']
+        payload.encodings = {}
+        offset = 0
+        for encoding, size in header['parts']:
+            part = body[offset:offset + size]
+            offset += size
+            if encoding == 'identity':
+                payload.payload = part
+            else:
+                payload.encodings[encoding] = part
+        return payload
+
+    def to_bytes(self):
+        """
+        Серіалізація для дискового кешу: рядок-заголовок JSON, далі всі варіанти
+
+        Повертає:
+            bytes: Дані
+        """
+        parts = [('identity', self.payload)] + list(self.encodings.items())
+        header = {'mimetype': self.mimetype, 'parts': [(name, len(data)) for name, data in parts]}
+        return json.dumps(header).encode('utf-8') + b'\n' + b''.join(data for _, data in parts)
+
+    def __len__(self):
+        """Сумарний розмір усіх варіантів (для бюджету кешу)"""
+        return len(self.payload) + sum(len(data) for data in self.encodings.values())
+
+    def response(self, status=200):
+        """
+        Відповідь Flask у кодуванні, яке приймає клієнт
+
+        Параметри:
+            status (int): HTTP статус
+
+        Повертає:
+            Response: Відповідь
+        """
+        encoding = accepted_encoding(self.encodings)
+        response = Response(self.encodings[encoding] if encoding else self.payload,
+                            status=status, mimetype=self.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+def gzip_stream(chunks):
+    """
+    Стискає потік частин відповіді на льоту
+
+    Кожна частина відправляється одразу після стиснення (Z_SYNC_FLUSH),
+    тому в пам'яті тримається лише поточна частина та вікно zlib.
+
+    Параметри:
+        chunks (iterable): Частини відповіді (str або bytes)
+
+    Повертає:
+        generator: Стиснуті частини у форматі gzip
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_streaming(response):
+    """
+    Вмикає стиснення gzip для потокової відповіді, якщо клієнт його приймає
+
+    Параметри:
+        response (Response): Потокова відповідь
+
+    Повертає:
+        Response: Та сама відповідь
+    """
+    response.vary.add('Accept-Encoding')
+    if accepted_encoding(('gzip',)) == 'gzip':
+        response.response = gzip_stream(response.response)
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
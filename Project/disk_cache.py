@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Дисковий кеш другого рівня
+Зберігає готові відповіді та дані у директорії cache/ між перезапусками
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+# Імпорт модуля для синхронізації потоків
+import threading
+# Імпорт модуля для тимчасових файлів (атомарний запис)
+import tempfile
+
+
+class DiskCache:
+    """
+    Кеш байтів у файлах з бюджетом розміру
+
+    Ключ - хеш з make_key (версія каталогу та параметри), тому файл
+    ніколи не перезаписується іншим вмістом. Запис атомарний: дані
+    пишуться у тимчасовий файл і перейменовуються. При перевищенні
+    бюджету видаляються найдавніше використані файли (час модифікації
+    оновлюється при кожному читанні). Директорію можуть спільно
+    використовувати кілька процесів.
+    """
+
+    def __init__(self, directory, max_bytes):
+        """
+        Ініціалізація кешу
+
+        Параметри:
+            directory (str): Директорія для файлів кешу
+            max_bytes (int): Максимальний сумарний розмір файлів у байтах
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Оцінка сумарного розміру (інші процеси теж пишуть, тому вона приблизна);
+        # рахується при першому зверненні - імпорт модуля з кешем не чіпає диск
+        self._size = None
+
+    def _path(self, key):
+        """Шлях до файлу запису"""
+        return os.path.join(self.directory, f'{key}.bin')
+
+    def _files(self):
+        """Файли кешу: (шлях, розмір, час використання)"""
+        files = []
+        try:
+            entries = os.scandir(self.directory)
+        except FileNotFoundError:
+            # Директорія створюється лише з першим записом
+            return files
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith('.bin'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _current_size(self):
+        """Оцінка сумарного розміру (при першому зверненні - за наявними файлами, під _lock)"""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._files())
+        return self._size
+
+    def get(self, key):
+        """
+        Читає запис
+
+        Параметри:
+            key (str): Ключ з make_key
+
+        Повертає:
+            bytes: Дані або None якщо запису немає
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Позначаємо запис як нещодавно використаний
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key, data):
+        """
+        Атомарно записує запис
+
+        Параметри:
+            key (str): Ключ з make_key
+            data (bytes): Дані
+        """
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Диск недоступний або заповнений - кеш просто не використовується
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._size = self._current_size() + len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Видаляє найдавніше використані файли до 90% бюджету (під _lock)"""
+        files = sorted(self._files(), key=lambda item: item[2])
+        size = sum(item[1] for item in files)
+        target = self.max_bytes * 0.9
+        for path, file_size, _ in files:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+        self._size = size
+
+    def clear(self):
+        """Видаляє всі записи"""
+        with self._lock:
+            for path, _, _ in self._files():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+
+    def stats(self):
+        """
+        Статистика кешу
+
+        Повертає:
+            dict: Розмір та бюджет
+        """
+        with self._lock:
+            return {'bytes': self._current_size(), 'max_bytes': self.max_bytes}
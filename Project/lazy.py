@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Відкладене створення об'єктів та імпорт модулів
+Важкі залежності (pandas, numpy) завантажуються лише при першому використанні
+"""
+
+# Імпорт модуля для імпорту за назвою
+import importlib
+# Імпорт модуля для синхронізації потоків
+import threading
+
+
+class LazyObject:
+    """
+    Замісник об'єкта, який створюється при першому зверненні до атрибута
+
+    Використовується для сервісів, виконавців та модулів на рівні модуля
+    blueprint: імпорт blueprint нічого не створює, а перше звернення
+    створює об'єкт один раз (потокобезпечно) і далі лише передає атрибути.
+    """
+
+    def __init__(self, factory):
+        """
+        Ініціалізація замісника
+
+        Параметри:
+            factory (callable): Функція без аргументів, що створює об'єкт
+        """
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _resolve(self):
+        """Створює об'єкт при першому виклику"""
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._target = self._factory()
+        return target
+
+    def __getattr__(self, name):
+        """Передає звернення до створеного об'єкта"""
+        return getattr(self._resolve(), name)
+
+
+def lazy_import(name):
+    """
+    Модуль, який імпортується при першому зверненні до атрибута
+
+    Параметри:
+        name (str): Повна назва модуля
+
+    Повертає:
+        LazyObject: Замісник модуля (np = lazy_import('numpy'); np.zeros(3))
+    """
+    return LazyObject(lambda: importlib.import_module(name))
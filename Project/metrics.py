@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+Метрики додатку у форматі Prometheus
+Кожен процес веде власні лічильники та періодично записує їх у спільну
+директорію; маршрут /metrics підсумовує файли всіх воркерів gunicorn
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+# Імпорт модуля для синхронізації потоків
+import threading
+# Імпорт модуля для вимірювання часу
+import time
+# Імпорт модуля для серіалізації стану процесу
+import json
+# Імпорт модуля для тимчасових файлів (атомарний запис)
+import tempfile
+
+# Імпорт компонентів Flask
+from flask import Response, request, g
+# Імпорт налаштувань проекту
+from Project.settings import Config
+# Імпорт кешів відповідей (статистика звернень)
+from Project.cache import registry as cache_registry
+# Імпорт пулів потоків (глибина черги)
+from Project.timing import executors
+
+# Межі інтервалів гістограм (в секундах)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REFRESH_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Назва метрики -> (тип, опис, межі гістограми)
+METRICS = {
+    'http_requests_total': ('counter', 'Кількість HTTP запитів за маршрутом, методом та статусом', None),
+    'http_request_duration_seconds': ('histogram', 'Тривалість обробки HTTP запиту за маршрутом', LATENCY_BUCKETS),
+    'catalog_refresh_duration_seconds': ('histogram', 'Тривалість оновлення каталогу за джерелом та результатом', REFRESH_BUCKETS),
+    'cache_hits_total': ('counter', 'Влучання в кеш (у пам\'яті)', None),
+    'cache_disk_hits_total': ('counter', 'Влучання в дисковий кеш другого рівня', None),
+    'cache_misses_total': ('counter', 'Промахи кешу', None),
+    'cache_evictions_total': ('counter', 'Витіснення записів з кешу', None),
+    'cache_hit_ratio': ('gauge', 'Частка влучань у кеш (разом з дисковим рівнем)', None),
+    'cache_bytes': ('gauge', 'Розмір записів кешу в пам\'яті', None),
+    'cache_entries': ('gauge', 'Кількість записів кешу в пам\'яті', None),
+    'executor_queue_depth': ('gauge', 'Задачі в черзі пулу потоків', None),
+    'executor_running_tasks': ('gauge', 'Задачі, що зараз виконуються в пулі потоків', None),
+    'executor_tasks_total': ('counter', 'Завершені задачі пулу потоків', None),
+}
+
+
+def _key(name, labels):
+    """Ключ серії: назва та відсортовані мітки"""
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _pid_alive(pid):
+    """Чи працює процес (файли завершених воркерів видаляються)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """
+    Метрики одного процесу
+
+    Лічильники та гістограми змінюються в пам'яті під блокуванням.
+    Значення з інших об'єктів (кеші, пули потоків) збираються функціями
+    collect лише під час запису стану. Стан записується атомарно у файл
+    <pid>.json не частіше ніж раз на Config.METRICS_FLUSH_INTERVAL.
+    Файли процесів, що завершилися, видаляються при підсумовуванні
+    (Prometheus сприймає зменшення лічильника як його скидання).
+    """
+
+    def __init__(self, directory):
+        """
+        Ініціалізація реєстру
+
+        Параметри:
+            directory (str): Спільна директорія файлів воркерів
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        # Ключ серії -> значення лічильника
+        self._counters = {}
+        # Ключ серії -> [кількість у кожному інтервалі..., сума, кількість]
+        self._histograms = {}
+        # Функції, що повертають поточні значення: [(назва, мітки, значення)]
+        self._collectors = []
+        # Функції, що обнуляють лічильники, які веде не реєстр (кеші)
+        self._resets = []
+        self._last_flush = 0.0
+
+    def inc(self, name, labels, amount=1):
+        """
+        Збільшує лічильник
+
+        Параметри:
+            name (str): Назва метрики з METRICS
+            labels (dict): Мітки серії
+            amount (float): Приріст
+        """
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        """
+        Додає спостереження до гістограми
+
+        Параметри:
+            name (str): Назва метрики з METRICS
+            labels (dict): Мітки серії
+            value (float): Значення (секунди)
+        """
+        buckets = METRICS[name][2]
+        key = _key(name, labels)
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for position, bound in enumerate(buckets):
+                if value <= bound:
+                    series[position] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def register_collector(self, collector, reset=None):
+        """
+        Додає функцію, яка повертає поточні значення метрик
+
+        Параметри:
+            collector (callable): collector() -> [(назва, мітки, значення)]
+            reset (callable): Обнуляє лічильники, які повертає collector
+                (викликається після fork, див. reset)
+        """
+        self._collectors.append(collector)
+        if reset is not None:
+            self._resets.append(reset)
+
+    def _state(self):
+        """Стан процесу для запису у файл"""
+        with self._lock:
+            counters = [[name, labels, value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, labels, list(series)] for (name, labels), series in self._histograms.items()]
+        collected = []
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                collected.append(list(_key(name, labels)) + [value])
+        return {'counters': counters, 'histograms': histograms, 'collected': collected}
+
+    def flush(self):
+        """Атомарно записує стан процесу у файл <pid>.json"""
+        self._last_flush = time.time()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._state(), f)
+            os.replace(tmp_path, os.path.join(self.directory, f'{os.getpid()}.json'))
+        except OSError as e:
+            print(f"⚠ Не вдалося записати метрики: {e}")
+
+    def maybe_flush(self):
+        """Записує стан, якщо з попереднього запису минув інтервал"""
+        if time.time() - self._last_flush >= Config.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def reset(self):
+        """
+        Обнуляє метрики процесу після fork
+        Воркер не повинен повторно звітувати значення, успадковані від
+        головного процесу (той записує їх у власний файл) - це стосується
+        і лічильників кешів, які обнуляють функції reset колекторів
+        """
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+        for reset in self._resets:
+            reset()
+        # pid міг належати процесу, що вже завершився - його файл не наш
+        try:
+            os.remove(os.path.join(self.directory, f'{os.getpid()}.json'))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Видаляє файли всіх процесів (при запуску головного процесу)"""
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                os.remove(entry.path)
+
+    def _merge(self):
+        """Підсумовує стан усіх воркерів: (лічильники, гістограми, зібрані значення)"""
+        self.flush()
+        counters, histograms, collected = {}, {}, {}
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.json'):
+                continue
+            if not _pid_alive(int(entry.name[:-len('.json')])):
+                # Воркер завершився: його значення більше не звітуються,
+                # а новий процес з тим самим pid не успадкує їх
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(entry.path, encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in state['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, series in state['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                total = histograms.setdefault(key, [0] * len(series))
+                histograms[key] = [a + b for a, b in zip(total, series)]
+            for name, labels, value in state['collected']:
+                key = (name, tuple(map(tuple, labels)))
+                collected[key] = collected.get(key, 0) + value
+        return counters, histograms, collected
+
+    def render(self):
+        """
+        Метрики всіх воркерів у текстовому форматі Prometheus
+
+        Повертає:
+            str: Текст для маршруту /metrics
+        """
+        counters, histograms, collected = self._merge()
+        counters.update(collected)
+
+        # Частка влучань рахується з підсумованих лічильників
+        for (name, labels), hits in list(counters.items()):
+            if name != 'cache_hits_total':
+                continue
+            hits += counters.get(('cache_disk_hits_total', labels), 0)
+            misses = counters.get(('cache_misses_total', labels), 0)
+            if hits + misses:
+                counters[('cache_hit_ratio', labels)] = hits / (hits + misses)
+
+        series = {}
+        for (name, labels), value in counters.items():
+            series.setdefault(name, []).append((labels, value))
+        for (name, labels), value in histograms.items():
+            series.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, description, buckets) in METRICS.items():
+            if name not in series:
+                continue
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in sorted(series[name]):
+                if kind != 'histogram':
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets, value):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", _number(bound)),))} {cumulative}')
+                lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {value[-1]}')
+                lines.append(f'{name}_sum{_labels(labels)} {_number(value[-2])}')
+                lines.append(f'{name}_count{_labels(labels)} {value[-1]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    """Мітки серії у форматі {a="1",b="2"}"""
+    if not labels:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+
+def _number(value):
+    """Число у форматі Prometheus"""
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _cache_metrics():
+    """Лічильники всіх кешів відповідей"""
+    samples = []
+    for name, cache in list(cache_registry.items()):
+        stats = cache.stats()
+        labels = {'cache': name}
+        samples += [
+            ('cache_hits_total', labels, stats['hits']),
+            ('cache_disk_hits_total', labels, stats['disk_hits']),
+            ('cache_misses_total', labels, stats['misses']),
+            ('cache_evictions_total', labels, stats['evictions']),
+            ('cache_bytes', labels, stats['bytes']),
+            ('cache_entries', labels, stats['entries']),
+        ]
+    return samples
+
+
+def _reset_cache_metrics():
+    """Обнуляє лічильники всіх кешів відповідей"""
+    for cache in list(cache_registry.values()):
+        cache.reset_stats()
+
+
+def _executor_metrics():
+    """Глибина черги та задачі пулів (лічильники ContextThreadPoolExecutor)"""
+    samples = []
+    for name, executor in list(executors.items()):
+        stats = executor.stats()
+        labels = {'executor': name}
+        samples += [
+            ('executor_queue_depth', labels, stats['queued']),
+            ('executor_running_tasks', labels, stats['running']),
+            ('executor_tasks_total', labels, stats['finished']),
+        ]
+    return samples
+
+
+def _reset_executor_metrics():
+    """Обнуляє лічильники задач усіх пулів"""
+    for executor in list(executors.values()):
+        executor.reset_stats()
+
+
+# Метрики поточного процесу
+metrics = MetricsRegistry(Config.METRICS_DIR)
+metrics.register_collector(_cache_metrics, reset=_reset_cache_metrics)
+metrics.register_collector(_executor_metrics, reset=_reset_executor_metrics)
+os.register_at_fork(after_in_child=metrics.reset)
+
+
+def _start_request():
+    """Час початку запиту (before_request)"""
+    g.metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    """Кількість та тривалість запиту за маршрутом (after_request)"""
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    # Назва маршруту замість шляху - кількість серій не залежить від параметрів
+    route = request.endpoint or 'unmatched'
+    metrics.inc('http_requests_total', {'route': route, 'method': request.method,
+                                        'status': response.status_code})
+    metrics.observe('http_request_duration_seconds', {'route': route},
+                    time.perf_counter() - started)
+    metrics.maybe_flush()
+    return response
+
+
+def metrics_view():
+    """
+    Метрики у форматі Prometheus
+
+    Маршрут: /metrics
+    Метод: GET
+    """
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app):
+    """
+    Вмикає облік запитів та маршрут /metrics
+
+    Параметри:
+        app (Flask): Додаток
+    """
+    app.before_request(_start_request)
+    app.after_request(_record_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
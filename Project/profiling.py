@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Профілювання окремих запитів
+Семплюючий профайлер збирає стеки потоків запиту (разом з потоками пулів,
+що виконують його задачі) і зберігає їх у форматі collapsed stacks
+(вхід для flamegraph.pl та speedscope) у директорії cache/profiles
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+# Імпорт модуля для доступу до стеків потоків
+import sys
+# Імпорт модуля для синхронізації потоків
+import threading
+# Імпорт модуля для вимірювання часу
+import time
+# Імпорт модуля для безпечного порівняння токена
+import hmac
+# Імпорт модуля для змінних контексту (профіль поточного запиту)
+import contextvars
+# Імпорт лічильника стеків
+from collections import Counter
+# Імпорт модуля для роботи з датою
+from datetime import datetime
+
+# Імпорт компонентів Flask
+from flask import request
+# Імпорт налаштувань проекту
+from Project.settings import Config
+# Імпорт реєстрації обгорток задач пулів потоків
+from Project.timing import register_task_wrapper
+
+# Профіль поточного запиту (None - запит не профілюється)
+_profile = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """
+    Семпли одного запиту: згорнутий стек -> кількість
+    """
+
+    def __init__(self, forced):
+        """
+        Ініціалізація профілю
+
+        Параметри:
+            forced (bool): Профіль запитано явно (зберігається незалежно від тривалості)
+        """
+        self.forced = forced
+        self.started = time.perf_counter()
+        # Потоки, які зараз виконують роботу запиту
+        self.threads = {threading.get_ident()}
+        self.stacks = Counter()
+        self.samples = 0
+
+
+def _collapse(frame):
+    """Стек кадру у форматі collapsed: 'модуль:функція;...' від кореня"""
+    names = []
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '?')
+        names.append(f'{module}:{frame.f_code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Sampler:
+    """
+    Фоновий потік, який семплює стеки потоків активних профілів
+
+    Один потік на процес; запускається при першому профілі (тобто вже
+    у воркері після fork) і простоює, поки немає активних запитів.
+    """
+
+    def __init__(self, interval):
+        """
+        Ініціалізація
+
+        Параметри:
+            interval (float): Інтервал між семплами в секундах
+        """
+        self.interval = interval
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self, profile):
+        """Додає профіль до семплювання"""
+        with self._lock:
+            self._active.add(profile)
+            # Після fork потік головного процесу у воркері вже не працює
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def active(self):
+        """Кількість профілів, що зараз семплюються"""
+        with self._lock:
+            return len(self._active)
+
+    def stop(self, profile):
+        """Прибирає профіль із семплювання"""
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self):
+        """Цикл семплювання"""
+        while True:
+            with self._lock:
+                profiles = list(self._active)
+                if not profiles:
+                    self._wakeup.clear()
+            if not profiles:
+                self._wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            for profile in profiles:
+                profile.samples += 1
+                for ident in list(profile.threads):
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        profile.stacks[_collapse(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+# Семплер поточного процесу
+sampler = Sampler(Config.PROFILER_SAMPLE_INTERVAL)
+# Час останнього автоматичного збереження (обмеження частоти)
+_last_capture = 0.0
+_capture_lock = threading.Lock()
+
+
+def run_tracked(fn, *args, **kwargs):
+    """
+    Виконує задачу пулу потоків як частину профілю запиту, що її створив
+    (обгортка задач ContextThreadPoolExecutor, викликається в контексті запиту)
+    """
+    profile = _profile.get()
+    if profile is None:
+        return fn(*args, **kwargs)
+    ident = threading.get_ident()
+    profile.threads.add(ident)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.threads.discard(ident)
+
+
+# Потоки пулів, що виконують задачі запиту, семплюються разом з ним
+register_task_wrapper(run_tracked)
+
+
+def _requested():
+    """
+    Чи запитав адміністратор профіль (заголовок X-Profile)
+    Токен не приймається з рядка запиту: URL зберігається в журналах доступу,
+    журналах проксі/CDN та передається в заголовку Referer
+    """
+    token = Config.PROFILER_TOKEN
+    if not token:
+        return False
+    supplied = request.headers.get('X-Profile')
+    # compare_digest приймає рядки лише з ASCII - порівнюємо байти
+    return bool(supplied) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+def _allow_capture():
+    """Обмеження частоти автоматичних профілів повільних запитів"""
+    global _last_capture
+    with _capture_lock:
+        now = time.time()
+        if now - _last_capture < Config.PROFILER_CAPTURE_INTERVAL:
+            return False
+        _last_capture = now
+        return True
+
+
+def save_profile(profile, elapsed):
+    """
+    Зберігає профіль у файл .folded і видаляє найстаріші файли
+
+    Параметри:
+        profile (RequestProfile): Профіль запиту
+        elapsed (float): Тривалість запиту в секундах
+
+    Повертає:
+        str: Ім'я файлу або None якщо записати не вдалося
+    """
+    directory = Config.PROFILER_DIR
+    endpoint = (request.endpoint or 'unmatched').replace('/', '_')
+    name = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{endpoint}-{elapsed * 1000:.0f}ms.folded"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            # Параметр profile (старий спосіб передати токен) не потрапляє у файл
+            query = '&'.join(f'{key}={value}' for key, value in request.args.items(multi=True)
+                             if key != 'profile')
+            f.write(f'# {request.method} {request.path}?{query} {elapsed * 1000:.1f}ms '
+                    f'samples={profile.samples} interval={Config.PROFILER_SAMPLE_INTERVAL}s\n')
+            for stack, count in profile.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        files = sorted((entry for entry in os.scandir(directory) if entry.name.endswith('.folded')),
+                       key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in files[Config.PROFILER_KEEP:]:
+            os.remove(entry.path)
+    except OSError as e:
+        print(f"⚠ Не вдалося зберегти профіль: {e}")
+        return None
+    return name
+
+
+def _start_profile():
+    """Починає семплювання запиту (before_request)"""
+    forced = _requested()
+    if not forced and Config.PROFILER_SLOW_THRESHOLD is None:
+        return
+    # Автоматичні профілі обмежені, щоб семплювання не навантажувало воркер
+    if not forced and sampler.active() >= Config.PROFILER_MAX_ACTIVE:
+        return
+    profile = RequestProfile(forced)
+    _profile.set(profile)
+    sampler.start(profile)
+
+
+def _complete():
+    """
+    Зупиняє профіль запиту та зберігає його, якщо він запитаний явно
+    або запит перевищив Config.PROFILER_SLOW_THRESHOLD
+
+    Повертає:
+        str: Ім'я збереженого файлу або None
+    """
+    profile = _profile.get()
+    if profile is None:
+        return None
+    _profile.set(None)
+    sampler.stop(profile)
+    elapsed = time.perf_counter() - profile.started
+    threshold = Config.PROFILER_SLOW_THRESHOLD
+    if profile.forced or (threshold is not None and elapsed >= threshold and _allow_capture()):
+        return save_profile(profile, elapsed)
+    return None
+
+
+def _finish_profile(response):
+    """Завершує профіль звичайної відповіді (after_request)"""
+    # Потокова відповідь ще формується - профіль завершується в teardown
+    if response.is_streamed:
+        return response
+    profile = _profile.get()
+    name = _complete()
+    # Ім'я файлу повідомляється лише адміністратору, який запитав профіль
+    if name is not None and profile.forced:
+        response.headers['X-Profile-File'] = name
+    return response
+
+
+def _teardown_profile(exception=None):
+    """Завершує профіль потокової відповіді або запиту з помилкою (teardown_request)"""
+    _complete()
+
+
+def init_profiling(app):
+    """
+    Вмикає профілювання запитів за токеном та автоматичне для повільних
+
+    Параметри:
+        app (Flask): Додаток
+    """
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_teardown_profile)
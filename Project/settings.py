@@ -18,6 +18,11 @@ class Config:
     # Береться з змінних оточення або використовується значення за замовчуванням
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'exoplanet-habitability-secret-key'
     
+    # Режим відладки сервера розробки (python app.py): автоперезавантаження та
+    # інтерактивний відладчик Werkzeug. Лише явно через FLASK_DEBUG=1 -
+    # відладчик дозволяє виконувати код на сервері
+    DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+    
     # URL API NASA Exoplanet Archive для отримання даних про екзопланети
     EXOPLANET_API_URL = 'https://exoplanetarchive.ipac.caltech.edu/TAP/sync'
     
@@ -27,6 +32,69 @@ class Config:
     # Шлях до файлу з кешованими даними про планети
     DATA_CACHE_FILE = 'data/exoplanets_cache.csv'
     
+    # Завантажувати всі набори параметрів з таблиці ps (default_flag = 0 та 1)
+    # False - лише основний набір кожної планети (default_flag = 1)
+    INGEST_ALL_PARAMETER_SETS = False
+    
+    # Бюджет пам'яті кешу готових сторінок списку планет (в байтах)
+    RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    
+    # Бюджет пам'яті кешу готових відповідей агрегатів та топ-списків (в байтах)
+    RESPONSE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+    
+    # Бюджет пам'яті впорядкованих результатів запитів для наступних сторінок (в байтах)
+    QUERY_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    
+    # Директорія дискового кешу другого рівня (готові відповіді переживають перезапуск)
+    DISK_CACHE_DIR = 'cache'
+    # Бюджет дискового кешу для кожного кешу відповідей (в байтах)
+    DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    # Директорія збережених знімків каталогу (оброблені дані та індекси)
+    SNAPSHOT_DIR = os.path.join(DISK_CACHE_DIR, 'snapshots')
+    # Кількість останніх файлів знімків, які залишаються на диску
+    SNAPSHOT_KEEP = 2
+    
+    # Заголовок Server-Timing з тривалістю етапів кожного запиту
+    SERVER_TIMING = True
+    # Параметр запиту, з яким JSON-відповідь містить блок "timing" (?timing=1)
+    SERVER_TIMING_DEBUG_PARAM = 'timing'
+    
+    # Спільна директорія метрик воркерів (маршрут /metrics підсумовує їх файли)
+    METRICS_DIR = os.environ.get('METRICS_DIR') or os.path.join(DISK_CACHE_DIR, 'metrics')
+    # Як часто воркер записує свої метрики у файл (в секундах)
+    METRICS_FLUSH_INTERVAL = 5
+    
+    # Токен адміністратора для профілю окремого запиту (лише заголовок X-Profile -
+    # рядок запиту потрапляє в журнали доступу, проксі та Referer)
+    # Без токена профілювання на вимогу вимкнене
+    PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN')
+    # Запити, довші за поріг (в секундах), профілюються автоматично (None - вимкнено)
+    # Увімкнений поріг семплює кожен запит, тому за замовчуванням вимкнений
+    PROFILER_SLOW_THRESHOLD = None
+    # Максимум запитів, які одночасно семплюються для автоматичного профілю
+    PROFILER_MAX_ACTIVE = 4
+    # Мінімальний інтервал між автоматичними профілями повільних запитів (в секундах)
+    PROFILER_CAPTURE_INTERVAL = 60
+    # Інтервал семплювання стеків (в секундах)
+    PROFILER_SAMPLE_INTERVAL = 0.01
+    # Директорія профілів (collapsed stacks для flamegraph.pl / speedscope)
+    PROFILER_DIR = os.path.join(DISK_CACHE_DIR, 'profiles')
+    # Кількість останніх профілів, які залишаються на диску
+    PROFILER_KEEP = 50
+    
+    # Бюджет часу запуску додатку в секундах (без прогріву каталогу)
+    STARTUP_TIME_BUDGET = 1.0
+    
+    # Скільки секунд після оновлення каталогу старий знімок обслуговує відкриті курсори
+    CURSOR_GRACE_PERIOD = 15 * 60
+    
+    # Заголовок Cache-Control для відповідей з даними каталогу (з ETag та Last-Modified)
+    HTTP_CACHE_CONTROL = 'public, max-age=300'
+    
+    # Метод зведення наборів параметрів однієї планети
+    # 'most_precise' - найточніше значення, 'weighted_mean' - зважене середнє
+    PARAMETER_REDUCTION = 'most_precise'
+    
     # Ваги для розрахунку індексу придатності до життя
     # Кожен параметр має свою вагу від 0 до 1, сума всіх ваг = 1.0
     HABITABILITY_WEIGHTS = {
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Вимірювання часу етапів запиту
+Етапи (знімок, фільтр, сортування, серіалізація, шаблон...) віддаються
+в заголовку Server-Timing та, за бажанням, у JSON відповіді
+"""
+
+# Імпорт модуля для змінних контексту (таймер поточного запиту)
+import contextvars
+# Імпорт модуля для порожнього контекстного менеджера
+import contextlib
+# Імпорт модуля для збереження метаданих функції та часткового застосування
+from functools import wraps, partial
+# Імпорт модуля для вимірювання часу
+import time
+# Імпорт модуля для серіалізації блоку налагодження
+import json
+# Імпорт модуля для синхронізації потоків (лічильники задач пулу)
+import threading
+# Імпорт пулу потоків
+from concurrent.futures import ThreadPoolExecutor
+
+# Імпорт компонентів Flask
+from flask import request, before_render_template, template_rendered
+# Імпорт налаштувань проекту
+from Project.settings import Config
+
+# Таймер поточного запиту (None - вимірювання вимкнене або поза запитом)
+_timer = contextvars.ContextVar('request_timer', default=None)
+
+# Порожній етап, коли вимірювання вимкнене (без жодних витрат на час)
+_NO_SPAN = contextlib.nullcontext()
+
+
+class RequestTimer:
+    """
+    Тривалість етапів одного запиту
+    Повторні етапи з однаковою назвою підсумовуються
+    """
+
+    def __init__(self):
+        """Ініціалізація таймера на початку запиту"""
+        self.started = time.perf_counter()
+        # Назва етапу -> сумарна тривалість у секундах (у порядку появи)
+        self.spans = {}
+        # Початок рендерингу шаблону (сигнали Flask)
+        self.render_started = None
+
+    def add(self, name, seconds):
+        """
+        Додає тривалість етапу
+
+        Параметри:
+            name (str): Назва етапу
+            seconds (float): Тривалість у секундах
+        """
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def milliseconds(self):
+        """
+        Етапи в мілісекундах разом із загальним часом
+
+        Повертає:
+            dict: Назва етапу -> мілісекунди (останній - total)
+        """
+        timings = {name: round(seconds * 1000, 2) for name, seconds in self.spans.items()}
+        timings['total'] = round((time.perf_counter() - self.started) * 1000, 2)
+        return timings
+
+    def header(self):
+        """
+        Значення заголовка Server-Timing
+
+        Повертає:
+            str: Наприклад 'snapshot;dur=0.12, filter;dur=1.50, total;dur=4.20'
+        """
+        return ', '.join(f'{name};dur={ms:.2f}' for name, ms in self.milliseconds().items())
+
+
+class _Span:
+    """Контекстний менеджер одного етапу"""
+
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def span(name):
+    """
+    Вимірює етап запиту: with span('filter'): ...
+
+    Параметри:
+        name (str): Назва етапу (токен для Server-Timing)
+
+    Повертає:
+        Контекстний менеджер (порожній, якщо вимірювання вимкнене)
+    """
+    timer = _timer.get()
+    if timer is None:
+        return _NO_SPAN
+    return _Span(timer, name)
+
+
+def timed(name):
+    """
+    Декоратор: увесь виклик функції - один етап запиту
+
+    Параметри:
+        name (str): Назва етапу
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Створені пули потоків: назва (thread_name_prefix) -> пул (для метрик черги)
+executors = {}
+
+# Обгортки задач пулів (реєструють інші модулі, наприклад профайлер запитів)
+_task_wrappers = []
+
+
+def register_task_wrapper(wrapper):
+    """
+    Додає обгортку, через яку виконуються задачі ContextThreadPoolExecutor
+
+    Параметри:
+        wrapper (callable): wrapper(fn, *args, **kwargs) - викликає задачу fn
+            у потоці пулу (в контексті запиту, що її створив)
+    """
+    _task_wrappers.append(wrapper)
+
+
+def _run_task(fn, *args, **kwargs):
+    """Виконує задачу пулу через зареєстровані обгортки"""
+    for wrapper in _task_wrappers:
+        fn = partial(wrapper, fn)
+    return fn(*args, **kwargs)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Пул потоків, задачі якого виконуються в контексті запиту,
+    що їх створив (етапи у потоках пулу потрапляють у таймер запиту)
+
+    Пул рахує поставлені, розпочаті та завершені задачі (для метрик
+    черги без звернення до внутрішніх полів ThreadPoolExecutor).
+    """
+
+    def __init__(self, max_workers=None, thread_name_prefix='', **kwargs):
+        super().__init__(max_workers, thread_name_prefix, **kwargs)
+        # Назва пулу в метриках
+        self.name = thread_name_prefix or 'executor'
+        self._stats_lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.finished = 0
+        executors[self.name] = self
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._stats_lock:
+            self.submitted += 1
+        try:
+            future = super().submit(contextvars.copy_context().run, self._run, fn, *args, **kwargs)
+        except RuntimeError:
+            # Пул уже зупинено - задача не потрапила в чергу
+            self._forget()
+            raise
+        future.add_done_callback(self._cancelled)
+        return future
+
+    def _forget(self):
+        """Прибирає з обліку задачу, яка так і не почнеться"""
+        with self._stats_lock:
+            self.submitted -= 1
+
+    def _cancelled(self, future):
+        """Скасована задача більше не чекає в черзі"""
+        if future.cancelled():
+            self._forget()
+
+    def _run(self, fn, *args, **kwargs):
+        """Виконує задачу в потоці пулу з обліком розпочатих та завершених"""
+        with self._stats_lock:
+            self.started += 1
+        try:
+            return _run_task(fn, *args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self.finished += 1
+
+    def stats(self):
+        """
+        Лічильники задач пулу
+
+        Повертає:
+            dict: queued (чекають у черзі), running (виконуються), finished (завершено)
+        """
+        with self._stats_lock:
+            return {
+                'queued': self.submitted - self.started,
+                'running': self.started - self.finished,
+                'finished': self.finished
+            }
+
+    def reset_stats(self):
+        """
+        Обнуляє лічильники (у воркері після fork: потоки та черга
+        головного процесу в дочірньому не працюють)
+        """
+        self._stats_lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.finished = 0
+
+
+def _start_timer():
+    """Створює таймер на початку запиту (before_request)"""
+    _timer.set(RequestTimer())
+
+
+def _add_timing(response):
+    """Додає заголовок Server-Timing та блок налагодження (after_request)"""
+    timer = _timer.get()
+    if timer is None:
+        return response
+    response.headers['Server-Timing'] = timer.header()
+    # Блок налагодження лише для нестиснутих JSON-об'єктів
+    if (request.args.get(Config.SERVER_TIMING_DEBUG_PARAM) and response.is_json
+            and not response.is_streamed and 'Content-Encoding' not in response.headers):
+        payload = response.get_json(silent=True)
+        if isinstance(payload, dict):
+            payload['timing'] = timer.milliseconds()
+            response.set_data(json.dumps(payload, ensure_ascii=False))
+    return response
+
+
+def _stop_timer(exception=None):
+    """Відв'язує таймер після запиту (teardown_request)"""
+    _timer.set(None)
+
+
+def _render_started(sender, template, context, **extra):
+    """Сигнал before_render_template"""
+    timer = _timer.get()
+    if timer is not None:
+        timer.render_started = time.perf_counter()
+
+
+def _render_finished(sender, template, context, **extra):
+    """Сигнал template_rendered"""
+    timer = _timer.get()
+    if timer is not None and timer.render_started is not None:
+        timer.add('render', time.perf_counter() - timer.render_started)
+        timer.render_started = None
+
+
+def init_timing(app):
+    """
+    Вмикає вимірювання етапів для всіх маршрутів додатку (Config.SERVER_TIMING)
+
+    Параметри:
+        app (Flask): Додаток
+    """
+    if not Config.SERVER_TIMING:
+        return
+    app.before_request(_start_timer)
+    app.after_request(_add_timing)
+    app.teardown_request(_stop_timer)
+    before_render_template.connect(_render_started, app)
+    template_rendered.connect(_render_finished, app)
@@ -9,12 +9,58 @@ import pandas as pd
 # Імпорт бібліотеки для числових обчислень
 import numpy as np
 
+# Розділи зведеного набору даних дашборду
+DASHBOARD_SECTIONS = (
+    'stats',
+    'habitability_distribution',
+    'parameters_correlation',
+    'discovery_timeline',
+    'top_habitable',
+    'discovery_methods'
+)
+
 class AnalyticsService:
     """
     Клас для аналітичної обробки даних про екзопланети
     Генерує статистику та дані для графіків
     """
     
+    def get_dashboard_stats(self, planets_df):
+        """
+        Базова статистика для сторінки дашборду
+        
+        Параметри:
+            planets_df (DataFrame): Таблиця з даними про планети
+        
+        Повертає:
+            dict: Кількість планет, середній та максимальний індекс, кількість придатних
+        """
+        return {
+            'total_planets': len(planets_df),  # Загальна кількість планет
+            'avg_habitability': round(float(planets_df['habitability_index'].mean()), 2),  # Середній індекс
+            'max_habitability': round(float(planets_df['habitability_index'].max()), 2),  # Максимальний індекс
+            'habitable_count': int((planets_df['habitability_index'] >= 50).sum())  # Кількість придатних
+        }
+    
+    def get_dashboard_bundle(self, planets_df):
+        """
+        Усі дані дашборду з одного знімка каталогу
+        
+        Параметри:
+            planets_df (DataFrame): Оброблені дані з індексом придатності
+        
+        Повертає:
+            dict: Розділ (див. DASHBOARD_SECTIONS) -> дані розділу
+        """
+        return {
+            'stats': self.get_dashboard_stats(planets_df),
+            'habitability_distribution': self.get_habitability_distribution(planets_df),
+            'parameters_correlation': self.get_parameters_correlation(planets_df),
+            'discovery_timeline': self.get_discovery_timeline(planets_df),
+            'top_habitable': self.get_top_habitable_planets(planets_df, top_n=20),
+            'discovery_methods': self.get_discovery_method_comparison(planets_df)
+        }
+    
     def get_habitability_distribution(self, planets_df):
         """
         Розраховує розподіл планет за індексом придатності
@@ -36,9 +82,9 @@ class AnalyticsService:
             'Дуже висока (80-100)'   # Дуже придатні планети
         ]
         
-        # Розбиваємо планети на категорії
+        # Розбиваємо планети на категорії (без зміни таблиці - вона спільна для знімка)
         # include_lowest=True - включаємо нижню межу
-        planets_df['habitability_category'] = pd.cut(
+        categories = pd.cut(
             planets_df['habitability_index'],
             bins=bins,
             labels=labels,
@@ -46,7 +92,7 @@ class AnalyticsService:
         )
         
         # Підраховуємо кількість планет у кожній категорії
-        distribution = planets_df['habitability_category'].value_counts().sort_index().to_dict()
+        distribution = categories.value_counts().sort_index().to_dict()
         
         # Формуємо результат для графіка
         return {
@@ -5,35 +5,38 @@ Views (представлення) для модуля analytics
 """
 
 # Імпорт необхідних компонентів Flask
-from flask import Blueprint, render_template, jsonify
+from flask import Blueprint, render_template, jsonify, request
 # Імпорт сервісу для роботи з екзопланетами
-from exoplanets.services import ExoplanetService
-# Імпорт калькулятора придатності
-from exoplanets.habitability import HabitabilityCalculator
-# Імпорт сервісу аналітики
-from analytics.services import AnalyticsService
+from exoplanets.services import ExoplanetService, request_snapshot
+# Імпорт умовних HTTP запитів (ETag / 304)
+from exoplanets.conditional import conditional_get, precompressed
+# Імпорт відкладеного створення сервісів
+from Project.lazy import LazyObject, lazy_import
 
-from concurrent.futures import ThreadPoolExecutor
-import asyncio
+# Сервіс аналітики та серіалізація (pandas/numpy) імпортуються при першому запиті
+analytics_services = lazy_import('analytics.services')
+serialization = lazy_import('exoplanets.serialization')
 
 # Створюємо Blueprint для модуля analytics
 analytics_bp = Blueprint('analytics', __name__)
 
-# Ініціалізуємо необхідні сервіси
+# Ініціалізуємо необхідні сервіси (створюються при першому зверненні)
 exoplanet_service = ExoplanetService()
-calculator = HabitabilityCalculator()
-analytics_service = AnalyticsService()
+analytics_service = LazyObject(lambda: analytics_services.AnalyticsService())
 
-executor = ThreadPoolExecutor(max_workers=4)
-
-def load_and_calculate_data():
-    """Helper function to load and calculate data in thread pool"""
-    planets_df = exoplanet_service.get_planets_data()
-    if planets_df is None or planets_df.empty:
+def load_bundle(snapshot=None):
+    """
+    Усі дані дашборду для знімка поточного запиту
+    Розраховуються один раз на версію каталогу (індекс придатності вже є в знімку)
+    """
+    snapshot = snapshot or request_snapshot(exoplanet_service)
+    if snapshot is None or len(snapshot) == 0:
         return None
-    return calculator.calculate_batch(planets_df)
+    return snapshot.get_index('dashboard', analytics_service.get_dashboard_bundle)
 
 @analytics_bp.route('/dashboard')
+@conditional_get
+@precompressed
 def dashboard():
     """
     Головна сторінка аналітики з дашбордом
@@ -45,24 +48,16 @@ def dashboard():
         HTML: Сторінка з дашбордом та графіками
     """
     try:
-        # Завантажуємо дані про планети
-        planets_df = exoplanet_service.get_planets_data()
+        # Завантажуємо дані дашборду зі знімка каталогу
+        bundle = load_bundle()
         
         # Перевіряємо чи дані завантажились
-        if planets_df is None or planets_df.empty:
+        if bundle is None:
             return render_template('analytics/dashboard.html', 
-                                 error="Не вдалося завантажити дані")
+                                 error="Не вдалося завантажити дані"), 500
         
-        # Розраховуємо індекс придатності для всіх планет
-        planets_df = calculator.calculate_batch(planets_df)
-        
-        # Отримуємо базову статистику
-        stats = {
-            'total_planets': len(planets_df),  # Загальна кількість планет
-            'avg_habitability': round(planets_df['habitability_index'].mean(), 2),  # Середній індекс
-            'max_habitability': round(planets_df['habitability_index'].max(), 2),  # Максимальний індекс
-            'habitable_count': len(planets_df[planets_df['habitability_index'] >= 50])  # Кількість придатних
-        }
+        # Базова статистика вже розрахована для цієї версії каталогу
+        stats = bundle['stats']
         
         # Рендеримо шаблон дашборду зі статистикою
         return render_template('analytics/dashboard.html', 
@@ -72,9 +67,11 @@ def dashboard():
     except Exception as e:
         # У разі помилки повертаємо сторінку з повідомленням
         return render_template('analytics/dashboard.html', 
-                             error=str(e))
+                             error=str(e)), 500
 
 @analytics_bp.route('/api/habitability-distribution')
+@conditional_get
+@precompressed
 def habitability_distribution():
     """
     API для отримання розподілу індексу придатності
@@ -86,22 +83,24 @@ def habitability_distribution():
         JSON: Дані для побудови графіка розподілу
     """
     try:
-        planets_df = load_and_calculate_data()
+        bundle = load_bundle()
         
-        if planets_df is None:
+        if bundle is None:
             return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
         # Отримуємо дані розподілу
-        distribution = analytics_service.get_habitability_distribution(planets_df)
+        distribution = bundle['habitability_distribution']
         
         # Повертаємо дані у форматі JSON
-        return jsonify(distribution)
+        return serialization.json_response(distribution)
     
     except Exception as e:
         # У разі помилки повертаємо JSON з помилкою
         return jsonify({'error': str(e)}), 500
 
 @analytics_bp.route('/api/parameters-correlation')
+@conditional_get
+@precompressed
 def parameters_correlation():
     """
     API для отримання кореляції параметрів
@@ -113,22 +112,24 @@ def parameters_correlation():
         JSON: Дані про кореляцію параметрів з індексом придатності
     """
     try:
-        planets_df = load_and_calculate_data()
+        bundle = load_bundle()
         
-        if planets_df is None:
+        if bundle is None:
             return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
         # Отримуємо дані кореляції
-        correlation = analytics_service.get_parameters_correlation(planets_df)
+        correlation = bundle['parameters_correlation']
         
         # Повертаємо дані у форматі JSON
-        return jsonify(correlation)
+        return serialization.json_response(correlation)
     
     except Exception as e:
         # У разі помилки повертаємо JSON з помилкою
         return jsonify({'error': str(e)}), 500
 
 @analytics_bp.route('/api/discovery-timeline')
+@conditional_get
+@precompressed
 def discovery_timeline():
     """
     API для отримання часової шкали відкриттів
@@ -140,22 +141,24 @@ def discovery_timeline():
         JSON: Дані про відкриття планет по роках
     """
     try:
-        planets_df = load_and_calculate_data()
+        bundle = load_bundle()
         
-        if planets_df is None:
+        if bundle is None:
             return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
         # Отримуємо дані часової шкали
-        timeline = analytics_service.get_discovery_timeline(planets_df)
+        timeline = bundle['discovery_timeline']
         
         # Повертаємо дані у форматі JSON
-        return jsonify(timeline)
+        return serialization.json_response(timeline)
     
     except Exception as e:
         # У разі помилки повертаємо JSON з помилкою
         return jsonify({'error': str(e)}), 500
 
 @analytics_bp.route('/api/top-habitable')
+@conditional_get
+@precompressed
 def top_habitable():
     """
     API для отримання топ найпридатніших планет
@@ -167,22 +170,24 @@ def top_habitable():
         JSON: Список топ-20 найпридатніших планет
     """
     try:
-        planets_df = load_and_calculate_data()
+        bundle = load_bundle()
         
-        if planets_df is None:
+        if bundle is None:
             return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
         # Отримуємо топ планет
-        top_planets = analytics_service.get_top_habitable_planets(planets_df, top_n=20)
+        top_planets = bundle['top_habitable']
         
         # Повертаємо дані у форматі JSON
-        return jsonify(top_planets)
+        return serialization.json_response(top_planets)
     
     except Exception as e:
         # У разі помилки повертаємо JSON з помилкою
         return jsonify({'error': str(e)}), 500
 
 @analytics_bp.route('/api/discovery-methods')
+@conditional_get
+@precompressed
 def discovery_methods():
     """
     API для порівняння методів відкриття
@@ -194,16 +199,52 @@ def discovery_methods():
         JSON: Статистика по методах відкриття планет
     """
     try:
-        planets_df = load_and_calculate_data()
+        bundle = load_bundle()
         
-        if planets_df is None:
+        if bundle is None:
             return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
         # Отримуємо порівняння методів
-        methods = analytics_service.get_discovery_method_comparison(planets_df)
+        methods = bundle['discovery_methods']
         
         # Повертаємо дані у форматі JSON
-        return jsonify(methods)
+        return serialization.json_response(methods)
+    
+    except Exception as e:
+        # У разі помилки повертаємо JSON з помилкою
+        return jsonify({'error': str(e)}), 500
+
+@analytics_bp.route('/api/dashboard-bundle')
+@conditional_get
+@precompressed
+def dashboard_bundle():
+    """
+    Усі дані дашборду одним запитом
+    
+    Маршрут: /analytics/api/dashboard-bundle
+    Метод: GET
+    Параметри: fields - розділи через кому (за замовчуванням усі)
+    
+    Повертає:
+        JSON: Розділ -> дані
+    """
+    try:
+        fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
+        unknown = [field for field in fields if field not in analytics_services.DASHBOARD_SECTIONS]
+        
+        if unknown:
+            return jsonify({'error': f"Невідомі розділи: {', '.join(unknown)}"}), 400
+        
+        sections = fields or list(analytics_services.DASHBOARD_SECTIONS)
+        
+        snapshot = request_snapshot(exoplanet_service)
+        
+        if snapshot is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        bundle = load_bundle(snapshot)
+        
+        return serialization.json_response({section: bundle[section] for section in sections})
     
     except Exception as e:
         # У разі помилки повертаємо JSON з помилкою
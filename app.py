@@ -4,27 +4,94 @@
 Ініціалізує Flask додаток та реєструє всі модулі
 """
 
+# Імпорт модулів для перевірки часу запуску
+import sys
+import time
+# Початок імпорту додатку (для перевірки бюджету часу запуску)
+IMPORT_STARTED = time.perf_counter()
+
 # Імпорт основного класу Flask
 from flask import Flask
 # Імпорт конфігурації проекту
 from Project.settings import Config
 # Імпорт функції для завантаження змінних оточення
 from Project.loadenv import load_environment
+# Імпорт вимірювання етапів запиту (Server-Timing)
+from Project.timing import init_timing
+# Імпорт метрик Prometheus
+from Project.metrics import init_metrics, metrics
+# Імпорт профілювання запитів
+from Project.profiling import init_profiling
+# Імпорт сервісу даних та звільнення знімків каталогу після запиту
+from exoplanets.services import ExoplanetService, release_request_snapshots
 
 # Імпорт blueprints з різних модулів
 from home.views import home_bp
 from exoplanets.views import exoplanets_bp
 from analytics.views import analytics_bp
 from user.views import user_bp
+from blueprints.api import api_bp
+# Імпорт даних дашборду для прогріву
+from analytics.views import load_bundle
 
 # Імпорт модуля для роботи з файловою системою
 import os
+# Імпорт модуля збирача сміття
+import gc
+
+# Важкі бібліотеки, які не повинні імпортуватися під час запуску додатку
+# (їх імпортують лише маршрути з даними каталогу, при першому запиті)
+DEFERRED_IMPORTS = ('pandas', 'numpy', 'requests')
 
-def create_app():
+def check_startup_budget():
+    """
+    Перевіряє, що створення додатку вклалося в Config.STARTUP_TIME_BUDGET
+    і не імпортувало важких бібліотек (виводить попередження)
+    
+    Повертає:
+        float: Час від початку імпорту додатку в секундах
+    """
+    elapsed = time.perf_counter() - IMPORT_STARTED
+    if elapsed > Config.STARTUP_TIME_BUDGET:
+        print(f"⚠ Запуск тривав {elapsed:.2f}s (бюджет {Config.STARTUP_TIME_BUDGET:.2f}s)")
+    imported = [name for name in DEFERRED_IMPORTS if name in sys.modules]
+    if imported:
+        print(f"⚠ Під час запуску імпортовано: {', '.join(imported)}")
+    return elapsed
+
+def warm_up():
+    """
+    Завантажує, обробляє та індексує каталог у поточному процесі
+    
+    Викликається в головному процесі gunicorn до fork (preload_app):
+    воркери успадковують готовий знімок через copy-on-write і одразу
+    готові обслуговувати запити. Після прогріву всі об'єкти переносяться
+    в постійне покоління збирача сміття (gc.freeze), щоб його проходи
+    у воркерах не змінювали заголовки об'єктів і не копіювали сторінки
+    пам'яті зі спільними даними.
+    
+    Повертає:
+        bool: True якщо каталог завантажено
+    """
+    snapshot = ExoplanetService().get_catalog()
+    if snapshot is not None:
+        # Агрегати дашборду теж розраховуються один раз для всіх воркерів
+        load_bundle(snapshot)
+    # Тривалість завантаження записується у файл метрик головного процесу
+    metrics.flush()
+    gc.collect()
+    gc.freeze()
+    return snapshot is not None
+
+def create_app(warm=False):
     """
     Фабрика для створення Flask додатку
     Ініціалізує та налаштовує додаток
     
+    Параметри:
+        warm (bool): Завантажити каталог одразу (див. warm_up),
+                     інакше він завантажується при першому запиті
+    
     Повертає:
         Flask: Налаштований Flask додаток
     """
@@ -45,6 +112,18 @@ def create_app():
     app.register_blueprint(analytics_bp, url_prefix='/analytics')
     # Blueprint для користувачів з префіксом /user
     app.register_blueprint(user_bp, url_prefix='/user')
+    # Blueprint для JSON API з префіксом /api
+    app.register_blueprint(api_bp, url_prefix='/api')
+    
+    # Знімки каталогу, взяті запитом, звільняються після відповіді
+    app.teardown_request(release_request_snapshots)
+    # Профіль запиту за токеном адміністратора та автоматично для повільних
+    # (реєструється першим: починається до інших обробників і завершується після них)
+    init_profiling(app)
+    # Тривалість етапів запиту в заголовку Server-Timing
+    init_timing(app)
+    # Лічильники запитів, кешів та пулів потоків на маршруті /metrics
+    init_metrics(app)
     
     # Створюємо необхідні директорії якщо вони не існують
     # Директорія для збереження даних
@@ -54,8 +133,15 @@ def create_app():
     # Директорія для кешу
     os.makedirs('cache', exist_ok=True)
     
+    # Час запуску без прогріву каталогу
+    startup_time = check_startup_budget()
+    
+    # Прогрів каталогу до початку обслуговування запитів
+    if warm and warm_up():
+        print("✓ Каталог завантажено до запуску воркерів")
+    
     # Виводимо повідомлення про успішну ініціалізацію
-    print("✓ Додаток успішно ініціалізовано")
+    print(f"✓ Додаток успішно ініціалізовано за {startup_time:.2f}s")
     print(f"✓ Зареєстровано {len(app.blueprints)} модулів")
     
     # Повертаємо налаштований додаток
@@ -63,10 +149,12 @@ def create_app():
 
 # Точка входу в програму
 if __name__ == '__main__':
+    # Метрики попередніх запусків не враховуються
+    metrics.clear()
     # Створюємо додаток
     app = create_app()
-    # Запускаємо сервер розробки
-    # debug=True - режим відладки з автоперезавантаженням
+    # Запускаємо сервер розробки (production - gunicorn з wsgi.py)
+    # debug - режим відладки лише з FLASK_DEBUG=1 (див. Config.DEBUG)
     # host='0.0.0.0' - доступ з будь-якої IP адреси
     # port=9000 - порт на якому працює сервер
-    app.run(debug=True, host='0.0.0.0', port=9000)
+    app.run(debug=Config.DEBUG, host='0.0.0.0', port=9000)
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарки продуктивності
+Синтетичні каталоги (synthetic) та набір вимірювань (run)
+"""
@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+"""
+Навантажувальне тестування додатку з локальною заміною NASA TAP API
+
+Запускає додаток (create_app) на локальному порту разом із фейковим
+сервером TAP, який віддає синтетичний CSV з налаштовуваною затримкою та
+помилками, і подає змішаний трафік (список, деталі планети, пошук по
+натисканнях клавіш, дашборд) із заданою частотою запитів. Звіт: p50/p95/p99,
+пропускна здатність та частка помилок для кожного типу запитів.
+
+Сценарій refresh: кеш каталогу застаріває посеред тесту, і додаток
+оновлює його з API під навантаженням.
+
+Запуск з кореня проекту:
+    python -m benchmarks.loadtest --rps 50 --duration 60
+    python -m benchmarks.loadtest --scenario refresh --api-latency 2 --api-failure-rate 0.2
+"""
+
+# Імпорт модуля для розбору аргументів командного рядка
+import argparse
+# Імпорт модуля для серіалізації звіту
+import json
+# Імпорт модуля для роботи з файловою системою
+import os
+# Імпорт модуля для випадкового трафіку
+import random
+# Імпорт модуля для тимчасової робочої директорії
+import tempfile
+# Імпорт модуля для потоків серверів
+import threading
+# Імпорт модуля для вимірювання часу
+import time
+# Імпорт пулу потоків клієнтів
+from concurrent.futures import ThreadPoolExecutor
+# Імпорт HTTP сервера фейкового API
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# Імпорт модулів для HTTP запитів до додатку
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+from urllib.request import urlopen
+
+# Імпорт розбору розмірів (додає корінь проекту до шляхів імпорту)
+from benchmarks.run import parse_size
+# Імпорт генератора синтетичних каталогів
+from benchmarks.synthetic import generate_catalog
+
+# Частка запитів кожного типу за замовчуванням
+DEFAULT_MIX = 'listing=50,detail=25,search=15,dashboard=10'
+
+# Інтервал між натисканнями клавіш у пошуку (в секундах)
+KEYSTROKE_INTERVAL = 0.12
+# Максимальна кількість натискань в одному пошуку
+MAX_KEYSTROKES = 6
+
+# Варіанти фільтрів сторінки списку
+LISTING_FILTERS = {
+    'min_habitability': (0, 0, 20, 40),
+    'discovery_method': ('', '', 'Transit', 'Radial Velocity'),
+    'habitable_zone': ('', '', '', 'conservative'),
+}
+
+
+class FakeTapServer:
+    """
+    Локальна заміна EXOPLANET_API_URL
+
+    Відповідає на GET /TAP/sync?query=...&format=csv заздалегідь
+    згенерованим CSV. Затримка та частка помилок (HTTP 503) задаються
+    при створенні; кожне звернення записується з часом відносно старту.
+    """
+
+    def __init__(self, csv_text, latency=0.0, failure_rate=0.0, seed=0):
+        """
+        Ініціалізація
+
+        Параметри:
+            csv_text (str): Відповідь на запит до таблиці ps
+            latency (float): Затримка відповіді в секундах
+            failure_rate (float): Частка відповідей з помилкою 503
+            seed (int): Зерно генератора помилок
+        """
+        self.body = csv_text.encode('utf-8')
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        # Звернення: [(час від старту тесту, статус)]
+        self.calls = []
+        self.started = time.perf_counter()
+
+        tap = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                tap.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_port}/TAP/sync'
+        threading.Thread(target=self.server.serve_forever, name='fake-tap', daemon=True).start()
+
+    def handle(self, handler):
+        """Відповідь на один запит до API"""
+        url = urlparse(handler.path)
+        params = parse_qs(url.query)
+        if url.path != '/TAP/sync' or 'FROM ps' not in params.get('query', [''])[0]:
+            status = 400
+        else:
+            time.sleep(self.latency)
+            with self.lock:
+                failed = self.random.random() < self.failure_rate
+            status = 503 if failed else 200
+        with self.lock:
+            self.calls.append((round(time.perf_counter() - self.started, 3), status))
+
+        body = self.body if status == 200 else b'ERROR'
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'text/csv' if status == 200 else 'text/plain')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def shutdown(self):
+        """Зупиняє сервер"""
+        self.server.shutdown()
+
+
+def start_app(api_url):
+    """
+    Запускає додаток на локальному порту (багатопотоковий сервер werkzeug)
+
+    Параметри:
+        api_url (str): Адреса фейкового TAP API
+
+    Повертає:
+        tuple: (базова адреса додатку, сервер)
+    """
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    from Project.settings import Config
+    # Сервіси читають налаштування при створенні - до імпорту додатку
+    Config.EXOPLANET_API_URL = api_url
+    # Профайлер повільних запитів вплинув би на вимірювання
+    Config.PROFILER_SLOW_THRESHOLD = None
+    from app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        # Журнал кожного запиту сповільнив би сервер і заховав звіт
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, name='app', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+class TrafficMix:
+    """
+    Генератор запитів за частками типів
+
+    Кожен виклик next() повертає тип запиту та список шляхів: для пошуку -
+    префікси назви планети, що надсилаються з інтервалом KEYSTROKE_INTERVAL.
+    """
+
+    def __init__(self, weights, planet_names, seed=0):
+        """
+        Ініціалізація
+
+        Параметри:
+            weights (dict): Тип запиту -> відносна частка
+            planet_names (list): Назви планет каталогу
+            seed (int): Зерно генератора
+        """
+        unknown = set(weights) - set(self.builders())
+        if unknown:
+            raise ValueError(f"Невідомі типи запитів: {', '.join(sorted(unknown))}")
+        self.kinds = list(weights)
+        self.weights = [weights[kind] for kind in self.kinds]
+        self.names = planet_names
+        self.random = random.Random(seed)
+
+    def builders(self):
+        """Тип запиту -> функція, що будує шляхи"""
+        return {
+            'listing': self.listing,
+            'detail': self.detail,
+            'search': self.search,
+            'dashboard': self.dashboard,
+        }
+
+    def next(self):
+        """Наступний запит: (тип, [шляхи])"""
+        kind = self.random.choices(self.kinds, self.weights)[0]
+        return kind, self.builders()[kind]()
+
+    def listing(self):
+        """Сторінка списку планет з випадковими фільтрами"""
+        params = {name: self.random.choice(values) for name, values in LISTING_FILTERS.items()}
+        params = {name: value for name, value in params.items() if value}
+        params['page'] = self.random.randint(1, 20)
+        params['per_page'] = 50
+        return [f'/exoplanets/api/planets?{urlencode(params)}']
+
+    def detail(self):
+        """Деталі випадкової планети"""
+        return [f'/api/planet/{quote(self.random.choice(self.names))}']
+
+    def search(self):
+        """Пошук по натисканнях клавіш: кожен префікс назви - окремий запит"""
+        name = self.random.choice(self.names)
+        keystrokes = min(len(name), MAX_KEYSTROKES)
+        return [f'/exoplanets/search?{urlencode({"q": name[:length]})}'
+                for length in range(1, keystrokes + 1)]
+
+    def dashboard(self):
+        """Усі дані дашборду"""
+        return ['/analytics/api/dashboard-bundle']
+
+
+def parse_mix(value):
+    """Частки типів з рядка 'listing=50,detail=25'"""
+    weights = {}
+    for item in value.split(','):
+        kind, _, weight = item.partition('=')
+        weights[kind.strip()] = float(weight)
+    return weights
+
+
+class Recorder:
+    """Результати запитів: (тип, час відносно старту, тривалість, статус)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []
+
+    def add(self, kind, offset, latency, status):
+        with self.lock:
+            self.samples.append((kind, offset, latency, status))
+
+
+def send(base_url, kind, paths, scheduled, started, timeout, recorder):
+    """
+    Виконує запит (або серію натискань клавіш) і записує результати
+
+    Тривалість першого запиту рахується від запланованого часу відправлення,
+    тому очікування вільного клієнта теж потрапляє у затримку (без
+    coordinated omission при перевантаженні).
+    """
+    for position, path in enumerate(paths):
+        if position:
+            time.sleep(KEYSTROKE_INTERVAL)
+        sent = scheduled if position == 0 else time.perf_counter()
+        try:
+            with urlopen(base_url + path, timeout=timeout) as response:
+                response.read()
+                status = response.status
+        except HTTPError as e:
+            status = e.code
+        except (URLError, OSError):
+            # Таймаут або обірване з'єднання
+            status = 0
+        finished = time.perf_counter()
+        recorder.add(kind, sent - started, finished - sent, status)
+
+
+def drive(base_url, mix, rps, duration, concurrency, timeout, seed=0):
+    """
+    Подає трафік з пуассонівським потоком запитів із середньою частотою rps
+
+    Параметри:
+        base_url (str): Адреса додатку
+        mix (TrafficMix): Генератор запитів
+        rps (float): Цільова кількість запитів (сесій) на секунду
+        duration (float): Тривалість у секундах
+        concurrency (int): Кількість одночасних клієнтів
+        timeout (float): Таймаут одного запиту
+
+    Повертає:
+        tuple: (Recorder, час старту perf_counter)
+    """
+    recorder = Recorder()
+    arrivals = random.Random(seed)
+    started = time.perf_counter()
+    scheduled = started
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='client') as executor:
+        while scheduled - started < duration:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            kind, paths = mix.next()
+            executor.submit(send, base_url, kind, paths, scheduled, started, timeout, recorder)
+            scheduled += arrivals.expovariate(rps)
+    return recorder, started
+
+
+def percentile(values, fraction):
+    """Перцентиль (nearest-rank) відсортованого списку"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+def summarize(samples, elapsed):
+    """
+    Статистика групи запитів
+
+    Параметри:
+        samples (list): Записи Recorder
+        elapsed (float): Тривалість тесту в секундах
+
+    Повертає:
+        dict: Кількість, помилки, пропускна здатність, перцентилі (мс)
+    """
+    latencies = sorted(latency for _, _, latency, _ in samples)
+    # 304 - успішна умовна відповідь
+    errors = sum(1 for *_, status in samples if status == 0 or status >= 400)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'throughput': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': _ms(percentile(latencies, 0.50)),
+        'p95_ms': _ms(percentile(latencies, 0.95)),
+        'p99_ms': _ms(percentile(latencies, 0.99)),
+        'max_ms': _ms(latencies[-1] if latencies else None),
+    }
+
+
+def _ms(seconds):
+    """Секунди в мілісекунди (округлені)"""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def timeline(samples):
+    """Статистика за кожну секунду тесту (видно вплив оновлення каталогу)"""
+    seconds = {}
+    for sample in samples:
+        seconds.setdefault(int(sample[1]), []).append(sample)
+    return [dict(second=second, **summarize(bucket, 1.0)) for second, bucket in sorted(seconds.items())]
+
+
+def print_report(report):
+    """Друкує таблицю звіту"""
+    print(f"\n{'запити':<12} {'к-сть':>7} {'помилки':>8} {'%':>6} {'rps':>7} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (мс)")
+    for kind, stats in list(report['endpoints'].items()) + [('усього', report['total'])]:
+        print(f"{kind:<12} {stats['requests']:>7} {stats['errors']:>8} {stats['error_rate'] * 100:>6.1f} "
+              f"{stats['throughput']:>7.1f} {stats['p50_ms'] or 0:>8.1f} {stats['p95_ms'] or 0:>8.1f} "
+              f"{stats['p99_ms'] or 0:>8.1f} {stats['max_ms'] or 0:>8.1f}")
+    if report.get('refresh'):
+        refresh = report['refresh']
+        print(f"\nКеш каталогу застарів на {refresh['expires_at']}с; звернення до API: {len(refresh['api_calls'])}")
+        for item in report['timeline']:
+            marker = ' <- оновлення' if item['second'] == int(refresh['expires_at']) else ''
+            print(f"  {item['second']:>4}с  {item['requests']:>5} запитів  {item['errors']:>4} помилок  "
+                  f"p95 {item['p95_ms'] or 0:>8.1f} мс{marker}")
+
+
+def main(argv=None):
+    """Точка входу: python -m benchmarks.loadtest"""
+    parser = argparse.ArgumentParser(description='Навантажувальний тест з фейковим TAP API')
+    parser.add_argument('--scenario', choices=('steady', 'refresh'), default='steady',
+                        help='refresh - кеш каталогу застаріває посеред тесту')
+    parser.add_argument('--planets', default='5k', help='Розмір синтетичного каталогу')
+    parser.add_argument('--rps', type=float, default=20.0, help='Цільова частота запитів')
+    parser.add_argument('--duration', type=float, default=30.0, help='Тривалість тесту в секундах')
+    parser.add_argument('--concurrency', type=int, default=32, help='Кількість одночасних клієнтів')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Частки запитів (за замовчуванням {DEFAULT_MIX})')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Таймаут запиту в секундах')
+    parser.add_argument('--api-latency', type=float, default=0.5, help='Затримка фейкового API в секундах')
+    parser.add_argument('--api-failure-rate', type=float, default=0.0, help='Частка помилок 503 фейкового API')
+    parser.add_argument('--seed', type=int, default=0, help='Зерно генераторів')
+    parser.add_argument('--output', help='Файл звіту JSON')
+    parser.add_argument('--workdir', help='Робоча директорія для даних та кешів (за замовчуванням тимчасова)')
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = args.workdir or tempfile.mkdtemp(prefix='exoplanets-load-')
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    print(f"✓ Робоча директорія: {workdir}")
+
+    catalog = generate_catalog(parse_size(args.planets), args.seed)
+    tap = FakeTapServer(catalog.to_csv(index=False), args.api_latency, args.api_failure_rate, args.seed)
+    mix = TrafficMix(parse_mix(args.mix), catalog['pl_name'].tolist(), args.seed)
+    del catalog
+    base_url, server = start_app(tap.url)
+    print(f"✓ Додаток: {base_url}, фейковий TAP: {tap.url}")
+
+    from Project.settings import Config
+    # Прогрів: перший запит завантажує каталог з фейкового API (повторюємо, якщо API відмовив)
+    for _ in range(10):
+        try:
+            with urlopen(base_url + '/exoplanets/api/planets?per_page=1', timeout=300):
+                break
+        except HTTPError:
+            time.sleep(1)
+    else:
+        raise SystemExit('✗ Не вдалося завантажити каталог з фейкового API')
+
+    expires = None
+    if args.scenario == 'refresh':
+        # Файл кешу "старіє" так, щоб закінчитися посередині тесту
+        # (зміна часу файлу - нова версія, тому прогрів нижче трохи зсуває момент)
+        expires = time.time() + args.duration / 2
+        stale = expires - Config.CACHE_TIMEOUT
+        os.utime(Config.DATA_CACHE_FILE, (stale, stale))
+        # Нова версія файлу - знімок будується до початку вимірювань
+        with urlopen(base_url + '/exoplanets/api/planets?per_page=1', timeout=300):
+            pass
+    for paths in (['/analytics/api/dashboard-bundle'], mix.search()):
+        for path in paths:
+            with urlopen(base_url + path, timeout=300):
+                pass
+
+    calls_before = len(tap.calls)
+    tap.started = time.perf_counter()
+    expires_at = None if expires is None else round(expires - time.time(), 2)
+    print(f"⟳ {args.scenario}: {args.rps} rps протягом {args.duration}с")
+    recorder, started = drive(base_url, mix, args.rps, args.duration, args.concurrency,
+                              args.timeout, args.seed)
+    elapsed = time.perf_counter() - started
+
+    samples = recorder.samples
+    report = {
+        'scenario': args.scenario,
+        'planets': parse_size(args.planets),
+        'target_rps': args.rps,
+        'duration': round(elapsed, 2),
+        'concurrency': args.concurrency,
+        'api_latency': args.api_latency,
+        'api_failure_rate': args.api_failure_rate,
+        'endpoints': {kind: summarize([s for s in samples if s[0] == kind], elapsed)
+                      for kind in mix.kinds},
+        'total': summarize(samples, elapsed),
+        'timeline': timeline(samples),
+    }
+    if expires_at is not None:
+        report['refresh'] = {'expires_at': expires_at, 'api_calls': tap.calls[calls_before:]}
+    print_report(report)
+
+    server.shutdown()
+    tap.shutdown()
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✓ Звіт: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+Набір бенчмарків на синтетичних каталогах
+
+Вимірює розрахунок індексу придатності (обидві реалізації), усі методи
+AnalyticsService, завантаження CSV та збереженого знімка, конвеєр обробки
+і пошук/фільтрацію/сортування/пагінацію через тестовий клієнт Flask.
+Результати записуються у JSON для порівняння між комітами.
+
+Запуск з кореня проекту:
+    python -m benchmarks.run --sizes 5k,50k --repeat 3
+    python -m benchmarks.run --compare benchmarks/results/<попередній>.json
+"""
+
+# Імпорт модуля для розбору аргументів командного рядка
+import argparse
+# Імпорт модуля для керування збирачем сміття
+import gc
+# Імпорт модуля для серіалізації результатів
+import json
+# Імпорт модуля для роботи з файловою системою
+import os
+# Імпорт модуля для інформації про платформу
+import platform
+# Імпорт модуля для медіани вимірювань
+import statistics
+# Імпорт модуля для версії коду (git)
+import subprocess
+# Імпорт модуля для шляхів імпорту
+import sys
+# Імпорт модуля для тимчасової робочої директорії
+import tempfile
+# Імпорт модуля для вимірювання часу
+import time
+# Імпорт модуля для роботи з датою
+from datetime import datetime
+
+# Імпорт модуля для пікового використання пам'яті (лише Unix)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Корінь проекту - бенчмарк працює в окремій робочій директорії
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Розміри каталогів за замовчуванням (кількість планет)
+DEFAULT_SIZES = '5k,50k,500k,5M'
+
+# Максимальна кількість рядків для повільних вимірювань (без --full)
+ROW_LIMITS = {
+    # Рядковий розрахунок через DataFrame.apply: ~75 мкс на планету
+    'habitability.calculate_batch': 500_000,
+}
+
+# HTTP запити: назва -> (метод, шлях, тіло JSON)
+HTTP_CASES = {
+    'http.search': ('GET', '/exoplanets/search?q=SYN-00001', None),
+    'http.filter': ('GET', '/exoplanets/api/planets?min_habitability=20&max_radius=4'
+                           '&discovery_method=Transit&per_page=50', None),
+    'http.sort': ('POST', '/exoplanets/api/query', {
+        'filter': [{'field': 'pl_rade', 'op': 'lte', 'value': 4}],
+        'sort': [{'field': 'sy_dist', 'order': 'asc'}],
+        'fields': ['pl_name', 'hostname', 'pl_rade', 'sy_dist', 'habitability_index'],
+        'limit': 50
+    }),
+    'http.paginate': ('GET', '/exoplanets/api/planets?page=20&per_page=100', None),
+}
+
+
+def parse_size(value):
+    """
+    Розмір каталогу з рядка: 5000, 5k, 5M
+
+    Параметри:
+        value (str): Розмір
+
+    Повертає:
+        int: Кількість планет
+    """
+    value = value.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    if multiplier > 1:
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def git_commit():
+    """Поточний коміт (або None поза git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def peak_rss_mb():
+    """Пікове використання пам'яті процесом (МБ) або None"""
+    if resource is None:
+        return None
+    # На Linux ru_maxrss у кілобайтах, на macOS - у байтах
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+class Suite:
+    """
+    Результати вимірювань для одного розміру каталогу
+    Помилка одного вимірювання (наприклад MemoryError) не зупиняє інші
+    """
+
+    def __init__(self, rows, repeat, full):
+        """
+        Ініціалізація
+
+        Параметри:
+            rows (int): Кількість планет
+            repeat (int): Кількість повторів кожного вимірювання
+            full (bool): Ігнорувати ROW_LIMITS
+        """
+        self.rows = rows
+        self.repeat = repeat
+        self.full = full
+        self.cases = {}
+
+    def measure(self, name, func, setup=None, repeat=None):
+        """
+        Вимірює функцію кілька разів і зберігає найкращий та медіанний час
+
+        Параметри:
+            name (str): Назва вимірювання
+            func (callable): Функція без аргументів
+            setup (callable): Підготовка перед кожним повтором (не вимірюється)
+            repeat (int): Кількість повторів (за замовчуванням - self.repeat)
+
+        Повертає:
+            Результат останнього виклику func або None у разі помилки
+        """
+        limit = ROW_LIMITS.get(name)
+        if limit is not None and self.rows > limit and not self.full:
+            self.cases[name] = {'status': 'skipped', 'reason': f'більше {limit} рядків (див. --full)'}
+            print(f"  - {name}: пропущено")
+            return None
+
+        runs = []
+        result = None
+        try:
+            for _ in range(repeat or self.repeat):
+                if setup is not None:
+                    setup()
+                result = None
+                gc.collect()
+                started = time.perf_counter()
+                result = func()
+                runs.append(time.perf_counter() - started)
+        except Exception as e:
+            self.cases[name] = {'status': 'error', 'error': f'{type(e).__name__}: {e}'}
+            print(f"  ✗ {name}: {type(e).__name__}: {e}")
+            return None
+
+        self.cases[name] = {
+            'status': 'ok',
+            'best': round(min(runs), 6),
+            'median': round(statistics.median(runs), 6),
+            'runs': [round(run, 6) for run in runs],
+        }
+        print(f"  ✓ {name}: {min(runs) * 1000:.1f} мс")
+        return result
+
+
+def reset_caches():
+    """Очищує кеші відповідей та результатів запитів (вимірюється повна обробка)"""
+    from Project.cache import registry
+    # Імпорт модуля запитів реєструє кеш впорядкованих результатів
+    import exoplanets.query
+    for cache in list(registry.values()):
+        cache.clear()
+
+
+def create_client():
+    """Тестовий клієнт додатку для HTTP вимірювань"""
+    from Project.settings import Config
+    # Профайлер повільних запитів вплинув би на вимірювання
+    Config.PROFILER_SLOW_THRESHOLD = None
+    # Знімки попередніх розмірів не утримуються для курсорів
+    Config.CURSOR_GRACE_PERIOD = -1
+    from app import create_app
+    return create_app().test_client()
+
+
+def http_request(client, method, path, body):
+    """Виконує запит і перевіряє статус відповіді"""
+    response = client.open(path, method=method, json=body)
+    if response.status_code != 200:
+        raise RuntimeError(f'{method} {path}: HTTP {response.status_code}')
+    return response
+
+
+def run_size(planets, args, client):
+    """
+    Усі вимірювання для одного розміру каталогу
+
+    Параметри:
+        planets (int): Кількість планет
+        args (Namespace): Аргументи командного рядка
+        client (FlaskClient): Тестовий клієнт додатку
+
+    Повертає:
+        dict: Результати для цього розміру
+    """
+    import pandas as pd
+    from Project.settings import Config
+    from benchmarks.synthetic import generate_catalog
+    from exoplanets.catalog import CatalogSnapshot
+    from exoplanets.pipeline import IngestPipeline, DEFAULT_STAGES
+    from exoplanets.services import ExoplanetService
+    from exoplanets.habitability import HabitabilityCalculator
+    from services.habitability_calculator import HabitabilityCalculator as LegacyCalculator
+    from analytics.services import AnalyticsService
+
+    print(f"⟳ Каталог з {planets} планет")
+    suite = Suite(planets, args.repeat, args.full)
+    result = {'planets': planets, 'cases': suite.cases}
+
+    raw = suite.measure('synthetic.generate',
+                        lambda: generate_catalog(planets, args.seed, args.parameter_sets), repeat=1)
+    if raw is None:
+        return result
+    result['rows'] = len(raw)
+
+    # Файл кешу додатку: новий файл - нова версія каталогу
+    os.makedirs(os.path.dirname(Config.DATA_CACHE_FILE), exist_ok=True)
+    raw.to_csv(Config.DATA_CACHE_FILE, index=False)
+    result['csv_bytes'] = os.path.getsize(Config.DATA_CACHE_FILE)
+    suite.measure('load.csv', lambda: pd.read_csv(Config.DATA_CACHE_FILE))
+
+    service = ExoplanetService()
+    version = service.get_catalog_version()
+    snapshot = suite.measure('ingest.build_snapshot',
+                             lambda: IngestPipeline().build_snapshot(raw, version))
+    if snapshot is not None:
+        service.persist_snapshot(snapshot)
+        path = service.snapshot_path(version)
+        result['snapshot_bytes'] = os.path.getsize(path)
+        suite.measure('load.snapshot', lambda: CatalogSnapshot.load(path))
+
+    # Індекс придатності на даних після попередніх етапів конвеєра
+    prepared = suite.measure('ingest.prepare', lambda: IngestPipeline(
+        [stage for stage in DEFAULT_STAGES if stage[0] != 'habitability']).run(raw), repeat=1)
+    if prepared is not None:
+        calculator = HabitabilityCalculator()
+        suite.measure('habitability.calculate_batch', lambda: calculator.calculate_batch(prepared))
+        legacy = LegacyCalculator()
+        # Стара реалізація змінює переданий DataFrame - кожен повтор на копії
+        frames = []
+        suite.measure('habitability.legacy_calculate_batch', lambda: legacy.calculate_batch(frames.pop()),
+                      setup=lambda: frames.append(prepared.copy()))
+    del prepared
+
+    if snapshot is not None:
+        planets_df = snapshot.planets_df
+        analytics = AnalyticsService()
+        for method in sorted(name for name in dir(analytics) if name.startswith('get_')):
+            suite.measure(f'analytics.{method}', lambda: getattr(analytics, method)(planets_df))
+
+    del raw, snapshot
+    gc.collect()
+
+    # Перший запит завантажує збережений знімок нової версії
+    suite.measure('http.first_request', lambda: http_request(client, 'GET', '/exoplanets/api/planets?per_page=1', None),
+                  repeat=1)
+    for name, (method, path, body) in HTTP_CASES.items():
+        suite.measure(name, lambda: http_request(client, method, path, body), setup=reset_caches)
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def compare(baseline, current):
+    """
+    Друкує зміну найкращого часу кожного вимірювання відносно базових результатів
+
+    Параметри:
+        baseline (dict): Попередні результати
+        current (dict): Нові результати
+    """
+    print(f"\nПорівняння з {baseline.get('commit')} ({baseline.get('started')})")
+    print(f"{'планет':>10}  {'вимірювання':<45} {'було, мс':>12} {'стало, мс':>12} {'зміна':>8}")
+    for size, result in current['sizes'].items():
+        previous = baseline.get('sizes', {}).get(size, {}).get('cases', {})
+        for name, case in result['cases'].items():
+            before = previous.get(name, {})
+            if case['status'] != 'ok' or before.get('status') != 'ok':
+                continue
+            ratio = case['best'] / before['best'] if before['best'] else float('inf')
+            print(f"{size:>10}  {name:<45} {before['best'] * 1000:>12.2f} "
+                  f"{case['best'] * 1000:>12.2f} {ratio:>7.2f}x")
+
+
+def main(argv=None):
+    """Точка входу: python -m benchmarks.run"""
+    parser = argparse.ArgumentParser(description='Бенчмарки на синтетичних каталогах екзопланет')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'Розміри каталогів через кому (за замовчуванням {DEFAULT_SIZES})')
+    parser.add_argument('--repeat', type=int, default=3, help='Повторів кожного вимірювання')
+    parser.add_argument('--seed', type=int, default=0, help='Зерно генератора каталогу')
+    parser.add_argument('--parameter-sets', type=float, default=0.0,
+                        help='Середня кількість додаткових наборів параметрів на планету')
+    parser.add_argument('--full', action='store_true', help='Не пропускати повільні вимірювання')
+    parser.add_argument('--output', help='Файл результатів (за замовчуванням benchmarks/results/<коміт>.json)')
+    parser.add_argument('--compare', help='Попередні результати для порівняння')
+    parser.add_argument('--workdir', help='Робоча директорія для даних та кешів (за замовчуванням тимчасова)')
+    args = parser.parse_args(argv)
+
+    import numpy as np
+    import pandas as pd
+
+    commit = git_commit()
+    output = os.path.abspath(args.output or os.path.join(
+        ROOT, 'benchmarks', 'results', f"{commit or 'unknown'}-{datetime.now():%Y%m%d-%H%M%S}.json"))
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    # Дані, кеші та знімки бенчмарку не змішуються з даними додатку
+    workdir = args.workdir or tempfile.mkdtemp(prefix='exoplanets-bench-')
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    print(f"✓ Робоча директорія: {workdir}")
+
+    client = create_client()
+    results = {
+        'commit': commit,
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'parameter_sets': args.parameter_sets,
+        'sizes': {},
+    }
+    for planets in map(parse_size, args.sizes.split(',')):
+        results['sizes'][str(planets)] = run_size(planets, args, client)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"✓ Результати: {output}")
+
+    if baseline_path:
+        with open(baseline_path, encoding='utf-8') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Генератор синтетичних каталогів екзопланет
+Колонки відповідають запиту до таблиці ps (ExoplanetService.get_catalog),
+розподіли та частки пропусків наближені до NASA Exoplanet Archive
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+
+# Методи відкриття та їх частка в архіві
+DISCOVERY_METHODS = {
+    'Transit': 0.745,
+    'Radial Velocity': 0.190,
+    'Microlensing': 0.036,
+    'Imaging': 0.014,
+    'Transit Timing Variations': 0.006,
+    'Eclipse Timing Variations': 0.003,
+    'Orbital Brightness Modulation': 0.002,
+    'Pulsar Timing': 0.002,
+    'Astrometry': 0.001,
+    'Pulsation Timing Variations': 0.0005,
+    'Disk Kinematics': 0.0005,
+}
+
+# Обсерваторії для методів відкриття (інші методи - 'Multiple Observatories')
+FACILITIES = {
+    'Transit': ('Kepler', 'K2', 'Transiting Exoplanet Survey Satellite (TESS)',
+                'SuperWASP', 'HATNet', 'KELT'),
+    'Radial Velocity': ('W. M. Keck Observatory', 'La Silla Observatory',
+                        'Haute-Provence Observatory', 'Roque de los Muchachos Observatory'),
+    'Microlensing': ('OGLE', 'KMTNet', 'MOA'),
+    'Imaging': ('Paranal Observatory', 'Gemini Observatory'),
+}
+
+# Частка пропусків (NaN) у рядках default_flag = 1
+NAN_RATES = {
+    'pl_rade': 0.22,
+    'pl_masse': 0.62,
+    'pl_orbper': 0.03,
+    'pl_orbeccen': 0.45,
+    'pl_eqt': 0.55,
+    'pl_insol': 0.62,
+    'st_teff': 0.06,
+    'st_rad': 0.07,
+    'st_mass': 0.08,
+    'sy_dist': 0.02,
+}
+
+# Частка пропущених похибок серед наявних значень
+ERROR_NAN_RATE = 0.10
+
+# Кількість планет у системі та її ймовірність
+PLANETS_PER_SYSTEM = ((1, 0.72), (2, 0.15), (3, 0.07), (4, 0.035), (5, 0.015), (6, 0.007), (7, 0.003))
+
+# Позначення планет у системі
+PLANET_LETTERS = 'bcdefgh'
+
+# Ефективна температура Сонця (K)
+SOLAR_TEFF = 5772.0
+
+# Колонки у порядку запиту до архіву
+COLUMNS = [
+    'pl_name', 'hostname', 'discoverymethod', 'disc_year', 'disc_facility',
+    'ra', 'dec',
+    'pl_rade', 'pl_radeerr1', 'pl_radeerr2',
+    'pl_masse', 'pl_masseerr1', 'pl_masseerr2',
+    'pl_orbper', 'pl_orbpererr1', 'pl_orbpererr2',
+    'pl_orbeccen', 'pl_orbeccenerr1', 'pl_orbeccenerr2',
+    'pl_eqt', 'pl_eqterr1', 'pl_eqterr2',
+    'pl_insol', 'pl_insolerr1', 'pl_insolerr2',
+    'st_teff', 'st_tefferr1', 'st_tefferr2',
+    'st_rad', 'st_raderr1', 'st_raderr2',
+    'st_mass', 'st_masserr1', 'st_masserr2',
+    'sy_dist', 'sy_disterr1', 'sy_disterr2',
+    'sy_snum', 'sy_pnum',
+    'default_flag',
+]
+
+
+def _systems(rng, planets):
+    """Розмір кожної системи так, щоб разом вийшло рівно planets планет"""
+    sizes, weights = zip(*PLANETS_PER_SYSTEM)
+    weights = np.array(weights) / sum(weights)
+    # З запасом: середній розмір системи більший за 1
+    counts = rng.choice(sizes, size=planets, p=weights)
+    total = np.cumsum(counts)
+    systems = int(np.searchsorted(total, planets)) + 1
+    counts = counts[:systems]
+    counts[-1] -= total[systems - 1] - planets
+    return counts
+
+
+def _choice(rng, mapping, size):
+    """Випадкові значення словника значення -> частка"""
+    values = list(mapping)
+    weights = np.array(list(mapping.values()))
+    return np.array(values, dtype=object)[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+
+def _errors(rng, values, relative):
+    """Верхня та нижня похибки (відносні, з пропусками)"""
+    spread = np.abs(values) * relative * rng.lognormal(0.0, 0.5, size=len(values))
+    missing = np.isnan(values) | (rng.random(len(values)) < ERROR_NAN_RATE)
+    upper = np.where(missing, np.nan, spread)
+    lower = np.where(missing, np.nan, -spread)
+    return upper, lower
+
+
+def generate_catalog(planets, seed=0, parameter_sets=0.0):
+    """
+    Синтетичний каталог з колонками таблиці ps
+
+    Той самий seed завжди дає той самий каталог (відтворювані бенчмарки).
+
+    Параметри:
+        planets (int): Кількість планет (рядків з default_flag = 1)
+        seed (int): Зерно генератора випадкових чисел
+        parameter_sets (float): Середня кількість додаткових наборів параметрів
+            на планету (рядки з default_flag = 0, див. INGEST_ALL_PARAMETER_SETS)
+
+    Повертає:
+        DataFrame: Сирі дані у форматі відповіді архіву
+    """
+    rng = np.random.default_rng(seed)
+
+    # Системи: параметри зірки спільні для всіх її планет
+    counts = _systems(rng, planets)
+    systems = len(counts)
+    host_ids = np.repeat(np.arange(systems), counts)
+    # Номер планети всередині системи (b, c, d...)
+    order = np.arange(planets) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    st_teff = np.clip(rng.normal(5400.0, 900.0, systems), 2500.0, 12000.0)
+    st_rad = np.clip((st_teff / SOLAR_TEFF) ** 1.5 * rng.lognormal(0.0, 0.3, systems), 0.08, 50.0)
+    st_mass = np.clip((st_teff / SOLAR_TEFF) ** 1.7 * rng.lognormal(0.0, 0.15, systems), 0.08, 10.0)
+    sy_dist = np.clip(rng.lognormal(np.log(400.0), 1.0, systems), 1.3, 8000.0)
+    ra = rng.uniform(0.0, 360.0, systems)
+    dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, systems)))
+    sy_snum = rng.choice([1, 2, 3], size=systems, p=[0.90, 0.09, 0.01])
+    hostnames = pd.Series(np.arange(systems)).map('SYN-{:07d}'.format).to_numpy()
+    methods = _choice(rng, DISCOVERY_METHODS, systems)
+
+    # Планети
+    pl_rade = np.clip(rng.lognormal(np.log(2.5), 0.9, planets), 0.3, 30.0)
+    pl_masse = np.where(
+        pl_rade < 14.0,
+        pl_rade ** 2.06 * rng.lognormal(0.0, 0.4, planets),
+        317.8 * rng.lognormal(0.0, 0.8, planets)
+    )
+    pl_orbper = np.clip(rng.lognormal(np.log(12.0), 1.6, planets), 0.1, 1e6)
+    pl_orbeccen = rng.beta(0.867, 3.03, planets)
+    # Світловий потік та рівноважна температура за законом Кеплера
+    star_mass = st_mass[host_ids]
+    semi_major_axis = (star_mass * (pl_orbper / 365.25) ** 2) ** (1.0 / 3.0)
+    pl_insol = st_rad[host_ids] ** 2 * (st_teff[host_ids] / SOLAR_TEFF) ** 4 / semi_major_axis ** 2
+    pl_eqt = 278.6 * pl_insol ** 0.25
+
+    method = methods[host_ids]
+    disc_facility = np.full(planets, 'Multiple Observatories', dtype=object)
+    for name, facilities in FACILITIES.items():
+        rows = np.flatnonzero(method == name)
+        disc_facility[rows] = np.array(facilities, dtype=object)[rng.integers(0, len(facilities), len(rows))]
+    # Більшість відкриттів припадає на останні роки
+    years = np.arange(1995, 2026)
+    year_weights = np.exp((years - 1995) / 8.0)
+    disc_year = rng.choice(years, size=planets, p=year_weights / year_weights.sum())
+
+    letters = np.array(list(PLANET_LETTERS), dtype=object)[np.minimum(order, len(PLANET_LETTERS) - 1)]
+    hostname = hostnames[host_ids]
+
+    values = {
+        'pl_rade': pl_rade, 'pl_masse': pl_masse, 'pl_orbper': pl_orbper,
+        'pl_orbeccen': pl_orbeccen, 'pl_eqt': pl_eqt, 'pl_insol': pl_insol,
+        'st_teff': st_teff[host_ids], 'st_rad': st_rad[host_ids],
+        'st_mass': star_mass, 'sy_dist': sy_dist[host_ids],
+    }
+    relative_errors = {
+        'pl_rade': 0.08, 'pl_masse': 0.2, 'pl_orbper': 1e-5, 'pl_orbeccen': 0.3,
+        'pl_eqt': 0.05, 'pl_insol': 0.15, 'st_teff': 0.02, 'st_rad': 0.05,
+        'st_mass': 0.05, 'sy_dist': 0.03,
+    }
+
+    data = {
+        'pl_name': hostname + ' ' + letters,
+        'hostname': hostname,
+        'discoverymethod': method,
+        'disc_year': disc_year,
+        'disc_facility': disc_facility,
+        'ra': ra[host_ids],
+        'dec': dec[host_ids],
+    }
+    for column, column_values in values.items():
+        column_values = np.where(rng.random(planets) < NAN_RATES[column], np.nan, column_values)
+        data[column] = column_values
+        data[f'{column}err1'], data[f'{column}err2'] = _errors(rng, column_values, relative_errors[column])
+    data['sy_snum'] = sy_snum[host_ids]
+    data['sy_pnum'] = counts[host_ids]
+    data['default_flag'] = np.ones(planets, dtype=np.int64)
+    catalog = pd.DataFrame(data, columns=COLUMNS)
+
+    if parameter_sets > 0:
+        catalog = pd.concat([catalog, _extra_parameter_sets(rng, catalog, parameter_sets)],
+                            ignore_index=True)
+    return catalog
+
+
+def _extra_parameter_sets(rng, catalog, parameter_sets):
+    """Додаткові набори параметрів тих самих планет (інші публікації)"""
+    repeats = rng.poisson(parameter_sets, len(catalog))
+    extra = catalog.loc[np.repeat(catalog.index.to_numpy(), repeats)].reset_index(drop=True)
+    for column in NAN_RATES:
+        # Інша публікація - трохи інше значення, частина параметрів відсутня
+        noise = rng.normal(1.0, 0.05, len(extra))
+        missing = rng.random(len(extra)) < NAN_RATES[column]
+        extra[column] = np.where(missing, np.nan, extra[column].to_numpy() * noise)
+    extra['default_flag'] = 0
+    return extra
@@ -1,61 +1,77 @@
 from flask import Blueprint, jsonify, request
-from services.exoplanet_service import ExoplanetService
-from services.habitability_calculator import HabitabilityCalculator
-import time
+from exoplanets.services import ExoplanetService, request_snapshot
+from exoplanets.conditional import conditional_get, precompressed
+from Project.lazy import LazyObject, lazy_import
+from Project.timing import span
+
+# Модулі з pandas/numpy імпортуються при першому запиті до API
+habitability = lazy_import('exoplanets.habitability')
+queries = lazy_import('exoplanets.query')
+serialization = lazy_import('exoplanets.serialization')
 
 api_bp = Blueprint('api', __name__)
 exoplanet_service = ExoplanetService()
-calculator = HabitabilityCalculator()
+calculator = LazyObject(lambda: habitability.HabitabilityCalculator())
+query_engine = LazyObject(lambda: queries.QueryEngine())
 
 @api_bp.route('/planets', methods=['GET'])
+@conditional_get
+@precompressed
 def get_planets():
     """API endpoint для отримання списку планет"""
     try:
         limit = request.args.get('limit', 100, type=int)
         min_habitability = request.args.get('min_habitability', 0, type=float)
+        fields, columnar = serialization.response_shape()
         
-        start_time = time.time()
-        
-        planets_df = exoplanet_service.get_planets_data()
+        snapshot = request_snapshot(exoplanet_service)
         
-        if planets_df is None:
+        if snapshot is None:
             return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
-        planets_df = calculator.calculate_batch(planets_df)
-        
+        conditions = []
         if min_habitability > 0:
-            planets_df = planets_df[planets_df['habitability_index'] >= min_habitability]
-        
-        planets_df = planets_df.sort_values('habitability_index', ascending=False)
-        planets = planets_df.head(limit).to_dict('records')
+            conditions.append({'field': 'habitability_index', 'op': 'gte', 'value': min_habitability})
         
-        processing_time = time.time() - start_time
+        result = query_engine.run(snapshot, {'filter': conditions, 'fields': fields, 'limit': limit})
+        planets = serialization.page_json(result, columnar)
         
-        return jsonify({
-            'count': len(planets),
-            'planets': planets,
-            'processing_time': f'{processing_time:.3f}s'
+        # Час обробки - у заголовку Server-Timing (тіло кешується для всіх клієнтів)
+        return serialization.json_response({
+            'count': len(result['positions']),
+            'planets': planets
         })
     
+    except queries.QueryError as e:
+        return jsonify({'error': str(e)}), 400
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/planet/<planet_name>', methods=['GET'])
+@conditional_get
 def get_planet_detail(planet_name):
     """API endpoint для детальної інформації про планету"""
     try:
-        planets_df = exoplanet_service.get_planets_data()
-        planets_df = calculator.calculate_batch(planets_df)
+        snapshot = request_snapshot(exoplanet_service)
+        
+        if snapshot is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
-        planet_data = planets_df[planets_df['pl_name'] == planet_name]
+        result = query_engine.run(snapshot, {
+            'filter': [{'field': 'pl_name', 'op': 'eq', 'value': planet_name}],
+            'limit': 1
+        })
         
-        if planet_data.empty:
+        if result['total'] == 0:
             return jsonify({'error': 'Планету не знайдено'}), 404
         
-        planet = planet_data.iloc[0].to_dict()
-        components = calculator.get_components(planet)
+        planet = result['rows'].iloc[0].to_dict()
+        with span('score'):
+            components = calculator.get_components(planet)
         
-        return jsonify({
+        # NaN пропущених параметрів кодується як null
+        return serialization.json_response({
             'planet': planet,
             'habitability_components': components
         })
@@ -64,25 +80,27 @@ def get_planet_detail(planet_name):
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/stats', methods=['GET'])
+@conditional_get
+@precompressed
 def get_statistics():
     """API endpoint для статистики"""
     try:
-        start_time = time.time()
+        snapshot = request_snapshot(exoplanet_service)
         
-        planets_df = exoplanet_service.get_planets_data()
-        planets_df = calculator.calculate_batch(planets_df)
+        if snapshot is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
+        planets_df = snapshot.planets_df
         stats = {
             'total_planets': len(planets_df),
             'avg_habitability': float(planets_df['habitability_index'].mean()),
             'max_habitability': float(planets_df['habitability_index'].max()),
             'min_habitability': float(planets_df['habitability_index'].min()),
             'top_10_planets': planets_df.nlargest(10, 'habitability_index')['pl_name'].tolist(),
-            'discovery_methods': planets_df['discoverymethod'].value_counts().to_dict(),
-            'processing_time': f'{time.time() - start_time:.3f}s'
+            'discovery_methods': planets_df['discoverymethod'].value_counts().to_dict()
         }
         
-        return jsonify(stats)
+        return serialization.json_response(stats)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -94,26 +112,41 @@ def compare_planets():
         data = request.get_json()
         planet_names = data.get('planets', [])
         
+        fields, columnar = serialization.response_shape()
+        
         if not planet_names:
             return jsonify({'error': 'Не вказано планети для порівняння'}), 400
         
-        planets_df = exoplanet_service.get_planets_data()
-        planets_df = calculator.calculate_batch(planets_df)
+        snapshot = request_snapshot(exoplanet_service)
         
-        compared = planets_df[planets_df['pl_name'].isin(planet_names)]
+        if snapshot is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        # Пошук за хеш-індексом назв замість перебору всього каталогу
+        result = query_engine.run(snapshot, {
+            'filter': [{'field': 'pl_name', 'op': 'in', 'value': list(planet_names)}],
+            'fields': fields,
+            'limit': None
+        })
+        # Підсумок рахується за повними рядками, незалежно від fields
+        compared = snapshot.planets_df.iloc[result['positions']]
         
         if compared.empty:
             return jsonify({'error': 'Планети не знайдено'}), 404
         
         comparison = {
-            'planets': compared.to_dict('records'),
+            'planets': serialization.page_json(result, columnar),
             'summary': {
                 'avg_habitability': float(compared['habitability_index'].mean()),
-                'best_planet': compared.nlargest(1, 'habitability_index')['pl_name'].iloc[0]
+                # Рядки вже впорядковані за індексом придатності
+                'best_planet': compared['pl_name'].iloc[0]
             }
         }
         
-        return jsonify(comparison)
+        return serialization.json_response(comparison)
+    
+    except queries.QueryError as e:
+        return jsonify({'error': str(e)}), 400
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
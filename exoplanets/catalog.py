@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Знімок каталогу екзопланет
+Зберігає оброблені дані для однієї версії каталогу
+"""
+
+# Імпорт модуля для роботи з часом
+import time
+# Імпорт модуля для синхронізації потоків
+import threading
+# Імпорт модуля для роботи з файловою системою
+import os
+# Імпорт модуля для серіалізації знімка
+import pickle
+# Імпорт модуля для тимчасових файлів (атомарний запис)
+import tempfile
+
+# Версія формату файлу знімка (збільшується при зміні конвеєра або індексів)
+SNAPSHOT_FORMAT = 1
+
+# Індекси, які зберігаються у файлі знімка разом з даними
+# (інші індекси - кеші серіалізації та агрегати - будуються заново)
+PERSISTED_INDEXES = ('names', 'facets', 'hosts', 'spatial', 'similarity')
+
+
+class CatalogSnapshot:
+    """
+    Знімок каталогу для однієї версії даних
+    Дані всередині знімка не змінюються після створення
+    """
+
+    def __init__(self, planets_df, version, loaded_at=None):
+        """
+        Ініціалізація знімка
+
+        Параметри:
+            planets_df (DataFrame): Оброблені дані про планети
+            version (str): Версія каталогу
+            loaded_at (float): Час створення знімка (timestamp)
+        """
+        # Оброблені дані (сирі колонки + похідні колонки конвеєра)
+        self.planets_df = planets_df
+        # Версія каталогу
+        self.version = version
+        # Час створення знімка
+        self.loaded_at = loaded_at if loaded_at is not None else time.time()
+        # Індекси, побудовані для цієї версії (назва -> об'єкт індексу)
+        self._indexes = {}
+        # Блокування, щоб кожен індекс будувався лише один раз
+        self._indexes_lock = threading.Lock()
+        # Кількість запитів, які зараз читають знімок
+        self.readers = 0
+        self._readers_lock = threading.Lock()
+
+    def __len__(self):
+        """Кількість планет у знімку"""
+        return len(self.planets_df)
+
+    def __getstate__(self):
+        """Стан для збереження: дані та індекси з PERSISTED_INDEXES"""
+        indexes = {name: index for name, index in self._indexes.items()
+                   if name in PERSISTED_INDEXES}
+        return {
+            'planets_df': self.planets_df,
+            'version': self.version,
+            'loaded_at': self.loaded_at,
+            'indexes': indexes
+        }
+
+    def __setstate__(self, state):
+        """Відновлення зі збереженого стану (блокування та читачі - нові)"""
+        self.__init__(state['planets_df'], state['version'], state['loaded_at'])
+        self._indexes.update(state['indexes'])
+
+    def save(self, path):
+        """
+        Атомарно зберігає знімок у файл
+
+        Індекси посилаються на ту саму таблицю, що й знімок, тому
+        після завантаження вони знову використовують спільні дані.
+
+        Параметри:
+            path (str): Шлях до файлу знімка
+        """
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Завантажує знімок, збережений через save
+        Файл читається лише з власної директорії кешу додатку (pickle)
+
+        Параметри:
+            path (str): Шлях до файлу знімка
+
+        Повертає:
+            CatalogSnapshot: Знімок
+        """
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+        if not isinstance(snapshot, cls):
+            raise TypeError(f'{path} не містить знімок каталогу')
+        return snapshot
+
+    def acquire(self):
+        """Реєструє нового читача знімка (на час одного запиту)"""
+        with self._readers_lock:
+            self.readers += 1
+        return self
+
+    def release(self):
+        """
+        Знімає реєстрацію читача
+
+        Повертає:
+            int: Кількість читачів, що залишилися
+        """
+        with self._readers_lock:
+            self.readers -= 1
+            return self.readers
+
+    def get_index(self, name, builder):
+        """
+        Повертає індекс знімка, будуючи його при першому зверненні
+
+        Параметри:
+            name (str): Назва індексу
+            builder (callable): Функція builder(planets_df) -> індекс
+
+        Повертає:
+            object: Побудований індекс
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            with self._indexes_lock:
+                index = self._indexes.get(name)
+                if index is None:
+                    index = builder(self.planets_df)
+                    self._indexes[name] = index
+        return index
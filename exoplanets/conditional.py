@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Умовні HTTP запити для даних каталогу
+ETag, Last-Modified та Cache-Control залежать від версії каталогу
+"""
+
+# Імпорт модуля для збереження метаданих функції
+from functools import wraps
+# Імпорт модуля для роботи з датою
+from datetime import datetime, timezone
+
+# Імпорт компонентів Flask
+from flask import request, make_response, Response
+# Імпорт налаштувань проекту
+from Project.settings import Config
+# Імпорт кешу готових відповідей
+from Project.cache import ResultCache, make_key
+# Імпорт стиснутих відповідей
+from Project.compression import CompressedPayload
+# Імпорт сервісу та знімка поточного запиту
+from exoplanets.services import ExoplanetService, held_snapshot, cache_version
+
+# Сервіс лише для перевірки версії файлу кешу (дані не читаються)
+_service = ExoplanetService()
+
+# Готові відповіді агрегатів та топ-списків разом зі стиснутими варіантами
+response_cache = ResultCache('responses', Config.RESPONSE_CACHE_MAX_BYTES,
+                             Config.DISK_CACHE_DIR, Config.DISK_CACHE_MAX_BYTES)
+
+
+def request_etag(version):
+    """
+    ETag відповіді: маршрут, версія каталогу разом з відбитком налаштувань
+    та формату відповідей (див. cache_version) і нормалізовані параметри
+
+    Параметри:
+        version (str): Версія каталогу
+
+    Повертає:
+        str: Значення ETag
+    """
+    args = sorted(request.args.items(multi=True))
+    return make_key(request.endpoint, cache_version(version), request.view_args, args)
+
+
+def _not_modified(etag, modified):
+    """Відповідь 304 з валідаторами"""
+    response = Response(status=304)
+    _set_validators(response, etag, modified)
+    return response
+
+
+def _set_validators(response, etag, modified):
+    """Встановлює ETag, Last-Modified та Cache-Control"""
+    response.set_etag(etag)
+    if modified is not None:
+        response.last_modified = datetime.fromtimestamp(modified, tz=timezone.utc)
+    response.headers['Cache-Control'] = Config.HTTP_CACHE_CONTROL
+
+
+def conditional_get(view):
+    """
+    Декоратор маршруту з даними каталогу
+
+    Якщо клієнт уже має відповідь для поточної версії каталогу
+    (If-None-Match або If-Modified-Since), повертається 304 ще до
+    завантаження знімка та будь-яких обчислень. Інакше успішна
+    відповідь отримує ETag, Last-Modified та Cache-Control.
+    Коли кеш застарів, перевірка пропускається - маршрут оновлює каталог.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        fresh = _service.get_fresh_version()
+        if fresh is not None:
+            version, modified = fresh
+            etag = request_etag(version)
+            if request.if_none_match:
+                if request.if_none_match.contains(etag):
+                    return _not_modified(etag, modified)
+            elif request.if_modified_since is not None:
+                # HTTP дата має точність до секунди
+                if int(modified) <= request.if_modified_since.timestamp():
+                    return _not_modified(etag, modified)
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+
+        # Валідатори за версією знімка, з якого реально зібрана відповідь
+        snapshot = held_snapshot()
+        if snapshot is not None and (fresh is None or snapshot.version != fresh[0]):
+            _set_validators(response, request_etag(snapshot.version), None)
+        elif fresh is not None:
+            _set_validators(response, etag, modified)
+        return response
+    return wrapper
+
+
+def precompressed(view):
+    """
+    Декоратор маршруту, відповідь якого однакова для всіх користувачів
+
+    Успішна відповідь для поточної версії каталогу зберігається разом
+    зі стиснутими варіантами (gzip, brotli); наступні запити отримують
+    готові байти в кодуванні з Accept-Encoding без повторного стиснення.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        fresh = _service.get_fresh_version()
+        key = request_etag(fresh[0]) if fresh is not None else None
+        if key is not None:
+            payload = response_cache.get(key)
+            if payload is not None:
+                return payload.response()
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200 or response.is_streamed:
+            return response
+
+        payload = CompressedPayload(response.get_data(), response.mimetype)
+        # Кешуємо лише відповідь, зібрану з актуальної версії каталогу
+        snapshot = held_snapshot()
+        if key is not None and snapshot is not None and snapshot.version == fresh[0]:
+            response_cache.put(key, payload)
+        return payload.response()
+    return wrapper
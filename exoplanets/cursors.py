@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Курсори для посторінкового перегляду результатів запитів
+Непрозорий токен прив'язує наступну сторінку до версії каталогу та запиту
+"""
+
+# Імпорт модулів для кодування та підпису токена
+import base64
+import hashlib
+import hmac
+# Імпорт модуля для серіалізації вмісту токена
+import json
+# Імпорт налаштувань проекту
+from Project.settings import Config
+
+
+class CursorError(ValueError):
+    """Пошкоджений, підроблений або чужий курсор"""
+
+
+def _signature(body):
+    """Підпис вмісту токена секретним ключем додатку"""
+    return hmac.new(Config.SECRET_KEY.encode('utf-8'), body, hashlib.sha256).digest()[:12]
+
+
+def encode_cursor(version, query_key, position, last_row):
+    """
+    Створює курсор для продовження перегляду
+
+    Параметри:
+        version (str): Версія каталогу, на якій виконано запит
+        query_key (str): Ключ запиту (форма та значення фільтрів і сортування)
+        position (int): Позиція першого рядка наступної сторінки
+        last_row (int): Номер останнього виданого рядка знімка
+
+    Повертає:
+        str: Токен для URL
+    """
+    body = json.dumps([version, query_key, position, last_row], separators=(',', ':')).encode('utf-8')
+    token = base64.urlsafe_b64encode(_signature(body) + body)
+    return token.decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Розбирає та перевіряє курсор
+
+    Параметри:
+        token (str): Токен з encode_cursor
+
+    Повертає:
+        dict: version, query_key, position, last_row
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        signature, body = raw[:12], raw[12:]
+        if not hmac.compare_digest(signature, _signature(body)):
+            raise CursorError("Недійсний курсор")
+        version, query_key, position, last_row = json.loads(body)
+    except CursorError:
+        raise
+    except (ValueError, TypeError):
+        raise CursorError("Недійсний курсор")
+    if not isinstance(position, int) or position < 0:
+        raise CursorError("Недійсний курсор")
+    return {
+        'version': version,
+        'query_key': query_key,
+        'position': position,
+        'last_row': last_row
+    }
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Потоковий експорт каталогу планет
+Віддає результат запиту частинами у форматі NDJSON, CSV або Arrow IPC
+"""
+
+# Імпорт модуля для буфера в пам'яті
+import io
+
+# Імпорт серіалізації рядків у JSON
+from exoplanets.serialization import frame_lines
+
+# Arrow IPC доступний лише якщо встановлено pyarrow
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Формат -> MIME тип відповіді
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream'
+}
+
+# Розширення файлу для Content-Disposition
+EXPORT_EXTENSIONS = {
+    'ndjson': 'ndjson',
+    'csv': 'csv',
+    'arrow': 'arrows'
+}
+
+# Кількість рядків в одній частині відповіді
+EXPORT_CHUNK_ROWS = 1000
+
+
+def export_available(fmt):
+    """
+    Чи підтримується формат експорту в цьому середовищі
+
+    Параметри:
+        fmt (str): Назва формату
+
+    Повертає:
+        bool: True якщо формат відомий і його залежності встановлені
+    """
+    if fmt == 'arrow':
+        return pa is not None
+    return fmt in EXPORT_FORMATS
+
+
+def _chunks(planets_df, rows, columns):
+    """Частини таблиці по EXPORT_CHUNK_ROWS рядків (копіюється лише поточна частина)"""
+    for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+        yield planets_df.iloc[rows[start:start + EXPORT_CHUNK_ROWS]][columns]
+
+
+def _ndjson(planets_df, rows, columns):
+    """NDJSON: один JSON-об'єкт на рядок"""
+    for chunk in _chunks(planets_df, rows, columns):
+        yield frame_lines(chunk)
+
+
+def _csv(planets_df, rows, columns):
+    """CSV: заголовок у першій частині, далі лише рядки"""
+    header = True
+    for chunk in _chunks(planets_df, rows, columns):
+        yield chunk.to_csv(index=False, header=header)
+        header = False
+    if header:
+        # Порожній результат - лише заголовок
+        yield planets_df.iloc[:0][columns].to_csv(index=False)
+
+
+def _arrow(planets_df, rows, columns):
+    """Arrow IPC stream: схема, далі по одному record batch на частину"""
+    # Схема з усієї колонки, щоб типи не залежали від значень у частині
+    schema = pa.Schema.from_pandas(planets_df[columns], preserve_index=False)
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+    for chunk in _chunks(planets_df, rows, columns):
+        writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+def export_stream(planets_df, rows, columns, fmt):
+    """
+    Генератор частин експорту
+
+    Пам'ять не залежить від розміру експорту: в кожен момент кодується
+    лише одна частина з EXPORT_CHUNK_ROWS рядків.
+
+    Параметри:
+        planets_df (DataFrame): Дані знімка
+        rows (ndarray): Номери рядків по порядку
+        columns (list): Колонки експорту
+        fmt (str): Формат (ndjson, csv, arrow)
+
+    Повертає:
+        generator: Частини відповіді (str або bytes)
+    """
+    if fmt == 'csv':
+        return _csv(planets_df, rows, columns)
+    if fmt == 'arrow':
+        return _arrow(planets_df, rows, columns)
+    return _ndjson(planets_df, rows, columns)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Фасетний фільтр на основі бітових карт
+Фільтрація списку планет та підрахунок кількості для кожного значення фасетів
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+
+# Категоріальні фасети (колонка -> значення)
+CATEGORY_FACETS = ('discoverymethod', 'disc_facility', 'disc_year')
+
+# Фасет зони придатності: значення -> булева колонка конвеєра
+HABITABLE_ZONE_FACET = {
+    'conservative': 'in_hz_conservative',
+    'optimistic': 'in_hz_optimistic'
+}
+
+# Числові фасети: межі інтервалів [a, b)
+RANGE_FACETS = {
+    'habitability_index': (0, 20, 40, 60, 80, np.inf),
+    'pl_rade': (0, 1.25, 2, 4, 6, 10, 15, np.inf),
+    'sy_dist': (0, 10, 50, 100, 500, 1000, np.inf),
+}
+
+# Кількість одиничних бітів для кожного значення байта
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.int64)
+
+
+def popcount(bitmap):
+    """
+    Кількість встановлених бітів у бітовій карті
+
+    Параметри:
+        bitmap (ndarray): Упакована бітова карта (uint8)
+
+    Повертає:
+        int: Кількість рядків у множині
+    """
+    return int(_POPCOUNT[bitmap].sum())
+
+
+def _range_label(low, high):
+    """Назва інтервалу для відповіді (наприклад '2-4' або '15+')"""
+    low = f'{low:g}'
+    return f'{low}+' if np.isinf(high) else f'{low}-{high:g}'
+
+
+def _label(value):
+    """Значення фасету у вигляді, придатному для JSON"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, np.generic):
+        return _label(value.item())
+    return value
+
+
+class FacetIndex:
+    """
+    Бітові карти фасетів для однієї версії каталогу
+
+    Для кожного значення категоріального фасету та кожного числового
+    інтервалу зберігається упакована бітова карта рядків. Комбінація
+    фільтрів - побітове OR всередині фасету та AND між фасетами.
+    """
+
+    def __init__(self, planets_df):
+        """
+        Побудова індексу
+
+        Параметри:
+            planets_df (DataFrame): Оброблені дані з колонкою habitability_index
+        """
+        self.planets_df = planets_df
+        self.size = len(planets_df)
+        self.full = self._pack(np.ones(self.size, dtype=bool))
+        self.empty = self._pack(np.zeros(self.size, dtype=bool))
+
+        # Фасет -> {значення -> бітова карта}
+        self.bitmaps = {}
+        for column in CATEGORY_FACETS:
+            if column not in planets_df.columns:
+                continue
+            codes, values = pd.factorize(planets_df[column], sort=True)
+            self.bitmaps[column] = {
+                _label(value): self._pack(codes == code) for code, value in enumerate(values)
+            }
+
+        self.bitmaps['habitable_zone'] = {
+            value: self._pack(planets_df[column].to_numpy(dtype=bool))
+            for value, column in HABITABLE_ZONE_FACET.items() if column in planets_df.columns
+        }
+
+        # Числові колонки: бітові карти інтервалів та відсортовані значення
+        self.sorted_rows = {}
+        self.sorted_values = {}
+        for column, edges in RANGE_FACETS.items():
+            if column not in planets_df.columns:
+                continue
+            values = pd.to_numeric(planets_df[column], errors='coerce').to_numpy(np.float64)
+            bins = np.digitize(values, edges) - 1
+            self.bitmaps[column] = {
+                _range_label(edges[i], edges[i + 1]): self._pack(bins == i)
+                for i in range(len(edges) - 1)
+            }
+            # NaN опиняються в кінці сортування та відкидаються
+            order = np.argsort(values, kind='stable')
+            order = order[~np.isnan(values[order])]
+            self.sorted_rows[column] = order
+            self.sorted_values[column] = values[order]
+
+        # Порядок рядків за спаданням індексу придатності
+        scores = planets_df['habitability_index'].to_numpy(dtype=np.float64)
+        self.rank_order = np.argsort(-scores, kind='stable')
+        # Позиція кожного рядка в рейтингу (для впорядкування довільних наборів рядків)
+        self.rank_position = np.empty(self.size, dtype=np.int64)
+        self.rank_position[self.rank_order] = np.arange(self.size)
+
+    def _pack(self, mask):
+        """Пакує булеву маску в бітову карту"""
+        return np.packbits(mask)
+
+    def mask(self, bitmap):
+        """Розпаковує бітову карту в булеву маску"""
+        return np.unpackbits(bitmap, count=self.size).astype(bool)
+
+    def values(self, facet):
+        """
+        Усі значення фасету (наприклад для випадаючого списку)
+
+        Параметри:
+            facet (str): Назва фасету
+
+        Повертає:
+            list: Значення фасету
+        """
+        return list(self.bitmaps.get(facet, {}))
+
+    def range_bitmap(self, column, low=None, high=None):
+        """
+        Бітова карта рядків з low <= значення <= high
+
+        Використовує відсортовану колонку: діапазон - це неперервний
+        відрізок відсортованого масиву, знайдений двійковим пошуком.
+
+        Параметри:
+            column (str): Числова колонка
+            low (float): Нижня межа (включно) або None
+            high (float): Верхня межа (включно) або None
+
+        Повертає:
+            ndarray: Упакована бітова карта
+        """
+        if column not in self.sorted_values:
+            return self.empty
+        values = self.sorted_values[column]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        end = len(values) if high is None else np.searchsorted(values, high, side='right')
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.sorted_rows[column][start:end]] = True
+        return self._pack(mask)
+
+    def _facet_bitmap(self, facet, selected):
+        """OR бітових карт вибраних значень одного фасету"""
+        bitmaps = self.bitmaps.get(facet, {})
+        result = self.empty
+        for value in selected:
+            bitmap = bitmaps.get(_label(value))
+            if bitmap is not None:
+                result = result | bitmap
+        return result
+
+    def select(self, filters=None, ranges=None, with_counts=True):
+        """
+        Застосовує фільтри та рахує кількість для кожного значення фасетів
+
+        Кількість для фасету рахується з усіма фільтрами, крім фільтра
+        цього ж фасету, щоб інтерфейс показував, скільки планет додасть
+        вибір іншого значення.
+
+        Параметри:
+            filters (dict): Фасет -> список вибраних значень
+            ranges (dict): Колонка -> (нижня межа, верхня межа)
+            with_counts (bool): Чи рахувати кількість для фасетів
+
+        Повертає:
+            tuple: (бітова карта результату, {фасет: {значення: кількість}})
+        """
+        conditions = {}
+        for facet, selected in (filters or {}).items():
+            if selected:
+                conditions[facet] = self._facet_bitmap(facet, selected)
+        for column, (low, high) in (ranges or {}).items():
+            bitmap = self.range_bitmap(column, low, high)
+            conditions[column] = conditions[column] & bitmap if column in conditions else bitmap
+
+        selected_bitmap = self.full
+        for bitmap in conditions.values():
+            selected_bitmap = selected_bitmap & bitmap
+
+        counts = {}
+        if with_counts:
+            for facet, bitmaps in self.bitmaps.items():
+                base = self.full
+                for name, bitmap in conditions.items():
+                    if name != facet:
+                        base = base & bitmap
+                counts[facet] = {
+                    str(value): popcount(base & bitmap) for value, bitmap in bitmaps.items()
+                }
+
+        return selected_bitmap, counts
+
+    def ranked_rows(self, bitmap):
+        """
+        Номери рядків з бітової карти за спаданням індексу придатності
+
+        Параметри:
+            bitmap (ndarray): Упакована бітова карта
+
+        Повертає:
+            ndarray: Номери рядків у порядку рейтингу
+        """
+        mask = self.mask(bitmap)
+        return self.rank_order[mask[self.rank_order]]
@@ -193,7 +193,9 @@ class HabitabilityCalculator:
                 'value': value,            # Значення параметра
                 'score': score,            # Оцінка (0-100)
                 'weight': weight * 100,    # Вага у відсотках
-                'contribution': score * weight  # Внесок у загальний індекс
+                'contribution': score * weight,  # Внесок у загальний індекс
+                # Чи значення оцінене конвеєром, а не виміряне
+                'imputed': bool(planet_data.get(f'{data_key}_imputed', False))
             }
         
         # Повертаємо словник з компонентами
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+Конвеєр обробки каталогу під час завантаження (ingest)
+Обчислює похідні колонки один раз на версію каталогу
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+# Імпорт налаштувань проекту
+from Project.settings import Config
+# Імпорт ядра зведення наборів параметрів
+from exoplanets.reduction import reduce_parameter_sets
+# Імпорт калькулятора придатності
+from exoplanets.habitability import HabitabilityCalculator
+# Імпорт перетворення небесних координат та просторового індексу
+from exoplanets.spatial import unit_vectors, SpatialIndex
+# Імпорт знімка каталогу
+from exoplanets.catalog import CatalogSnapshot
+# Імпорт вимірювання етапів запиту
+from Project.timing import span
+# Імпорт індексів знімка
+from exoplanets.query import build_name_index
+from exoplanets.facets import FacetIndex
+from exoplanets.systems import HostIndex
+from exoplanets.similarity import SimilarityIndex
+
+# Ефективна температура Сонця (K)
+SOLAR_TEFF = 5772.0
+# Кількість днів у році (для закону Кеплера)
+DAYS_PER_YEAR = 365.25
+
+# Коефіцієнти Kopparapu et al. (2014) для меж зони придатності
+# S_eff = S_eff_sun + a*T + b*T^2 + c*T^3 + d*T^4, де T = Teff - 5780
+HZ_COEFFICIENTS = {
+    'recent_venus':       (1.776, 2.136e-4, 2.533e-8, -1.332e-11, -3.097e-15),
+    'runaway_greenhouse': (1.107, 1.332e-4, 1.580e-8, -8.308e-12, -1.931e-15),
+    'maximum_greenhouse': (0.356, 6.171e-5, 1.698e-9, -3.198e-12, -5.575e-16),
+    'early_mars':         (0.320, 5.547e-5, 1.526e-9, -2.874e-12, -5.011e-16),
+}
+
+# Діапазон температур зірки, для якого справедлива апроксимація (K)
+HZ_TEFF_RANGE = (2600.0, 7200.0)
+
+# Співвідношення маса-радіус Chen & Kipping (2017): R = C * M^S (одиниці Землі)
+# Кожен запис: (верхня межа радіусу, C, S)
+MASS_RADIUS_RELATION = (
+    (1.23, 1.008, 0.279),   # Земноподібні планети (M < 2.04)
+    (14.3, 0.808, 0.589),   # Нептуноподібні планети (M < 131.6)
+)
+# Для газових гігантів радіус майже не залежить від маси - беремо масу Юпітера
+JUPITER_MASS = 317.8
+
+# Рівноважна температура при світловому потоці Землі та нульовому альбедо (K)
+EARTH_EQT_ZERO_ALBEDO = 278.6
+# Альбедо Бонда, що використовується для оцінки температури
+BOND_ALBEDO = 0.0
+
+
+def _column(planets_df, name):
+    """
+    Повертає колонку як масив float64 (NaN якщо колонки немає)
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з даними про планети
+        name (str): Назва колонки
+
+    Повертає:
+        ndarray: Значення колонки
+    """
+    if name in planets_df.columns:
+        return pd.to_numeric(planets_df[name], errors='coerce').to_numpy(dtype=np.float64)
+    return np.full(len(planets_df), np.nan)
+
+
+def reduce_parameters(planets_df):
+    """
+    Етап конвеєра: один рядок на планету при завантаженні всієї таблиці ps
+
+    Параметри:
+        planets_df (DataFrame): Сирі дані (можливо кілька наборів на планету)
+
+    Повертає:
+        DataFrame: Зведені дані
+    """
+    return reduce_parameter_sets(planets_df, Config.PARAMETER_REDUCTION)
+
+
+def stellar_luminosity(planets_df):
+    """
+    Розраховує світність зірки за законом Стефана-Больцмана
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з колонками st_rad та st_teff
+
+    Повертає:
+        ndarray: Світність у світностях Сонця (NaN якщо даних немає)
+    """
+    st_rad = _column(planets_df, 'st_rad')
+    st_teff = _column(planets_df, 'st_teff')
+    # L / L_sun = (R / R_sun)^2 * (Teff / Teff_sun)^4
+    return st_rad ** 2 * (st_teff / SOLAR_TEFF) ** 4
+
+
+def semi_major_axis(planets_df):
+    """
+    Розраховує велику піввісь орбіти за третім законом Кеплера
+    Якщо в даних є pl_orbsmax - використовує виміряне значення
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з колонками pl_orbper та st_mass
+
+    Повертає:
+        ndarray: Велика піввісь в астрономічних одиницях
+    """
+    period_years = _column(planets_df, 'pl_orbper') / DAYS_PER_YEAR
+    st_mass = _column(planets_df, 'st_mass')
+    # a^3 = M * P^2 (a в AU, M в масах Сонця, P в роках)
+    with np.errstate(invalid='ignore'):
+        axis = np.cbrt(st_mass * period_years ** 2)
+    measured = _column(planets_df, 'pl_orbsmax')
+    return np.where(np.isnan(measured), axis, measured)
+
+
+def add_habitable_zone(planets_df):
+    """
+    Етап конвеєра: межі зони придатності та положення планети відносно них
+
+    Додає колонки:
+        st_lum_calc - світність зірки (L_sun)
+        pl_orbsmax_calc - велика піввісь орбіти (AU)
+        hz_cons_inner, hz_cons_outer - консервативна зона (AU)
+        hz_opt_inner, hz_opt_outer - оптимістична зона (AU)
+        hz_position - 0 на внутрішній та 1 на зовнішній межі консервативної зони
+        in_hz_conservative, in_hz_optimistic - чи знаходиться планета в зоні
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з даними про планети
+
+    Повертає:
+        DataFrame: Таблиця з доданими колонками
+    """
+    df = planets_df.copy()
+
+    luminosity = stellar_luminosity(df)
+    axis = semi_major_axis(df)
+
+    # Температура поза діапазоном апроксимації обмежується його межами
+    t_star = np.clip(_column(df, 'st_teff'), *HZ_TEFF_RANGE) - 5780.0
+    powers = np.vstack([np.ones_like(t_star), t_star, t_star ** 2, t_star ** 3, t_star ** 4])
+
+    # Відстань до межі: d = sqrt(L / S_eff)
+    bounds = {}
+    for name, coefficients in HZ_COEFFICIENTS.items():
+        s_eff = np.asarray(coefficients) @ powers
+        with np.errstate(invalid='ignore'):
+            bounds[name] = np.sqrt(luminosity / s_eff)
+
+    df['st_lum_calc'] = luminosity
+    df['pl_orbsmax_calc'] = axis
+    df['hz_cons_inner'] = bounds['runaway_greenhouse']
+    df['hz_cons_outer'] = bounds['maximum_greenhouse']
+    df['hz_opt_inner'] = bounds['recent_venus']
+    df['hz_opt_outer'] = bounds['early_mars']
+
+    width = bounds['maximum_greenhouse'] - bounds['runaway_greenhouse']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        df['hz_position'] = (axis - bounds['runaway_greenhouse']) / width
+
+    # Порівняння з NaN дає False - планети без даних не потрапляють у зону
+    with np.errstate(invalid='ignore'):
+        df['in_hz_conservative'] = (axis >= bounds['runaway_greenhouse']) & \
+                                   (axis <= bounds['maximum_greenhouse'])
+        df['in_hz_optimistic'] = (axis >= bounds['recent_venus']) & \
+                                 (axis <= bounds['early_mars'])
+
+    return df
+
+
+def mass_from_radius(radius):
+    """
+    Оцінює масу планети за радіусом (обернене співвідношення маса-радіус)
+
+    Параметри:
+        radius (ndarray): Радіус у радіусах Землі
+
+    Повертає:
+        ndarray: Маса в масах Землі (NaN якщо радіус невідомий)
+    """
+    mass = np.full(radius.shape, np.nan)
+    lower = 0.0
+    with np.errstate(invalid='ignore'):
+        for upper, scale, slope in MASS_RADIUS_RELATION:
+            # Нижня межа входить у сегмент - радіус на межі не лишається без маси
+            segment = (radius > 0.0) & (radius >= lower) & (radius < upper)
+            mass[segment] = (radius[segment] / scale) ** (1.0 / slope)
+            lower = upper
+        mass[radius >= lower] = JUPITER_MASS
+    return mass
+
+
+def impute_missing_parameters(planets_df):
+    """
+    Етап конвеєра: заповнення відсутніх pl_masse, pl_insol та pl_eqt
+
+    Маса оцінюється за радіусом, світловий потік - за світністю зірки
+    та великою піввіссю, температура - за світловим потоком.
+    Для кожної колонки додається прапорець <колонка>_imputed.
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з даними про планети
+
+    Повертає:
+        DataFrame: Таблиця із заповненими значеннями
+    """
+    df = planets_df.copy()
+
+    # Світловий потік відносно Землі: S = L / a^2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        insol_estimate = stellar_luminosity(df) / semi_major_axis(df) ** 2
+
+    estimates = {
+        'pl_masse': lambda: mass_from_radius(_column(df, 'pl_rade')),
+        'pl_insol': lambda: insol_estimate,
+        # Температура рахується з уже заповненого потоку
+        'pl_eqt': lambda: EARTH_EQT_ZERO_ALBEDO * (
+            (1.0 - BOND_ALBEDO) * _column(df, 'pl_insol')) ** 0.25,
+    }
+
+    for column, estimate in estimates.items():
+        values = _column(df, column)
+        with np.errstate(invalid='ignore'):
+            imputed = estimate()
+        # Прапорець ставиться лише там, де оцінку вдалося отримати
+        flag = np.isnan(values) & ~np.isnan(imputed)
+        df[column] = np.where(flag, imputed, values)
+        df[f'{column}_imputed'] = flag
+
+    return df
+
+
+def add_cartesian_position(planets_df):
+    """
+    Етап конвеєра: положення системи в просторі відносно Сонця
+
+    Додає колонки pos_x, pos_y, pos_z (парсеки, екваторіальна система)
+    з ra, dec та sy_dist. Без координат значення дорівнюють NaN.
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з даними про планети
+
+    Повертає:
+        DataFrame: Таблиця з доданими колонками
+    """
+    df = planets_df.copy()
+    directions = unit_vectors(_column(df, 'ra'), _column(df, 'dec'))
+    positions = directions * _column(df, 'sy_dist')[:, None]
+    df['pos_x'] = positions[:, 0]
+    df['pos_y'] = positions[:, 1]
+    df['pos_z'] = positions[:, 2]
+    return df
+
+
+def score_habitability(planets_df):
+    """
+    Етап конвеєра: індекс придатності для кожної планети
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з даними про планети
+
+    Повертає:
+        DataFrame: Таблиця з колонкою habitability_index
+    """
+    return HabitabilityCalculator().calculate_batch(planets_df)
+
+
+class IngestPipeline:
+    """
+    Конвеєр обробки каталогу
+    Послідовно застосовує векторизовані етапи до сирих даних з архіву
+    """
+
+    def __init__(self, stages=None):
+        """
+        Ініціалізація конвеєра
+
+        Параметри:
+            stages (list): Список пар (назва, функція) - за замовчуванням DEFAULT_STAGES
+        """
+        self.stages = list(DEFAULT_STAGES if stages is None else stages)
+
+    def run(self, planets_df):
+        """
+        Виконує всі етапи конвеєра
+
+        Параметри:
+            planets_df (DataFrame): Сирі дані про планети
+
+        Повертає:
+            DataFrame: Дані з похідними колонками
+        """
+        df = planets_df
+        for name, stage in self.stages:
+            # Етапи видно в Server-Timing запиту, який оновив каталог
+            with span(f'ingest.{name}'):
+                df = stage(df)
+        return df
+
+    def build_snapshot(self, planets_df, version):
+        """
+        Виконує конвеєр та будує індекси знімка (для збереження на диск)
+
+        Параметри:
+            planets_df (DataFrame): Сирі дані про планети
+            version (str): Версія каталогу
+
+        Повертає:
+            CatalogSnapshot: Знімок з побудованими SNAPSHOT_INDEXES
+        """
+        snapshot = CatalogSnapshot(self.run(planets_df), version)
+        for name, builder in SNAPSHOT_INDEXES:
+            snapshot.get_index(name, builder)
+        return snapshot
+
+
+# Етапи конвеєра за замовчуванням (у порядку виконання)
+DEFAULT_STAGES = [
+    ('reduce_parameters', reduce_parameters),
+    ('habitable_zone', add_habitable_zone),
+    ('impute_missing', impute_missing_parameters),
+    ('cartesian_position', add_cartesian_position),
+    ('habitability', score_habitability),
+]
+
+# Індекси, які будуються під час завантаження і зберігаються разом зі знімком
+SNAPSHOT_INDEXES = [
+    ('names', build_name_index),
+    ('facets', FacetIndex),
+    ('hosts', HostIndex),
+    ('spatial', SpatialIndex),
+    ('similarity', SimilarityIndex),
+]
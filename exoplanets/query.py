@@ -0,0 +1,553 @@
+# -*- coding: utf-8 -*-
+"""
+Декларативні запити до каталогу планет
+Компілює JSON-запит (filter/sort/fields/limit) у векторизований план виконання
+"""
+
+# Імпорт модуля для впорядкованого словника (LRU кеш планів)
+from collections import OrderedDict
+# Імпорт модуля для синхронізації потоків
+import threading
+# Імпорт модуля для серіалізації ключа кешу
+import json
+# Імпорт модуля для хешування ключа запиту
+import hashlib
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+# Імпорт фасетного індексу
+from exoplanets.facets import FacetIndex, CATEGORY_FACETS, RANGE_FACETS, HABITABLE_ZONE_FACET
+# Імпорт курсорів пагінації
+from exoplanets.cursors import encode_cursor
+# Імпорт вимірювання етапів запиту
+from Project.timing import span
+# Імпорт метрик (лічильники кешу планів)
+from Project.metrics import metrics
+# Імпорт кешу з бюджетом пам'яті (впорядковані результати)
+from Project.cache import ResultCache, make_key
+# Імпорт налаштувань проекту
+from Project.settings import Config
+
+# Підтримувані оператори фільтрів
+OPERATORS = ('eq', 'ne', 'in', 'lt', 'lte', 'gt', 'gte', 'between', 'contains', 'isnull', 'notnull')
+# Оператори, значення яких - список
+LIST_OPERATORS = ('in', 'between')
+# Оператори порівняння, які виконуються через відсортовані колонки фасетів
+RANGE_OPERATORS = ('lt', 'lte', 'gt', 'gte', 'between')
+
+# Сортування за замовчуванням - рейтинг за індексом придатності
+DEFAULT_SORT = (('habitability_index', 'desc'),)
+# Кількість рядків у відповіді за замовчуванням
+DEFAULT_LIMIT = 50
+# Максимальна кількість скомпільованих планів у кеші
+MAX_CACHED_PLANS = 256
+
+# Булева колонка зони придатності -> значення фасету habitable_zone
+_HABITABLE_ZONE_VALUES = {column: value for value, column in HABITABLE_ZONE_FACET.items()}
+
+
+class QueryError(ValueError):
+    """Помилка в запиті користувача (неіснуюче поле, оператор або значення)"""
+
+
+def build_name_index(planets_df):
+    """
+    Хеш-індекс назва планети -> номер рядка
+
+    Параметри:
+        planets_df (DataFrame): Оброблені дані про планети
+
+    Повертає:
+        dict: Назва планети -> номер рядка
+    """
+    return {name: row for row, name in enumerate(planets_df['pl_name'])}
+
+
+def normalize_query(query):
+    """
+    Розділяє запит на форму (ключ кешу плану) та значення параметрів
+
+    Два запити з однаковими полями та операторами, але різними значеннями
+    мають однакову форму і використовують один скомпільований план.
+
+    Параметри:
+        query (dict): Запит {'filter': [...], 'sort': [...], 'fields': [...]}
+
+    Повертає:
+        tuple: (форма запиту, список значень фільтрів)
+    """
+    if not isinstance(query, dict):
+        raise QueryError("Запит має бути JSON-об'єктом")
+
+    conditions = []
+    for condition in query.get('filter') or []:
+        if not isinstance(condition, dict) or 'field' not in condition:
+            raise QueryError("Умова фільтра має містити 'field' та 'op'")
+        op = condition.get('op', 'eq')
+        if op not in OPERATORS:
+            raise QueryError(f"Невідомий оператор: {op}")
+        value = condition.get('value')
+        if op in LIST_OPERATORS:
+            if not isinstance(value, list) or (op == 'between' and len(value) != 2):
+                raise QueryError(f"Оператор {op} потребує списку значень")
+            value = list(value)
+        conditions.append((str(condition['field']), op, value))
+    # Порядок умов не впливає на результат - сортуємо для спільного кешу
+    conditions.sort(key=lambda item: (item[0], item[1]))
+
+    sort_items = query.get('sort') or []
+    if not isinstance(sort_items, list):
+        raise QueryError("Поле 'sort' має бути списком")
+    sort = []
+    for item in sort_items:
+        if isinstance(item, str):
+            item = {'field': item.lstrip('-'), 'order': 'desc' if item.startswith('-') else 'asc'}
+        if not isinstance(item, dict) or 'field' not in item:
+            raise QueryError("Елемент сортування має бути рядком або об'єктом з 'field'")
+        order = item.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            raise QueryError(f"Невідомий порядок сортування: {order}")
+        sort.append((str(item['field']), order))
+
+    fields = query.get('fields')
+    if fields is not None and (not isinstance(fields, list)
+                               or not all(isinstance(field, str) for field in fields)):
+        raise QueryError("Поле 'fields' має бути списком назв колонок")
+    shape = (
+        tuple((field, op) for field, op, _ in conditions),
+        tuple(sort) or DEFAULT_SORT,
+        tuple(fields) if fields else None
+    )
+    return shape, [value for _, _, value in conditions]
+
+
+def _predicate(values, op, value):
+    """
+    Векторизована перевірка умови для колонки
+
+    Параметри:
+        values (Series): Значення колонки
+        op (str): Оператор
+        value: Значення з запиту
+
+    Повертає:
+        ndarray: Булева маска
+    """
+    try:
+        if op == 'eq':
+            mask = values == value
+        elif op == 'ne':
+            mask = values != value
+        elif op == 'in':
+            mask = values.isin(value)
+        elif op == 'lt':
+            mask = values < value
+        elif op == 'lte':
+            mask = values <= value
+        elif op == 'gt':
+            mask = values > value
+        elif op == 'gte':
+            mask = values >= value
+        elif op == 'between':
+            mask = (values >= value[0]) & (values <= value[1])
+        elif op == 'contains':
+            mask = values.astype('string').str.contains(str(value), case=False, regex=False)
+            mask = mask.fillna(False)
+        elif op == 'isnull':
+            mask = values.isna()
+        else:
+            mask = values.notna()
+    except TypeError as e:
+        raise QueryError(f"Неможливо застосувати {op} до поля {values.name}: {e}")
+    return np.asarray(mask, dtype=bool)
+
+
+def _range_bounds(op, value):
+    """
+    Межі діапазону (включно) для оператора порівняння
+
+    Параметри:
+        op (str): Оператор порівняння
+        value: Значення з запиту
+
+    Повертає:
+        tuple: (нижня межа або None, верхня межа або None)
+    """
+    if op == 'between':
+        return float(value[0]), float(value[1])
+    value = float(value)
+    # Строгі нерівності переводимо у нестрогі через сусіднє число float
+    if op == 'gt':
+        return np.nextafter(value, np.inf), None
+    if op == 'gte':
+        return value, None
+    if op == 'lt':
+        return None, np.nextafter(value, -np.inf)
+    return None, value
+
+
+class OrderedResult:
+    """
+    Усі рядки результату запиту по порядку та кількість для фасетів
+    Розмір для бюджету кешу - розмір масиву рядків (кількості - кілька сотень байтів)
+    """
+
+    def __init__(self, rows, counts):
+        """
+        Параметри:
+            rows (ndarray): Номери рядків знімка по порядку
+            counts (dict): Кількість для фасетів
+        """
+        self.rows = rows
+        self.counts = counts
+
+    def __len__(self):
+        """Розмір запису в байтах"""
+        return self.rows.nbytes
+
+
+class QueryPlan:
+    """
+    Скомпільований план запиту
+
+    Кожна умова отримує спосіб виконання під час компіляції:
+        name - хеш-індекс за назвою планети (pl_name eq/in)
+        facet - бітові карти категоріальних фасетів та зони придатності
+        range - відсортовані колонки числових фасетів
+        scan - векторизована перевірка колонки
+    Сортування за індексом придатності використовує готовий рейтинг.
+    """
+
+    def __init__(self, shape):
+        """
+        Компіляція плану
+
+        Параметри:
+            shape (tuple): Форма запиту з normalize_query
+        """
+        conditions, sort, fields = shape
+        # Ключ форми запиту (як у кеші планів)
+        self.key = json.dumps(shape, default=str)
+        self.steps = []
+        for position, (field, op) in enumerate(conditions):
+            if field == 'pl_name' and op in ('eq', 'in'):
+                access = 'name'
+            elif field in CATEGORY_FACETS and op in ('eq', 'in'):
+                access = 'facet'
+            elif field in _HABITABLE_ZONE_VALUES and op == 'eq':
+                access = 'facet'
+            elif field in RANGE_FACETS and op in RANGE_OPERATORS:
+                access = 'range'
+            else:
+                access = 'scan'
+            self.steps.append((access, field, op, position))
+        self.sort = sort
+        self.use_rank = sort == DEFAULT_SORT
+        self.fields = list(fields) if fields else None
+        self.columns = {field for _, field, _, _ in self.steps} | {field for field, _ in sort}
+        if self.fields:
+            self.columns |= set(self.fields)
+
+    def explain(self):
+        """
+        Опис плану для відладки
+
+        Повертає:
+            list: Рядки виду 'facet:discoverymethod in'
+        """
+        steps = [f'{access}:{field} {op}' for access, field, op, _ in self.steps]
+        steps.append('rank_order' if self.use_rank else
+                     'sort:' + ','.join(f'{field} {order}' for field, order in self.sort))
+        return steps
+
+    def execute(self, snapshot, params, offset=0, limit=DEFAULT_LIMIT, with_counts=False):
+        """
+        Виконує план на знімку каталогу
+
+        Параметри:
+            snapshot (CatalogSnapshot): Знімок каталогу
+            params (list): Значення умов фільтра
+            offset (int): Скільки рядків пропустити
+            limit (int): Максимальна кількість рядків (None - без обмеження)
+            with_counts (bool): Чи рахувати кількість для фасетів
+
+        Повертає:
+            tuple: (номери рядків сторінки, кількість рядків результату, кількість для фасетів)
+        """
+        planets_df = snapshot.planets_df
+        missing = self.columns - set(planets_df.columns)
+        if missing:
+            raise QueryError(f"Невідомі поля: {', '.join(sorted(missing))}")
+
+        with span('filter'):
+            facet_index = snapshot.get_index('facets', FacetIndex)
+
+            rows = None       # Явний набір рядків (після пошуку за назвою)
+            empty = False     # Умови фасетів несумісні - результат порожній
+            filters = {}
+            ranges = {}
+            scans = []
+
+            for access, field, op, position in self.steps:
+                value = params[position]
+                if access == 'name':
+                    name_index = snapshot.get_index('names', build_name_index)
+                    names = value if op == 'in' else [value]
+                    found = np.unique([name_index[name] for name in names if name in name_index]).astype(np.int64)
+                    rows = found if rows is None else np.intersect1d(rows, found)
+                elif access == 'facet':
+                    if field in _HABITABLE_ZONE_VALUES:
+                        if value is not True:
+                            # Умова "не в зоні" не має бітової карти - перевіряємо колонку
+                            scans.append((field, op, value))
+                            continue
+                        field, selected = 'habitable_zone', [_HABITABLE_ZONE_VALUES[field]]
+                    else:
+                        selected = value if op == 'in' else [value]
+                    # Кілька умов на один фасет - перетин значень
+                    if field in filters:
+                        selected = [item for item in selected if item in filters[field]]
+                    filters[field] = selected
+                    empty = empty or not selected
+                elif access == 'range':
+                    try:
+                        low, high = _range_bounds(op, value)
+                    except (TypeError, ValueError):
+                        raise QueryError(f"Оператор {op} для поля {field} потребує числа")
+                    old_low, old_high = ranges.get(field, (None, None))
+                    if old_low is not None:
+                        low = old_low if low is None else max(low, old_low)
+                    if old_high is not None:
+                        high = old_high if high is None else min(high, old_high)
+                    ranges[field] = (low, high)
+                else:
+                    scans.append((field, op, value))
+
+            counts = {}
+            mask = None
+            if empty:
+                mask = np.zeros(facet_index.size, dtype=bool)
+            elif filters or ranges or with_counts:
+                bitmap, counts = facet_index.select(filters, ranges, with_counts)
+                mask = facet_index.mask(bitmap)
+
+            if rows is not None:
+                # Відомий невеликий набір рядків - перевіряємо умови лише для нього
+                if mask is not None:
+                    rows = rows[mask[rows]]
+                for field, op, value in scans:
+                    rows = rows[_predicate(planets_df[field].iloc[rows], op, value)]
+            elif scans:
+                if mask is None:
+                    mask = np.ones(len(planets_df), dtype=bool)
+                for field, op, value in scans:
+                    mask &= _predicate(planets_df[field], op, value)
+
+        with span('sort'):
+            rows = self._order(planets_df, facet_index, rows, mask)
+        total = len(rows)
+        end = None if limit is None else offset + limit
+        return rows[offset:end], total, counts
+
+    def _order(self, planets_df, facet_index, rows, mask):
+        """
+        Впорядковує рядки результату
+
+        Параметри:
+            planets_df (DataFrame): Дані знімка
+            facet_index (FacetIndex): Індекс з готовим рейтингом
+            rows (ndarray): Явний набір рядків або None
+            mask (ndarray): Маска результату або None (усі рядки)
+
+        Повертає:
+            ndarray: Номери рядків у потрібному порядку
+        """
+        if self.use_rank:
+            if rows is not None:
+                return rows[np.argsort(facet_index.rank_position[rows], kind='stable')]
+            if mask is None:
+                return facet_index.rank_order
+            return facet_index.rank_order[mask[facet_index.rank_order]]
+
+        if rows is None:
+            rows = np.arange(len(planets_df)) if mask is None else np.flatnonzero(mask)
+
+        # np.lexsort: останній ключ - головний
+        keys = []
+        for field, order in reversed(self.sort):
+            column = planets_df[field].iloc[rows]
+            if pd.api.types.is_numeric_dtype(column):
+                key = column.to_numpy(dtype=np.float64)
+                key = -key if order == 'desc' else key
+                # Відсутні значення завжди в кінці
+                key = np.where(np.isnan(key), np.inf, key)
+            else:
+                codes, _ = pd.factorize(column, sort=True)
+                key = np.where(codes < 0, np.iinfo(np.int64).max, -codes if order == 'desc' else codes)
+            keys.append(key)
+        return rows[np.lexsort(keys)]
+
+
+class QueryEngine:
+    """
+    Виконавець декларативних запитів з кешем скомпільованих планів
+    Кеш спільний для всіх екземплярів (як знімок у ExoplanetService)
+    """
+
+    # Форма запиту -> скомпільований план (LRU)
+    _plans = OrderedDict()
+    # Блокування кешу планів
+    _plans_lock = threading.Lock()
+    # Лічильники звернень до кешу планів
+    stats = {'hits': 0, 'misses': 0}
+    # (версія каталогу, ключ запиту, фасети) -> OrderedResult; кожен запис - O(N каталогу),
+    # тому кеш обмежений бюджетом пам'яті, а не кількістю записів
+    _results = ResultCache('query_results', Config.QUERY_RESULT_CACHE_MAX_BYTES)
+
+    def compile(self, query):
+        """
+        Повертає план для запиту (з кешу або новий)
+
+        Параметри:
+            query (dict): Запит
+
+        Повертає:
+            tuple: (QueryPlan, значення параметрів)
+        """
+        shape, params = normalize_query(query)
+        key = json.dumps(shape, default=str)
+        with QueryEngine._plans_lock:
+            plan = QueryEngine._plans.get(key)
+            if plan is not None:
+                QueryEngine._plans.move_to_end(key)
+                QueryEngine.stats['hits'] += 1
+                return plan, params
+            QueryEngine.stats['misses'] += 1
+
+        plan = QueryPlan(shape)
+        with QueryEngine._plans_lock:
+            QueryEngine._plans[key] = plan
+            while len(QueryEngine._plans) > MAX_CACHED_PLANS:
+                QueryEngine._plans.popitem(last=False)
+        return plan, params
+
+    def ordered_rows(self, snapshot, plan, params, query_key, with_counts):
+        """
+        Усі рядки результату в потрібному порядку (з кешу або новий розрахунок)
+
+        Наступні сторінки того ж запиту на тому ж знімку - лише зріз
+        готового масиву, без повторної фільтрації та сортування.
+
+        Параметри:
+            snapshot (CatalogSnapshot): Знімок каталогу
+            plan (QueryPlan): Скомпільований план
+            params (list): Значення умов фільтра
+            query_key (str): Ключ запиту
+            with_counts (bool): Чи рахувати кількість для фасетів
+
+        Повертає:
+            tuple: (номери рядків, кількість для фасетів)
+        """
+        key = make_key(snapshot.version, query_key, with_counts)
+        result = QueryEngine._results.get(key)
+        if result is not None:
+            return result.rows, result.counts
+
+        rows, _, counts = plan.execute(snapshot, params, 0, None, with_counts)
+        # Результат, більший за весь бюджет, не кешується (див. ResultCache)
+        QueryEngine._results.put(key, OrderedResult(rows, counts))
+        return rows, counts
+
+    @staticmethod
+    def query_key(plan, params):
+        """Ключ запиту: форма плану та значення фільтрів (без offset/limit)"""
+        raw = plan.key + json.dumps(params, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+    def select(self, snapshot, query):
+        """
+        Усі рядки результату без побудови таблиці (для потокового експорту)
+
+        Параметри:
+            snapshot (CatalogSnapshot): Знімок каталогу
+            query (dict): Запит з полями filter, sort, fields
+
+        Повертає:
+            tuple: (номери рядків знімка по порядку, колонки результату)
+        """
+        plan, params = self.compile(query)
+        rows, _ = self.ordered_rows(snapshot, plan, params, self.query_key(plan, params), False)
+        return rows, plan.fields or list(snapshot.planets_df.columns)
+
+    def run(self, snapshot, query, cursor=None):
+        """
+        Виконує запит на знімку каталогу
+
+        Параметри:
+            snapshot (CatalogSnapshot): Знімок каталогу
+            query (dict): Запит з полями filter, sort, fields, offset, limit, facets
+            cursor (dict): Розібраний курсор (decode_cursor) замість offset
+
+        Повертає:
+            dict: rows (DataFrame сторінки), positions (номери рядків знімка),
+                  total, facets, plan, next_cursor
+        """
+        plan, params = self.compile(query)
+        try:
+            offset = max(int(query.get('offset') or 0), 0)
+            limit = query.get('limit', DEFAULT_LIMIT)
+            limit = None if limit is None else max(int(limit), 0)
+        except (TypeError, ValueError):
+            raise QueryError("offset та limit мають бути цілими числами")
+
+        query_key = self.query_key(plan, params)
+        rows, counts = self.ordered_rows(snapshot, plan, params, query_key, bool(query.get('facets')))
+
+        if cursor is not None:
+            if cursor['version'] != snapshot.version or cursor['query_key'] != query_key:
+                raise QueryError("Курсор не відповідає запиту")
+            offset = cursor['position']
+            # Знімок незмінний, тож останній виданий рядок має бути на своєму місці
+            if offset > len(rows) or (offset > 0 and rows[offset - 1] != cursor['last_row']):
+                raise QueryError("Курсор не відповідає запиту")
+
+        with span('paginate'):
+            end = len(rows) if limit is None else min(offset + limit, len(rows))
+            page_rows = rows[offset:end]
+            next_cursor = None
+            if offset < end < len(rows):
+                next_cursor = encode_cursor(snapshot.version, query_key, end, int(rows[end - 1]))
+
+            page = snapshot.planets_df.iloc[page_rows]
+            if plan.fields:
+                page = page[plan.fields]
+        return {
+            'rows': page,
+            'positions': page_rows,
+            'total': len(rows),
+            'facets': counts,
+            'plan': plan.explain(),
+            'next_cursor': next_cursor
+        }
+
+
+def _plan_cache_metrics():
+    """Лічильники кешу скомпільованих планів для /metrics"""
+    labels = {'cache': 'query_plans'}
+    with QueryEngine._plans_lock:
+        return [
+            ('cache_hits_total', labels, QueryEngine.stats['hits']),
+            ('cache_misses_total', labels, QueryEngine.stats['misses']),
+            ('cache_entries', labels, len(QueryEngine._plans)),
+        ]
+
+
+def _reset_plan_cache_metrics():
+    """Обнуляє лічильники кешу планів (у воркері після fork)"""
+    QueryEngine._plans_lock = threading.Lock()
+    QueryEngine.stats = {'hits': 0, 'misses': 0}
+
+
+metrics.register_collector(_plan_cache_metrics, reset=_reset_plan_cache_metrics)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Зведення кількох наборів параметрів однієї планети в один рядок
+Використовується при завантаженні всієї таблиці ps (default_flag = 0 та 1)
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+
+# Методи зведення
+REDUCTION_METHODS = ('most_precise', 'weighted_mean')
+
+
+def measured_columns(planets_df):
+    """
+    Знаходить колонки, для яких у даних є похибки (<колонка>err1/err2)
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з даними про планети
+
+    Повертає:
+        list: Назви виміряних колонок
+    """
+    columns = set(planets_df.columns)
+    return [
+        column for column in planets_df.columns
+        if f'{column}err1' in columns and f'{column}err2' in columns
+    ]
+
+
+def _sigma(planets_df, column):
+    """
+    Симетрична похибка виміру: середнє з |err1| та |err2|
+
+    Параметри:
+        planets_df (DataFrame): Таблиця з даними
+        column (str): Назва виміряної колонки
+
+    Повертає:
+        ndarray: Похибка (NaN якщо обидві межі відсутні)
+    """
+    upper = np.abs(pd.to_numeric(planets_df[f'{column}err1'], errors='coerce').to_numpy(np.float64))
+    lower = np.abs(pd.to_numeric(planets_df[f'{column}err2'], errors='coerce').to_numpy(np.float64))
+    # Якщо відома лише одна межа - використовуємо її
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isnan(upper), lower, np.where(np.isnan(lower), upper, (upper + lower) / 2))
+
+
+def reduce_parameter_sets(planets_df, method='most_precise'):
+    """
+    Зводить усі набори параметрів кожної планети в один рядок
+
+    Рядки сортуються за планетою один раз, після чого кожен параметр
+    зводиться по межах груп без Python-циклу по планетах:
+        most_precise - значення з найменшою похибкою
+        weighted_mean - середнє, зважене оберненою дисперсією
+    Невиміряні колонки (назва зірки, метод відкриття...) беруться з
+    рядка default_flag = 1, а якщо його немає - з першого рядка групи.
+
+    Параметри:
+        planets_df (DataFrame): Усі набори параметрів з таблиці ps
+        method (str): Метод зведення (див. REDUCTION_METHODS)
+
+    Повертає:
+        DataFrame: Один рядок на планету з колонкою n_parameter_sets
+    """
+    if method not in REDUCTION_METHODS:
+        raise ValueError(f"Невідомий метод зведення: {method}")
+
+    # factorize нумерує планети в порядку першої появи
+    codes, uniques = pd.factorize(planets_df['pl_name'], sort=False)
+    if len(uniques) == len(planets_df):
+        # Кожна планета має лише один набір - зводити нічого
+        reduced = planets_df.copy()
+        reduced['n_parameter_sets'] = 1
+        return reduced
+
+    # Основний рядок кожної групи має бути першим після сортування
+    if 'default_flag' in planets_df.columns:
+        default_rank = -pd.to_numeric(planets_df['default_flag'], errors='coerce').fillna(0).to_numpy()
+    else:
+        default_rank = np.zeros(len(planets_df))
+    order = np.lexsort((default_rank, codes))
+
+    df = planets_df.iloc[order].reset_index(drop=True)
+    sorted_codes = codes[order]
+    position = np.arange(len(df))
+    # Початок кожної групи у відсортованому масиві
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(df)])
+
+    # Невиміряні колонки беремо з першого (основного) рядка групи
+    reduced = df.iloc[starts].reset_index(drop=True)
+
+    for column in measured_columns(df):
+        values = pd.to_numeric(df[column], errors='coerce').to_numpy(np.float64)
+        sigma = _sigma(df, column)
+        has_value = ~np.isnan(values)
+        has_sigma = has_value & (sigma > 0)
+
+        # Рівень якості: 0 - значення з похибкою, 1 - без похибки, 2 - немає значення
+        tier = np.where(has_sigma, 0, np.where(has_value, 1, 2))
+        # У межах групи: найкращий рівень, менша похибка, раніший рядок
+        best = np.lexsort((position, np.where(has_sigma, sigma, 0.0), tier, sorted_codes))[starts]
+
+        best_values = values[best]
+        err1 = pd.to_numeric(df[f'{column}err1'], errors='coerce').to_numpy(np.float64)[best]
+        err2 = pd.to_numeric(df[f'{column}err2'], errors='coerce').to_numpy(np.float64)[best]
+
+        if method == 'weighted_mean':
+            # Ваги 1 / sigma^2 лише для значень з відомою похибкою
+            weights = np.zeros(len(df))
+            weights[has_sigma] = 1.0 / sigma[has_sigma] ** 2
+            weight_sum = np.add.reduceat(weights, starts)
+            weighted = np.add.reduceat(weights * np.where(has_sigma, values, 0.0), starts)
+            combined = weight_sum > 0
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = weighted / weight_sum
+                mean_err = 1.0 / np.sqrt(weight_sum)
+            # Групи без похибок залишаються з найкращим доступним значенням
+            best_values = np.where(combined, mean, best_values)
+            err1 = np.where(combined, mean_err, err1)
+            err2 = np.where(combined, -mean_err, err2)
+
+        reduced[column] = best_values
+        reduced[f'{column}err1'] = err1
+        reduced[f'{column}err2'] = err2
+
+    reduced['n_parameter_sets'] = sizes
+    if 'default_flag' in reduced.columns:
+        reduced['default_flag'] = 1
+    return reduced
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Серіалізація таблиць планет у JSON
+Пише JSON безпосередньо з масивів колонок, без словника на кожен рядок
+"""
+
+# Імпорт модуля для кодування окремих значень
+import json
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+# Імпорт компонентів Flask
+from flask import Response, request
+# Імпорт вимірювання етапів запиту
+from Project.timing import timed
+
+
+def _json_value(value):
+    """Значення Python/numpy у вигляді, придатному для json (NaN, NA -> None)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+def _default(value):
+    """Кодування значень, яких не знає json (дати, інші типи numpy та pandas)"""
+    value = _json_value(value)
+    return str(value) if value is not None else None
+
+
+def _clean(value):
+    """Замінює NaN на None у вкладених словниках та списках"""
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(item) for item in value]
+    return _json_value(value)
+
+
+# Кодувальник окремих значень (NaN заздалегідь замінюються на None)
+_encode = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(',', ':'),
+                           default=_default).encode
+
+
+def column_fragments(column):
+    """
+    JSON-фрагменти всіх значень колонки
+
+    Числові колонки кодуються векторизовано; NaN та нескінченності стають null.
+
+    Параметри:
+        column (Series): Колонка таблиці
+
+    Повертає:
+        list: Рядки JSON для кожного значення
+    """
+    values = column.to_numpy()
+    if values.dtype.kind == 'b':
+        return np.where(values, 'true', 'false').tolist()
+    if values.dtype.kind in 'iu':
+        return list(map(str, values.tolist()))
+    if values.dtype.kind == 'f':
+        finite = np.isfinite(values)
+        return [repr(value) if ok else 'null' for value, ok in zip(values.tolist(), finite.tolist())]
+    # Рядки та змішані колонки - кодуємо кожне значення
+    return [_encode(_json_value(value)) for value in values]
+
+
+def _records(columns, fragments):
+    """JSON-об'єкти рядків з назв колонок та фрагментів значень"""
+    keys = [_encode(name) + ':' for name in columns]
+    return (
+        '{' + ','.join([key + value for key, value in zip(keys, row)]) + '}'
+        for row in zip(*fragments)
+    )
+
+
+def _join(columns, fragments, columnar):
+    """Збирає JSON таблиці з назв колонок та фрагментів значень"""
+    if columnar:
+        data = ','.join('[' + ','.join(values) + ']' for values in fragments)
+        return f'{{"columns":{_encode(columns)},"data":[{data}]}}'
+    return '[' + ','.join(_records(columns, fragments)) + ']'
+
+
+def frame_lines(frame):
+    """
+    Рядки таблиці як окремі JSON-об'єкти (для NDJSON)
+
+    Параметри:
+        frame (DataFrame): Таблиця
+
+    Повертає:
+        str: Об'єкти, кожен у своєму рядку (з завершальним переведенням рядка)
+    """
+    columns = [str(name) for name in frame.columns]
+    fragments = [column_fragments(frame[name]) for name in frame.columns]
+    return ''.join(record + '\n' for record in _records(columns, fragments))
+
+
+def frame_json(frame, columnar=False):
+    """
+    Кодує таблицю в JSON
+
+    Параметри:
+        frame (DataFrame): Таблиця
+        columnar (bool): False - список записів [{колонка: значення}],
+                         True - {"columns": [...], "data": [[значення колонки], ...]}
+
+    Повертає:
+        str: JSON
+    """
+    columns = [str(name) for name in frame.columns]
+    fragments = [column_fragments(frame[name]) for name in frame.columns]
+    return _join(columns, fragments, columnar)
+
+
+def records(frame):
+    """
+    Рядки таблиці як список словників для шаблонів
+
+    Параметри:
+        frame (DataFrame): Таблиця
+
+    Повертає:
+        list: Словники рядків; пропущені значення - None, значення numpy - типи Python
+    """
+    return [_clean(record) for record in frame.to_dict('records')]
+
+
+class RawJSON(str):
+    """Готовий JSON-текст, який dumps вставляє у відповідь без змін"""
+
+
+def dumps(payload, columnar=False):
+    """
+    Кодує відповідь, в якій значеннями верхнього рівня можуть бути таблиці
+
+    Параметри:
+        payload (dict): Відповідь; DataFrame-значення кодуються через frame_json,
+                        RawJSON вставляється як є. Таблиця або список замість
+                        словника кодуються цілком
+        columnar (bool): Форма таблиць (див. frame_json)
+
+    Повертає:
+        str: JSON
+    """
+    if isinstance(payload, pd.DataFrame):
+        return frame_json(payload, columnar)
+    if not isinstance(payload, dict):
+        return _encode(_clean(payload))
+    parts = []
+    for key, value in payload.items():
+        if isinstance(value, RawJSON):
+            encoded = value
+        elif isinstance(value, pd.DataFrame):
+            encoded = frame_json(value, columnar)
+        else:
+            encoded = _encode(_clean(value))
+        parts.append(f'{_encode(str(key))}:{encoded}')
+    return '{' + ','.join(parts) + '}'
+
+
+@timed('serialize')
+def json_response(payload, columnar=False, status=200):
+    """
+    JSON-відповідь Flask для словника з таблицями
+
+    Параметри:
+        payload (dict): Відповідь (див. dumps)
+        columnar (bool): Форма таблиць
+        status (int): HTTP статус
+
+    Повертає:
+        Response: Відповідь з типом application/json
+    """
+    return Response(dumps(payload, columnar), status=status, mimetype='application/json')
+
+
+def response_shape():
+    """
+    Форма JSON-відповіді з параметрів запиту
+
+    fields=pl_name,pl_rade - лише вказані колонки
+    columnar=1 - таблиці у формі {"columns": [...], "data": [...]}
+
+    Повертає:
+        tuple: (список колонок або None, columnar)
+    """
+    fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
+    columnar = request.args.get('columnar', '').lower() in ('1', 'true', 'yes')
+    return fields or None, columnar
+
+
+@timed('serialize')
+def page_json(result, columnar=False):
+    """
+    JSON сторінки результату QueryEngine.run
+
+    Кодуються лише рядки сторінки: фрагменти всього каталогу в пам'яті
+    були б другою копією знімка, а готові відповіді все одно кешуються.
+
+    Параметри:
+        result (dict): Результат QueryEngine.run
+        columnar (bool): Форма таблиці
+
+    Повертає:
+        RawJSON: JSON рядків сторінки
+    """
+    return RawJSON(frame_json(result['rows'], columnar))
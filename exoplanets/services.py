@@ -4,16 +4,66 @@
 Відповідає за завантаження та кешування даних з NASA API
 """
 
-# Імпорт бібліотеки для роботи з даними у вигляді таблиць
-import pandas as pd
-# Імпорт бібліотеки для HTTP запитів
-import requests
 # Імпорт модулів для роботи з датою та часом
 from datetime import datetime, timedelta
 # Імпорт модуля для роботи з файловою системою
 import os
+# Імпорт модуля для синхронізації потоків
+import threading
+# Імпорт модуля для роботи з часом
+import time
+# Імпорт контексту запиту Flask
+from flask import g
 # Імпорт налаштувань проекту
 from Project.settings import Config
+# Імпорт знімка каталогу
+from exoplanets.catalog import CatalogSnapshot, SNAPSHOT_FORMAT
+# Імпорт нормалізованого ключа (ім'я файлу знімка)
+from Project.cache import make_key
+# Імпорт відкладеного імпорту модулів
+from Project.lazy import LazyObject, lazy_import
+# Імпорт вимірювання етапів запиту
+from Project.timing import span
+# Імпорт метрик (тривалість та результат оновлень каталогу)
+from Project.metrics import metrics
+
+# pandas, requests та конвеєр потрібні лише для обробки нової версії каталогу,
+# тому імпортуються при першому використанні, а не під час запуску додатку
+pd = lazy_import('pandas')
+requests = lazy_import('requests')
+ingest = lazy_import('exoplanets.pipeline')
+
+# Версія формату готових відповідей (збільшується при зміні серіалізації),
+# щоб дисковий кеш та ETag не віддавали відповіді старого формату
+RESPONSE_FORMAT = 1
+
+
+def settings_fingerprint():
+    """
+    Відбиток налаштувань, від яких залежать оброблені дані каталогу
+    (формат знімка, зведення наборів параметрів, ваги та діапазони індексу)
+    
+    Повертає:
+        str: Короткий хеш налаштувань
+    """
+    return make_key(SNAPSHOT_FORMAT, Config.INGEST_ALL_PARAMETER_SETS,
+                    Config.PARAMETER_REDUCTION, Config.HABITABILITY_WEIGHTS,
+                    Config.OPTIMAL_RANGES)[:12]
+
+
+def cache_version(version):
+    """
+    Версія для ключів кешів відповідей та ETag
+    Змінюється разом з каталогом, налаштуваннями обробки або форматом відповідей
+    
+    Параметри:
+        version (str): Версія каталогу
+    
+    Повертає:
+        str: Версія готових відповідей
+    """
+    return f'{version}-{settings_fingerprint()}-{RESPONSE_FORMAT}'
+
 
 class ExoplanetService:
     """
@@ -21,6 +71,15 @@ class ExoplanetService:
     Завантажує дані з NASA Exoplanet Archive та кешує їх локально
     """
     
+    # Поточний знімок каталогу - спільний для всіх екземплярів сервісу
+    _snapshot = None
+    # Блокування для побудови знімка лише в одному потоці
+    _snapshot_lock = threading.Lock()
+    # Попередні знімки для відкритих курсорів: версія -> (знімок, час заміни)
+    _retired = {}
+    # Прапорець готовності: каталог завантажено, оброблено та проіндексовано
+    ready = False
+    
     def __init__(self):
         """
         Ініціалізація сервісу
@@ -32,6 +91,211 @@ class ExoplanetService:
         self.cache_file = Config.DATA_CACHE_FILE
         # Час життя кешу в секундах
         self.cache_timeout = Config.CACHE_TIMEOUT
+        # Конвеєр обробки, який виконується один раз на версію каталогу
+        self.pipeline = LazyObject(lambda: ingest.IngestPipeline())
+    
+    def get_catalog_version(self):
+        """
+        Визначає версію каталогу за файлом кешу
+        
+        Повертає:
+            str: Версія каталогу або None якщо кешу немає
+        """
+        if not os.path.exists(self.cache_file):
+            return None
+        return self._version(os.stat(self.cache_file))
+    
+    @staticmethod
+    def _version(stat):
+        """Версія каталогу за атрибутами файлу кешу"""
+        # Версія змінюється при кожному перезаписі файлу кешу
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    
+    def get_fresh_version(self):
+        """
+        Версія актуального каталогу без читання даних (для умовних HTTP запитів)
+        
+        Повертає:
+            tuple: (версія, час оновлення архіву timestamp) або None,
+                   якщо кешу немає або він застарів і буде оновлений
+        """
+        try:
+            stat = os.stat(self.cache_file)
+        except OSError:
+            return None
+        if time.time() - stat.st_mtime >= self.cache_timeout:
+            return None
+        return self._version(stat), stat.st_mtime
+    
+    def get_snapshot(self):
+        """
+        Повертає знімок каталогу для поточного файлу кешу
+        Читання CSV та конвеєр виконуються лише при зміні версії
+        
+        Повертає:
+            CatalogSnapshot: Знімок каталогу або None якщо кешу немає
+        """
+        version = self.get_catalog_version()
+        if version is None:
+            return None
+        
+        snapshot = ExoplanetService._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        
+        with ExoplanetService._snapshot_lock:
+            # Інший потік міг уже побудувати знімок, поки ми чекали
+            snapshot = ExoplanetService._snapshot
+            if snapshot is not None and snapshot.version == version:
+                return snapshot
+            
+            started = time.perf_counter()
+            source = 'snapshot_file'
+            try:
+                snapshot = self.load_persisted_snapshot(version)
+                if snapshot is None:
+                    # Завантажуємо сирі дані та виконуємо конвеєр обробки
+                    print("✓ Завантаження даних з кешу...")
+                    source = 'csv'
+                    snapshot = self.pipeline.build_snapshot(pd.read_csv(self.cache_file), version)
+                    self.persist_snapshot(snapshot)
+            except Exception:
+                self._record_refresh(source, 'error', started)
+                raise
+            self._record_refresh(source, 'ok', started)
+            previous = ExoplanetService._snapshot
+            if previous is not None:
+                # Старий знімок ще обслуговує курсори протягом пільгового періоду
+                ExoplanetService._retired[previous.version] = (previous, time.time())
+            self._prune_retired()
+            ExoplanetService._snapshot = snapshot
+            ExoplanetService.ready = True
+            return snapshot
+    
+    @staticmethod
+    def _record_refresh(source, outcome, started):
+        """
+        Записує тривалість оновлення каталогу в метрики
+        
+        Параметри:
+            source (str): Джерело ('api', 'csv' або 'snapshot_file')
+            outcome (str): Результат ('ok' або 'error')
+            started (float): Початок оновлення (time.perf_counter)
+        """
+        metrics.observe('catalog_refresh_duration_seconds', {'source': source, 'outcome': outcome},
+                        time.perf_counter() - started)
+    
+    @staticmethod
+    def snapshot_path(version):
+        """
+        Шлях до файлу збереженого знімка
+        Ім'я залежить від версії каталогу та налаштувань конвеєра,
+        тому зміна ваг чи методу зведення не використає старий файл
+        
+        Параметри:
+            version (str): Версія каталогу
+        
+        Повертає:
+            str: Шлях до файлу
+        """
+        return os.path.join(Config.SNAPSHOT_DIR, f'{version}-{settings_fingerprint()}.pkl')
+    
+    def load_persisted_snapshot(self, version):
+        """
+        Завантажує оброблений знімок, збережений попереднім процесом
+        
+        Параметри:
+            version (str): Версія каталогу
+        
+        Повертає:
+            CatalogSnapshot: Знімок або None якщо файлу немає чи він пошкоджений
+        """
+        path = self.snapshot_path(version)
+        if not os.path.exists(path):
+            return None
+        try:
+            snapshot = CatalogSnapshot.load(path)
+        except Exception as e:
+            print(f"⚠ Пошкоджений файл знімка {path}: {e}")
+            return None
+        if snapshot.version != version:
+            return None
+        print(f"✓ Завантаження обробленого знімка {version}...")
+        return snapshot
+    
+    def persist_snapshot(self, snapshot):
+        """
+        Зберігає знімок на диск і видаляє старі файли знімків
+        Помилка запису не заважає обслуговувати запити
+        
+        Параметри:
+            snapshot (CatalogSnapshot): Новий знімок
+        """
+        try:
+            snapshot.save(self.snapshot_path(snapshot.version))
+            files = sorted((entry for entry in os.scandir(Config.SNAPSHOT_DIR)
+                            if entry.name.endswith('.pkl')),
+                           key=lambda entry: entry.stat().st_mtime, reverse=True)
+            for entry in files[Config.SNAPSHOT_KEEP:]:
+                os.remove(entry.path)
+        except OSError as e:
+            print(f"⚠ Не вдалося зберегти знімок: {e}")
+    
+    @staticmethod
+    def _prune_retired():
+        """
+        Видаляє старі знімки, пільговий період яких минув (під _snapshot_lock)
+        Знімок, який ще читає хоча б один запит, звільняється після його завершення
+        """
+        deadline = time.time() - Config.CURSOR_GRACE_PERIOD
+        for version, (snapshot, retired_at) in list(ExoplanetService._retired.items()):
+            if retired_at < deadline and snapshot.readers <= 0:
+                del ExoplanetService._retired[version]
+    
+    def acquire_snapshot(self, version=None):
+        """
+        Бере знімок каталогу для одного запиту
+        Знімок не звільняється, доки запит не викличе release_snapshot
+        
+        Параметри:
+            version (str): Версія каталогу (None - поточна)
+        
+        Повертає:
+            CatalogSnapshot: Знімок або None якщо даних немає
+        """
+        snapshot = self.get_catalog() if version is None else self.get_snapshot_version(version)
+        return snapshot.acquire() if snapshot is not None else None
+    
+    @staticmethod
+    def release_snapshot(snapshot):
+        """
+        Повертає знімок, взятий через acquire_snapshot
+        
+        Параметри:
+            snapshot (CatalogSnapshot): Знімок запиту
+        """
+        if snapshot.release() <= 0:
+            with ExoplanetService._snapshot_lock:
+                ExoplanetService._prune_retired()
+    
+    def get_snapshot_version(self, version):
+        """
+        Повертає знімок конкретної версії каталогу (для продовження курсора)
+        
+        Параметри:
+            version (str): Версія каталогу з курсора
+        
+        Повертає:
+            CatalogSnapshot: Поточний або збережений знімок, None якщо версія застаріла
+        """
+        snapshot = self.get_catalog()
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        
+        with ExoplanetService._snapshot_lock:
+            self._prune_retired()
+            retired = ExoplanetService._retired.get(version)
+        return retired[0] if retired is not None else None
     
     def get_planets_data(self, force_refresh=False):
         """
@@ -43,6 +307,19 @@ class ExoplanetService:
         Повертає:
             DataFrame: Таблиця з даними про планети або None у разі помилки
         """
+        snapshot = self.get_catalog(force_refresh)
+        return snapshot.planets_df if snapshot is not None else None
+    
+    def get_catalog(self, force_refresh=False):
+        """
+        Отримує знімок каталогу з кешу або API
+        
+        Параметри:
+            force_refresh (bool): Якщо True - примусово оновлює дані з API
+        
+        Повертає:
+            CatalogSnapshot: Знімок каталогу або None у разі помилки
+        """
         
         # Перевіряємо чи потрібно використовувати кеш
         if not force_refresh and os.path.exists(self.cache_file):
@@ -53,16 +330,17 @@ class ExoplanetService:
             
             # Якщо кеш ще актуальний - завантажуємо з нього
             if cache_age < timedelta(seconds=self.cache_timeout):
-                print("✓ Завантаження даних з кешу...")
-                return pd.read_csv(self.cache_file)
+                return self.get_snapshot()
         
         # Якщо кеш застарів або не існує - завантажуємо з API
         print("⟳ Завантаження даних з NASA Exoplanet Archive...")
+        started = time.perf_counter()
         try:
             # SQL запит для отримання даних про планети
             query = """
             SELECT 
                 pl_name, hostname, discoverymethod, disc_year, disc_facility,
+                ra, dec,
                 pl_rade, pl_radeerr1, pl_radeerr2,
                 pl_masse, pl_masseerr1, pl_masseerr2,
                 pl_orbper, pl_orbpererr1, pl_orbpererr2,
@@ -76,8 +354,10 @@ class ExoplanetService:
                 sy_snum, sy_pnum,
                 default_flag
             FROM ps
-            WHERE default_flag = 1
             """
+            # Без фільтра отримуємо всі набори параметрів, які зводяться конвеєром
+            if not Config.INGEST_ALL_PARAMETER_SETS:
+                query += "WHERE default_flag = 1"
             
             # Параметри запиту до API
             params = {
@@ -97,21 +377,87 @@ class ExoplanetService:
             with open(self.cache_file, 'w', encoding='utf-8') as f:
                 f.write(response.text)
             
-            # Завантажуємо дані з файлу у DataFrame
-            df = pd.read_csv(self.cache_file)
+            # Завантажуємо та обробляємо дані з файлу
+            snapshot = self.get_snapshot()
             
             # Виводимо інформацію про кількість завантажених планет
-            print(f"✓ Завантажено {len(df)} планет")
-            return df
+            print(f"✓ Завантажено {len(snapshot)} планет")
+            self._record_refresh('api', 'ok', started)
+            return snapshot
         
         except Exception as e:
             # У разі помилки виводимо повідомлення
             print(f"✗ Помилка завантаження даних: {e}")
+            self._record_refresh('api', 'error', started)
             
             # Спробуємо завантажити застарілі дані з кешу
             if os.path.exists(self.cache_file):
                 print("⚠ Використання застарілого кешу...")
-                return pd.read_csv(self.cache_file)
+                return self.get_snapshot()
             
             # Якщо кеш не існує - повертаємо None
             return None
+
+
+def held_snapshot(version=None):
+    """
+    Знімок, уже взятий поточним HTTP-запитом
+    
+    Параметри:
+        version (str): Потрібна версія каталогу (None - будь-який взятий знімок)
+    
+    Повертає:
+        CatalogSnapshot: Знімок або None якщо запит ще не брав знімок
+    """
+    for snapshot in g.get('catalog_snapshots', []):
+        if version is None or snapshot.version == version:
+            return snapshot
+    return None
+
+
+def hold_snapshot(snapshot):
+    """
+    Прив'язує взятий знімок до поточного HTTP-запиту
+    
+    Параметри:
+        snapshot (CatalogSnapshot): Знімок з acquire_snapshot (або None)
+    
+    Повертає:
+        CatalogSnapshot: Той самий знімок
+    """
+    if snapshot is not None:
+        g.setdefault('catalog_snapshots', []).append(snapshot)
+    return snapshot
+
+
+def request_snapshot(service, version=None):
+    """
+    Знімок каталогу для поточного HTTP-запиту
+    
+    Перше звернення в запиті бере знімок через acquire_snapshot, наступні
+    повертають той самий знімок, тому всі дані запиту узгоджені навіть якщо
+    каталог оновився посеред запиту. Звільняється в release_request_snapshots.
+    
+    Параметри:
+        service (ExoplanetService): Сервіс даних
+        version (str): Версія каталогу (None - знімок, уже взятий запитом, або поточна)
+    
+    Повертає:
+        CatalogSnapshot: Знімок або None якщо даних немає
+    """
+    snapshot = held_snapshot(version)
+    if snapshot is None:
+        with span('snapshot'):
+            snapshot = hold_snapshot(service.acquire_snapshot(version))
+    return snapshot
+
+
+def release_request_snapshots(exception=None):
+    """
+    Звільняє знімки, взяті під час HTTP-запиту (обробник teardown_request)
+    
+    Параметри:
+        exception (Exception): Помилка запиту (не використовується)
+    """
+    for snapshot in g.pop('catalog_snapshots', []):
+        ExoplanetService.release_snapshot(snapshot)
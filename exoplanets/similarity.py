@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Пошук схожих планет (k найближчих сусідів)
+Порівнює планети в нормалізованому просторі фізичних параметрів
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+# Імпорт налаштувань проекту
+from Project.settings import Config
+
+# Параметри порівняння: (колонка, параметр конфігурації, логарифмічна шкала)
+SIMILARITY_FEATURES = (
+    ('pl_rade', 'radius', True),
+    ('pl_masse', 'mass', True),
+    ('pl_eqt', 'temperature', True),
+    ('pl_insol', 'stellar_flux', True),
+    ('pl_orbper', 'orbital_period', True),
+    ('pl_orbeccen', 'eccentricity', False),
+)
+
+# Мінімальна кількість спільних параметрів для порівняння двох планет
+MIN_SHARED_FEATURES = 3
+
+# Розмір блоку рядків для матричних обчислень
+BLOCK_SIZE = 65536
+
+
+class SimilarityIndex:
+    """
+    Індекс схожості планет для однієї версії каталогу
+
+    Параметри кожної планети переводяться в логарифмічну шкалу (крім
+    ексцентриситету) та стандартизуються. Відсутні та оцінені конвеєром
+    значення не беруть участі в порівнянні: відстань рахується лише за
+    спільними параметрами і масштабується на їх кількість.
+    """
+
+    def __init__(self, planets_df):
+        """
+        Побудова індексу
+
+        Параметри:
+            planets_df (DataFrame): Оброблені дані про планети
+        """
+        self.planets_df = planets_df
+        columns = []
+        for column, _, log_scale in SIMILARITY_FEATURES:
+            values = pd.to_numeric(planets_df[column], errors='coerce').to_numpy(np.float64) \
+                if column in planets_df.columns else np.full(len(planets_df), np.nan)
+            # Значення, оцінені конвеєром, не є вимірами - вважаємо їх відсутніми
+            imputed = f'{column}_imputed'
+            if imputed in planets_df.columns:
+                values = np.where(planets_df[imputed].to_numpy(dtype=bool), np.nan, values)
+            columns.append(self._transform(values, log_scale))
+
+        features = np.column_stack(columns)
+        # Параметри стандартизації рахуються за всім каталогом
+        self.mean = np.nanmean(features, axis=0)
+        self.std = np.nanstd(features, axis=0)
+        self.std[~(self.std > 0)] = 1.0
+
+        normalized = (features - self.mean) / self.std
+        # mask - 1 там, де значення відоме; values - нормалізовані значення з 0 замість NaN
+        self.mask = (~np.isnan(normalized)).astype(np.float64)
+        self.values = np.where(self.mask > 0, normalized, 0.0)
+        self.squares = self.values ** 2
+
+        # Позиція рядка за назвою планети
+        self.positions = {name: row for row, name in enumerate(planets_df['pl_name'])}
+
+    @staticmethod
+    def _transform(values, log_scale):
+        """
+        Переводить значення в шкалу порівняння
+
+        Параметри:
+            values (ndarray): Сирі значення
+            log_scale (bool): Чи використовувати log10
+
+        Повертає:
+            ndarray: Перетворені значення (NaN для непридатних)
+        """
+        if not log_scale:
+            return values
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(values > 0, np.log10(values), np.nan)
+
+    def earth_vector(self):
+        """
+        Вектор параметрів Землі (оптимальні значення з конфігурації)
+
+        Повертає:
+            tuple: (нормалізований вектор, маска відомих значень)
+        """
+        raw = np.array([
+            self._transform(np.array([Config.OPTIMAL_RANGES[param]['optimal']], dtype=np.float64), log_scale)[0]
+            for _, param, log_scale in SIMILARITY_FEATURES
+        ])
+        vector = (raw - self.mean) / self.std
+        return np.nan_to_num(vector), (~np.isnan(vector)).astype(np.float64)
+
+    def query(self, vector, mask, k=10, exclude=None):
+        """
+        Знаходить k найближчих планет до вектора параметрів
+
+        Квадрат відстані за спільними параметрами розкладається на три
+        добутки матриця-вектор, тому один запит - кілька проходів BLAS.
+
+        Параметри:
+            vector (ndarray): Нормалізований вектор (0 для відсутніх значень)
+            mask (ndarray): 1 для відомих параметрів запиту
+            k (int): Кількість сусідів
+            exclude (int): Рядок, який не включати (сама планета)
+
+        Повертає:
+            list: Пари (рядок, відстань, кількість спільних параметрів)
+        """
+        total = len(self.values)
+        distances = np.empty(total)
+        shared = np.empty(total)
+        weighted = vector * mask
+        weighted_squares = weighted * vector
+
+        for start in range(0, total, BLOCK_SIZE):
+            block = slice(start, start + BLOCK_SIZE)
+            # sum m*M*(x - q)^2 = M x^2 . m - 2 x . (m q) + M . (m q^2)
+            squared = (self.squares[block] @ mask
+                       - 2.0 * (self.values[block] @ weighted)
+                       + self.mask[block] @ weighted_squares)
+            shared[block] = self.mask[block] @ mask
+            with np.errstate(invalid='ignore', divide='ignore'):
+                # Масштабуємо на кількість спільних параметрів
+                distances[block] = np.sqrt(np.maximum(squared, 0.0) * len(mask) / shared[block])
+
+        distances[shared < min(MIN_SHARED_FEATURES, mask.sum())] = np.inf
+        if exclude is not None:
+            distances[exclude] = np.inf
+
+        k = max(0, min(k, total))
+        if k == 0:
+            return []
+        # Часткове сортування: O(N) відбір + сортування лише k кандидатів
+        candidates = np.argpartition(distances, k - 1)[:k]
+        candidates = candidates[np.argsort(distances[candidates], kind='stable')]
+        return [
+            (int(row), float(distances[row]), int(shared[row]))
+            for row in candidates if np.isfinite(distances[row])
+        ]
+
+    def similar_to(self, planet_name, k=10):
+        """
+        Схожі планети для планети з каталогу
+
+        Параметри:
+            planet_name (str): Назва планети
+            k (int): Кількість сусідів
+
+        Повертає:
+            list: Пари (рядок, відстань, спільні параметри) або None якщо планети немає
+        """
+        row = self.positions.get(planet_name)
+        if row is None:
+            return None
+        return self.query(self.values[row], self.mask[row], k, exclude=row)
+
+    def similar_to_earth(self, k=10):
+        """
+        Планети, найближчі до Землі
+
+        Параметри:
+            k (int): Кількість сусідів
+
+        Повертає:
+            list: Пари (рядок, відстань, спільні параметри)
+        """
+        vector, mask = self.earth_vector()
+        return self.query(vector, mask, k)
+
+    def describe(self, neighbours):
+        """
+        Перетворює результат пошуку у список словників для відповіді
+
+        Параметри:
+            neighbours (list): Результат query / similar_to
+
+        Повертає:
+            list: Назва, зірка, індекс придатності та відстань для кожної планети
+        """
+        result = []
+        for row, distance, shared in neighbours:
+            planet = self.planets_df.iloc[row]
+            result.append({
+                'pl_name': planet['pl_name'],
+                'hostname': planet['hostname'],
+                'habitability_index': float(planet['habitability_index']),
+                'distance': round(distance, 4),
+                'shared_parameters': shared
+            })
+        return result
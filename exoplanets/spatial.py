@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Просторовий індекс планет
+Пошук у конусі на небі (RA/Dec) та в радіусі навколо точки в просторі
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+
+# Розмір комірки сітки для тривимірних позицій (парсеки)
+SPACE_CELL_SIZE = 10.0
+# Розмір комірки сітки на одиничній сфері (~3 градуси)
+SKY_CELL_SIZE = 0.05
+
+# Зсув координат комірки при пакуванні трьох індексів в одне число
+_CELL_OFFSET = 1 << 20
+_CELL_BITS = 21
+
+
+def unit_vectors(ra, dec):
+    """
+    Одиничні вектори напрямку за прямим піднесенням та схиленням
+
+    Параметри:
+        ra (ndarray): Пряме піднесення (градуси)
+        dec (ndarray): Схилення (градуси)
+
+    Повертає:
+        ndarray: Масив N x 3
+    """
+    ra = np.radians(ra)
+    dec = np.radians(dec)
+    cos_dec = np.cos(dec)
+    return np.column_stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)])
+
+
+class GridIndex:
+    """
+    Статична сітка для пошуку точок у кулі
+
+    Точки сортуються за номером комірки, тому точки однієї комірки
+    лежать поруч. Запит перебирає лише комірки, що перетинають кулю.
+    """
+
+    def __init__(self, points, cell_size):
+        """
+        Побудова сітки
+
+        Параметри:
+            points (ndarray): Координати N x 3 (NaN - точка не індексується)
+            cell_size (float): Розмір комірки
+        """
+        self.cell_size = cell_size
+        rows = np.flatnonzero(np.isfinite(points).all(axis=1))
+        keys = self._keys(np.floor(points[rows] / cell_size).astype(np.int64))
+        order = np.argsort(keys, kind='stable')
+        # Номери рядків каталогу, відсортовані за коміркою
+        self.rows = rows[order]
+        self.keys = keys[order]
+        self.points = points[self.rows]
+
+    @staticmethod
+    def _keys(cells):
+        """Пакує три індекси комірки в одне число int64"""
+        shifted = cells + _CELL_OFFSET
+        return (shifted[:, 0] << (2 * _CELL_BITS)) | (shifted[:, 1] << _CELL_BITS) | shifted[:, 2]
+
+    def ball(self, center, radius):
+        """
+        Знаходить точки в кулі
+
+        Параметри:
+            center (ndarray): Центр кулі (3 координати)
+            radius (float): Радіус кулі
+
+        Повертає:
+            tuple: (номери рядків каталогу, відстані до центру)
+        """
+        if not np.isfinite(radius):
+            raise ValueError('Радіус має бути скінченним числом')
+        center = np.asarray(center, dtype=np.float64)
+        low = np.floor((center - radius) / self.cell_size)
+        high = np.floor((center + radius) / self.cell_size)
+
+        # Кількість комірок рахується в float - для великого радіуса int64 переповнюється
+        spans = high - low + 1
+        if (spans >= len(self.keys)).any() or np.prod(spans) >= len(self.keys):
+            # Куля покриває більше комірок, ніж є точок - перевіряємо всі точки
+            candidates = np.arange(len(self.keys))
+        else:
+            low, high = low.astype(np.int64), high.astype(np.int64)
+            grid = np.stack(np.meshgrid(*[np.arange(l, h + 1) for l, h in zip(low, high)],
+                                        indexing='ij'), axis=-1).reshape(-1, 3)
+            cell_keys = self._keys(grid)
+            starts = np.searchsorted(self.keys, cell_keys, side='left')
+            lengths = np.searchsorted(self.keys, cell_keys, side='right') - starts
+            starts, lengths = starts[lengths > 0], lengths[lengths > 0]
+            # Об'єднуємо діапазони комірок в один масив позицій без циклу
+            shifts = np.repeat(starts - np.cumsum(np.r_[0, lengths[:-1]]), lengths)
+            candidates = shifts + np.arange(lengths.sum())
+
+        distances = np.sqrt(((self.points[candidates] - center) ** 2).sum(axis=1))
+        inside = distances <= radius
+        return self.rows[candidates[inside]], distances[inside]
+
+
+class SpatialIndex:
+    """
+    Просторовий індекс каталогу для однієї версії даних
+
+    Містить дві сітки: за тривимірними позиціями (pos_x/pos_y/pos_z, пк)
+    та за напрямками на небі (одинична сфера, для пошуку в конусі).
+    """
+
+    def __init__(self, planets_df):
+        """
+        Побудова індексу
+
+        Параметри:
+            planets_df (DataFrame): Оброблені дані з колонками ra, dec, pos_*
+        """
+        self.planets_df = planets_df
+        positions = planets_df[['pos_x', 'pos_y', 'pos_z']].to_numpy(dtype=np.float64)
+        directions = unit_vectors(planets_df['ra'].to_numpy(dtype=np.float64),
+                                  planets_df['dec'].to_numpy(dtype=np.float64))
+        self.space = GridIndex(positions, SPACE_CELL_SIZE)
+        self.sky = GridIndex(directions, SKY_CELL_SIZE)
+        self.positions = positions
+
+    def cone(self, ra, dec, radius_deg):
+        """
+        Планети в конусі навколо напрямку на небі
+
+        Параметри:
+            ra (float): Пряме піднесення центру (градуси)
+            dec (float): Схилення центру (градуси)
+            radius_deg (float): Кутовий радіус конуса (градуси)
+
+        Повертає:
+            tuple: (номери рядків, кутові відстані в градусах)
+        """
+        radius_deg = min(max(radius_deg, 0.0), 180.0)
+        center = unit_vectors(np.array([ra]), np.array([dec]))[0]
+        # Кут переводиться в довжину хорди на одиничній сфері
+        chord = 2.0 * np.sin(np.radians(radius_deg) / 2.0)
+        rows, chords = self.sky.ball(center, chord)
+        separations = np.degrees(2.0 * np.arcsin(np.clip(chords / 2.0, 0.0, 1.0)))
+        return rows, separations
+
+    def sphere(self, center, radius_pc):
+        """
+        Планети в кулі навколо точки в просторі
+
+        Параметри:
+            center (ndarray): Центр (пк, за замовчуванням Сонце)
+            radius_pc (float): Радіус (пк)
+
+        Повертає:
+            tuple: (номери рядків, відстані від центру в пк)
+        """
+        return self.space.ball(center, max(radius_pc, 0.0))
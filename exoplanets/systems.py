@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Індекс зоряних систем
+Групує планети за зіркою-господарем та зберігає агрегати систем
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+
+
+def _to_python(value):
+    """
+    Перетворює значення numpy у звичайний тип Python для JSON
+
+    Параметри:
+        value: Значення з масиву numpy
+
+    Повертає:
+        Значення int/float/str або None для NaN
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+        if isinstance(value, float) and np.isnan(value):
+            return None
+    return value
+
+
+class HostIndex:
+    """
+    Індекс зірка -> планети для однієї версії каталогу
+
+    Рядки планет згруповані за зіркою (всередині групи - за спаданням
+    індексу придатності), межі груп зберігаються як масив зсувів.
+    Агрегати систем та рейтинг систем розраховуються під час побудови.
+    """
+
+    def __init__(self, planets_df):
+        """
+        Побудова індексу
+
+        Параметри:
+            planets_df (DataFrame): Оброблені дані з колонкою habitability_index
+        """
+        self.planets_df = planets_df
+
+        # Номер системи для кожного рядка (-1 якщо зірка невідома)
+        codes, hostnames = pd.factorize(planets_df['hostname'], sort=False)
+        scores = planets_df['habitability_index'].to_numpy(dtype=np.float64)
+
+        # Рядки з відомою зіркою: за системою, далі за спаданням індексу
+        rows = np.flatnonzero(codes >= 0)
+        rows = rows[np.lexsort((-scores[rows], codes[rows]))]
+        # Зсуви груп: планети системи g - rows[offsets[g]:offsets[g + 1]]
+        offsets = np.searchsorted(codes[rows], np.arange(len(hostnames) + 1))
+        counts = np.diff(offsets)
+        starts = offsets[:-1]
+
+        self.hostnames = np.asarray(hostnames, dtype=object)
+        self.rows = rows
+        self.offsets = offsets
+        self.counts = counts
+        # Пошук системи за назвою (точний та без урахування регістру)
+        self.lookup = {name: group for group, name in enumerate(self.hostnames)}
+        self.lookup_casefold = {
+            name.casefold(): group for group, name in enumerate(self.hostnames)
+        }
+
+        # Перший рядок кожної групи - найпридатніша планета системи
+        self.best_rows = rows[starts]
+        self.best_index = scores[self.best_rows]
+
+        valid = ~np.isnan(scores[rows])
+        score_sum = np.add.reduceat(np.where(valid, scores[rows], 0.0), starts) if len(rows) else np.array([])
+        score_count = np.add.reduceat(valid.astype(np.int64), starts) if len(rows) else np.array([])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean_index = score_sum / score_count
+
+        if 'in_hz_conservative' in planets_df.columns and len(rows):
+            in_hz = planets_df['in_hz_conservative'].to_numpy(dtype=bool)
+            self.hz_count = np.add.reduceat(in_hz[rows].astype(np.int64), starts)
+        else:
+            self.hz_count = np.zeros(len(hostnames), dtype=np.int64)
+
+        # Рейтинг систем за найпридатнішою планетою (NaN - в кінці)
+        self.ranking = np.argsort(np.where(np.isnan(self.best_index), np.inf, -self.best_index),
+                                  kind='stable')
+
+    def __len__(self):
+        """Кількість систем в індексі"""
+        return len(self.hostnames)
+
+    def find(self, hostname):
+        """
+        Знаходить номер системи за назвою зірки
+
+        Параметри:
+            hostname (str): Назва зірки-господаря
+
+        Повертає:
+            int: Номер системи або None
+        """
+        group = self.lookup.get(hostname)
+        if group is None:
+            group = self.lookup_casefold.get(hostname.casefold())
+        return group
+
+    def summary(self, group):
+        """
+        Агрегати однієї системи
+
+        Параметри:
+            group (int): Номер системи
+
+        Повертає:
+            dict: Назва зірки, кількість планет, найкраща планета, середній індекс
+        """
+        best_row = self.best_rows[group]
+        best = self.planets_df.iloc[best_row]
+        return {
+            'hostname': self.hostnames[group],
+            'planet_count': int(self.counts[group]),          # Планет у каталозі
+            'sy_pnum': _to_python(best.get('sy_pnum')),          # Планет за даними архіву
+            'sy_snum': _to_python(best.get('sy_snum')),          # Зір у системі
+            'sy_dist': _to_python(best.get('sy_dist')),          # Відстань (пк)
+            'st_teff': _to_python(best.get('st_teff')),          # Температура зірки
+            'best_planet': best['pl_name'],
+            'best_habitability': _to_python(self.best_index[group]),
+            'mean_habitability': _to_python(round(float(self.mean_index[group]), 2)),
+            'habitable_zone_planets': int(self.hz_count[group])
+        }
+
+    def planets(self, group):
+        """
+        Рядки планет системи (за спаданням індексу придатності)
+
+        Параметри:
+            group (int): Номер системи
+
+        Повертає:
+            DataFrame: Планети системи
+        """
+        return self.planets_df.iloc[self.rows[self.offsets[group]:self.offsets[group + 1]]]
+
+    def top_systems(self, offset=0, limit=50, min_planets=1):
+        """
+        Системи, впорядковані за індексом найпридатнішої планети
+
+        Параметри:
+            offset (int): Скільки систем пропустити
+            limit (int): Максимальна кількість систем
+            min_planets (int): Мінімальна кількість планет у системі
+
+        Повертає:
+            tuple: (список агрегатів систем, загальна кількість систем)
+        """
+        ranking = self.ranking
+        if min_planets > 1:
+            ranking = ranking[self.counts[ranking] >= min_planets]
+        page = ranking[offset:offset + limit]
+        return [self.summary(group) for group in page], len(ranking)
@@ -4,19 +4,47 @@ Views (представлення) для модуля exoplanets
 Обробляє запити для роботи з екзопланетами з підтримкою async
 """
 
-from flask import Blueprint, render_template, request, jsonify
-from exoplanets.services import ExoplanetService
-from exoplanets.habitability import HabitabilityCalculator
+from flask import Blueprint, render_template, request, jsonify, Response, stream_with_context
+from exoplanets.services import ExoplanetService, held_snapshot, hold_snapshot, cache_version
+from exoplanets.cursors import CursorError, decode_cursor
+from exoplanets.conditional import conditional_get, precompressed
+from Project.cache import ResultCache, make_key
+from Project.compression import CompressedPayload, compress_streaming
+from Project.settings import Config
+from Project.lazy import LazyObject, lazy_import
+from Project.timing import ContextThreadPoolExecutor, span
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
+# Модулі з pandas/numpy імпортуються при першому запиті, якому вони потрібні
+np = lazy_import('numpy')
+habitability = lazy_import('exoplanets.habitability')
+systems = lazy_import('exoplanets.systems')
+similarity = lazy_import('exoplanets.similarity')
+spatial = lazy_import('exoplanets.spatial')
+queries = lazy_import('exoplanets.query')
+serialization = lazy_import('exoplanets.serialization')
+export = lazy_import('exoplanets.export')
+
 exoplanets_bp = Blueprint('exoplanets', __name__)
 
 exoplanet_service = ExoplanetService()
-calculator = HabitabilityCalculator()
+calculator = LazyObject(lambda: habitability.HabitabilityCalculator())
+query_engine = LazyObject(lambda: queries.QueryEngine())
+# Кеш готових сторінок списку планет (HTML та JSON, разом зі стиснутими варіантами)
+listing_cache = ResultCache('listing', Config.RESULT_CACHE_MAX_BYTES,
+                            Config.DISK_CACHE_DIR, Config.DISK_CACHE_MAX_BYTES)
+
+executor = LazyObject(lambda: ContextThreadPoolExecutor(max_workers=4, thread_name_prefix='exoplanets'))
+
+# Кількість схожих планет на сторінці планети
+SIMILAR_PLANETS_COUNT = 5
 
-executor = ThreadPoolExecutor(max_workers=4)
+# Фільтр за зоною придатності -> готова колонка з конвеєра обробки
+HABITABLE_ZONE_COLUMNS = {
+    'conservative': 'in_hz_conservative',
+    'optimistic': 'in_hz_optimistic'
+}
 
 def async_route(f):
     """Декоратор для асинхронних маршрутів"""
@@ -31,16 +59,106 @@ def async_route(f):
     return wrapper
 
 async def load_planets_async():
-    """Асинхронне завантаження даних про планети"""
+    """Асинхронне завантаження даних про планети (зі знімка запиту)"""
+    snapshot = await load_catalog_async()
+    return snapshot.planets_df if snapshot is not None else None
+
+async def load_catalog_async(version=None):
+    """
+    Асинхронне отримання знімка каталогу
+    Знімок береться один раз на запит і звільняється після відповіді
+    """
+    snapshot = held_snapshot(version)
+    if snapshot is not None:
+        return snapshot
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(executor, exoplanet_service.get_planets_data)
+    with span('snapshot'):
+        snapshot = await loop.run_in_executor(executor, exoplanet_service.acquire_snapshot, version)
+    return hold_snapshot(snapshot)
 
-async def calculate_habitability_async(planets_df):
-    """Асинхронний розрахунок індексу придатності"""
+async def load_cursor_snapshot_async(token):
+    """
+    Асинхронне отримання знімка для курсора
+    Без курсора - поточний знімок; з курсором - знімок, на якому його створено
+    (None, якщо пільговий період старої версії минув)
+    """
+    if not token:
+        return await load_catalog_async()
+    return await load_catalog_async(decode_cursor(token)['version'])
+
+async def load_index_async(name, builder):
+    """Асинхронне отримання індексу знімка (будується раз на версію каталогу)"""
+    snapshot = await load_catalog_async()
+    if snapshot is None:
+        return None
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(executor, calculator.calculate_batch, planets_df)
+    with span('index'):
+        return await loop.run_in_executor(executor, snapshot.get_index, name, builder)
+
+async def load_host_index_async():
+    """Асинхронне отримання індексу зоряних систем"""
+    return await load_index_async('hosts', systems.HostIndex)
+
+async def load_similarity_index_async():
+    """Асинхронне отримання індексу схожості планет"""
+    return await load_index_async('similarity', similarity.SimilarityIndex)
+
+async def load_spatial_index_async():
+    """Асинхронне отримання просторового індексу"""
+    return await load_index_async('spatial', spatial.SpatialIndex)
+
+def listing_query(page, per_page):
+    """
+    Переводить параметри списку планет у декларативний запит
+    
+    Параметри:
+        page (int): Номер сторінки
+        per_page (int): Кількість планет на сторінці
+    
+    Повертає:
+        dict: Запит для QueryEngine
+    """
+    min_habitability = request.args.get('min_habitability', 0, type=float)
+    max_radius = request.args.get('max_radius', 10, type=float)
+    habitable_zone = request.args.get('habitable_zone', '')
+    
+    conditions = []
+    if min_habitability > 0:
+        conditions.append({'field': 'habitability_index', 'op': 'gte', 'value': min_habitability})
+    if max_radius < 10:
+        conditions.append({'field': 'pl_rade', 'op': 'lte', 'value': max_radius})
+    if habitable_zone in HABITABLE_ZONE_COLUMNS:
+        conditions.append({'field': HABITABLE_ZONE_COLUMNS[habitable_zone], 'op': 'eq', 'value': True})
+    
+    # Кілька значень одного фасету об'єднуються через OR
+    facets = {
+        'discoverymethod': sorted(v for v in request.args.getlist('discovery_method') if v),
+        'disc_facility': sorted(v for v in request.args.getlist('disc_facility') if v),
+        'disc_year': sorted(request.args.getlist('disc_year', type=int))
+    }
+    for field, values in facets.items():
+        if values:
+            conditions.append({'field': field, 'op': 'in', 'value': values})
+    
+    return {
+        'filter': conditions,
+        'offset': (page - 1) * per_page,
+        'limit': per_page,
+        'facets': True
+    }
+
+async def run_query_async(query, snapshot=None, token=None):
+    """Асинхронне виконання декларативного запиту на знімку (за замовчуванням - поточному)"""
+    if snapshot is None:
+        snapshot = await load_catalog_async()
+    if snapshot is None or len(snapshot) == 0:
+        return None
+    cursor = decode_cursor(token) if token else None
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, query_engine.run, snapshot, query, cursor)
 
 @exoplanets_bp.route('/planets')
+@conditional_get
 @async_route
 async def planets_list():
     """
@@ -50,43 +168,41 @@ async def planets_list():
         min_habitability = request.args.get('min_habitability', 0, type=float)
         max_radius = request.args.get('max_radius', 10, type=float)
         discovery_method = request.args.get('discovery_method', '')
+        habitable_zone = request.args.get('habitable_zone', '')
         page = request.args.get('page', 1, type=int)
         per_page = 50
         
         current_filters = {
             'min_habitability': min_habitability,
             'max_radius': max_radius,
-            'discovery_method': discovery_method
+            'discovery_method': discovery_method,
+            'habitable_zone': habitable_zone
         }
         
-        planets_df = await load_planets_async()
+        snapshot = await load_catalog_async()
         
-        if planets_df is None or planets_df.empty:
+        if snapshot is None or len(snapshot) == 0:
             return render_template('planets.html', 
                                  planets=[], 
                                  error="Не вдалося завантажити дані", 
                                  pagination=None,
                                  discovery_methods=[],
-                                 current_filters=current_filters)
+                                 facet_counts={},
+                                 current_filters=current_filters), 500
         
-        planets_df = await calculate_habitability_async(planets_df)
+        query = listing_query(page, per_page)
         
-        if min_habitability > 0:
-            planets_df = planets_df[planets_df['habitability_index'] >= min_habitability]
+        # Готова сторінка з кешу - без фільтрації, сортування та рендерингу
+        cache_key = make_key('planets_list', cache_version(snapshot.version), query)
+        payload = listing_cache.get(cache_key)
+        if payload is not None:
+            return payload.response()
         
-        if max_radius < 10:
-            planets_df = planets_df[planets_df['pl_rade'] <= max_radius]
+        result = await run_query_async(query, snapshot)
         
-        if discovery_method:
-            planets_df = planets_df[planets_df['discoverymethod'] == discovery_method]
-        
-        planets_df = planets_df.sort_values('habitability_index', ascending=False)
-        
-        total = len(planets_df)
-        start = (page - 1) * per_page
-        end = start + per_page
-        
-        planets = planets_df.iloc[start:end].to_dict('records')
+        total = result['total']
+        planets = serialization.records(result['rows'])
+        facet_counts = result['facets']
         
         pagination = {
             'page': page,
@@ -95,15 +211,20 @@ async def planets_list():
             'pages': (total + per_page - 1) // per_page
         }
         
-        all_planets_df = await load_planets_async()
-        discovery_methods = sorted(all_planets_df['discoverymethod'].dropna().unique().tolist())
+        # Значення для випадаючого списку беруться з того ж підрахунку фасетів
+        discovery_methods = list(facet_counts.get('discoverymethod', {}))
         
-        return render_template('planets.html', 
+        html = render_template('planets.html', 
                              planets=planets, 
                              error=None, 
                              pagination=pagination,
                              discovery_methods=discovery_methods,
+                             facet_counts=facet_counts,
                              current_filters=current_filters)
+        payload = CompressedPayload(html.encode('utf-8'), 'text/html')
+        listing_cache.put(cache_key, payload)
+        
+        return payload.response()
     
     except Exception as e:
         import traceback
@@ -113,7 +234,8 @@ async def planets_list():
         safe_filters = {
             'min_habitability': request.args.get('min_habitability', 0, type=float),
             'max_radius': request.args.get('max_radius', 10, type=float),
-            'discovery_method': request.args.get('discovery_method', '')
+            'discovery_method': request.args.get('discovery_method', ''),
+            'habitable_zone': request.args.get('habitable_zone', '')
         }
         
         return render_template('planets.html', 
@@ -121,47 +243,49 @@ async def planets_list():
                              error=str(e), 
                              pagination=None,
                              discovery_methods=[],
-                             current_filters=safe_filters)
+                             facet_counts={},
+                             current_filters=safe_filters), 500
 
 @exoplanets_bp.route('/api/planets')
+@conditional_get
 @async_route
 async def api_planets():
     """
     API endpoint для отримання списку планет через AJAX (async версія)
+    Повертає також кількість планет для кожного значення фасетів
+    Наступна сторінка - за курсором next_cursor (стабільна при оновленні каталогу)
     """
     try:
-        min_habitability = request.args.get('min_habitability', 0, type=float)
-        max_radius = request.args.get('max_radius', 10, type=float)
-        discovery_method = request.args.get('discovery_method', '')
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 50, type=int)
+        token = request.args.get('cursor', '')
+        fields, columnar = serialization.response_shape()
         
-        planets_df = await load_planets_async()
-        
-        if planets_df is None or planets_df.empty:
-            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        snapshot = await load_cursor_snapshot_async(token)
         
-        planets_df = await calculate_habitability_async(planets_df)
+        if snapshot is None and token:
+            return jsonify({'error': 'Курсор застарів, почніть перегляд спочатку'}), 410
         
-        if min_habitability > 0:
-            planets_df = planets_df[planets_df['habitability_index'] >= min_habitability]
-        
-        if max_radius < 10:
-            planets_df = planets_df[planets_df['pl_rade'] <= max_radius]
-        
-        if discovery_method:
-            planets_df = planets_df[planets_df['discoverymethod'] == discovery_method]
+        if snapshot is None or len(snapshot) == 0:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
         
-        planets_df = planets_df.sort_values('habitability_index', ascending=False)
+        query = listing_query(page, per_page)
+        if fields:
+            query['fields'] = fields
         
-        total = len(planets_df)
-        start = (page - 1) * per_page
-        end = start + per_page
+        # Готова JSON-відповідь з кешу - без фільтрації, сортування та серіалізації
+        cache_key = make_key('api_planets', cache_version(snapshot.version), query, token, columnar)
+        payload = listing_cache.get(cache_key)
+        if payload is not None:
+            return payload.response()
         
-        planets = planets_df.iloc[start:end].to_dict('records')
+        result = await run_query_async(query, snapshot, token)
+        total = result['total']
         
-        return jsonify({
-            'planets': planets,
+        response = serialization.json_response({
+            'planets': serialization.page_json(result, columnar),
+            'facets': result['facets'],
+            'next_cursor': result['next_cursor'],
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -169,50 +293,287 @@ async def api_planets():
                 'pages': (total + per_page - 1) // per_page
             }
         })
+        payload = CompressedPayload(response.get_data(), response.mimetype)
+        listing_cache.put(cache_key, payload)
+        
+        return payload.response()
+    
+    except (queries.QueryError, CursorError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@exoplanets_bp.route('/api/query', methods=['POST'])
+@async_route
+async def api_query():
+    """
+    Декларативний запит до каталогу (async версія)
+    
+    Тіло запиту (JSON):
+        filter - список умов {"field": ..., "op": ..., "value": ...}
+        sort - список {"field": ..., "order": "asc"|"desc"}
+        fields - список колонок у відповіді
+        offset, limit - пагінація
+        cursor - курсор наступної сторінки з попередньої відповіді (замість offset)
+        facets - чи повертати кількість для фасетів
+        columnar - повертати планети у формі {"columns": [...], "data": [...]}
+    """
+    try:
+        query = request.get_json(silent=True) or {}
+        token = query.get('cursor') if isinstance(query, dict) else None
+        columnar = bool(query.get('columnar')) if isinstance(query, dict) else False
+        
+        snapshot = await load_cursor_snapshot_async(token)
+        
+        if snapshot is None and token:
+            return jsonify({'error': 'Курсор застарів, почніть перегляд спочатку'}), 410
+        
+        result = await run_query_async(query, snapshot, token)
+        
+        if result is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        return serialization.json_response({
+            'planets': serialization.page_json(result, columnar),
+            'total': result['total'],
+            'facets': result['facets'],
+            'next_cursor': result['next_cursor'],
+            'plan': result['plan']
+        })
+    
+    except (queries.QueryError, CursorError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@exoplanets_bp.route('/api/export')
+@conditional_get
+@async_route
+async def api_export():
+    """
+    Потоковий експорт каталогу з фільтрами списку планет (async версія)
+    
+    Параметри запиту:
+        format - ndjson (за замовчуванням), csv або arrow
+        fields - колонки через кому
+        фільтри - як у /api/planets
+    """
+    try:
+        fmt = request.args.get('format', 'ndjson')
+        fields, _ = serialization.response_shape()
+        
+        if not export.export_available(fmt):
+            return jsonify({'error': f'Непідтримуваний формат експорту: {fmt}'}), 400
+        
+        snapshot = await load_catalog_async()
+        
+        if snapshot is None or len(snapshot) == 0:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        query = listing_query(1, 0)
+        query.update(fields=fields, limit=None, facets=False)
+        
+        # Лише номери рядків - таблиця кодується частинами під час відправки
+        loop = asyncio.get_event_loop()
+        rows, columns = await loop.run_in_executor(executor, query_engine.select, snapshot, query)
+        
+        response = Response(stream_with_context(export.export_stream(snapshot.planets_df, rows, columns, fmt)),
+                            mimetype=export.EXPORT_FORMATS[fmt])
+        response.headers['Content-Disposition'] = f'attachment; filename=exoplanets.{export.EXPORT_EXTENSIONS[fmt]}'
+        response.headers['X-Total-Count'] = str(len(rows))
+        return compress_streaming(response)
+    
+    except queries.QueryError as e:
+        return jsonify({'error': str(e)}), 400
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @exoplanets_bp.route('/planet/<planet_name>')
+@conditional_get
 @async_route
 async def planet_detail(planet_name):
     """
     Детальна інформація про конкретну планету (async версія)
     """
     try:
-        planets_df = await load_planets_async()
+        snapshot = await load_catalog_async()
         
-        if planets_df is None:
+        if snapshot is None:
             return render_template('planet_detail.html', 
                                  planet=None, 
-                                 error="Не вдалося завантажити дані")
-        
-        planets_df = await calculate_habitability_async(planets_df)
+                                 error="Не вдалося завантажити дані"), 500
         
-        planet_data = planets_df[planets_df['pl_name'] == planet_name]
+        # Індекс придатності вже розрахований конвеєром знімка - шукаємо за назвою
+        row = snapshot.get_index('names', queries.build_name_index).get(planet_name)
         
-        if planet_data.empty:
+        if row is None:
             return render_template('planet_detail.html', 
                                  planet=None, 
-                                 error="Планету не знайдено")
+                                 error="Планету не знайдено"), 404
         
-        planet = planet_data.iloc[0].to_dict()
+        # Пропущені параметри - None (у шаблоні та у відповіді, а не NaN)
+        planet = serialization.records(snapshot.planets_df.iloc[[row]])[0]
         
         # Calculate components in executor
         loop = asyncio.get_event_loop()
-        components = await loop.run_in_executor(executor, calculator.get_components, planet)
+        with span('score'):
+            components = await loop.run_in_executor(executor, calculator.get_components, planet)
+        
+        # Схожі планети з індексу (без перебору всього каталогу)
+        similarity_index = await load_similarity_index_async()
+        similar_planets = similarity_index.describe(
+            similarity_index.similar_to(planet_name, k=SIMILAR_PLANETS_COUNT) or []
+        )
         
         return render_template('planet_detail.html', 
                              planet=planet, 
                              components=components, 
+                             similar_planets=similar_planets, 
                              error=None)
     
     except Exception as e:
         return render_template('planet_detail.html', 
                              planet=None, 
-                             error=str(e))
+                             error=str(e)), 500
+
+@exoplanets_bp.route('/api/similar')
+@conditional_get
+@precompressed
+@async_route
+async def api_similar():
+    """
+    k найближчих планет до заданої планети або до Землі (async версія)
+    """
+    try:
+        planet_name = request.args.get('planet', '')
+        k = request.args.get('k', 10, type=int)
+        
+        similarity_index = await load_similarity_index_async()
+        
+        if similarity_index is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        if planet_name:
+            neighbours = similarity_index.similar_to(planet_name, k)
+            if neighbours is None:
+                return jsonify({'error': 'Планету не знайдено'}), 404
+        else:
+            neighbours = similarity_index.similar_to_earth(k)
+        
+        return serialization.json_response({
+            'reference': planet_name or 'Earth',
+            'similar': similarity_index.describe(neighbours)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def spatial_results(planets_df, rows, distances, distance_key):
+    """
+    Фільтрує та впорядковує результати просторового пошуку
+    Працює лише з рядками-кандидатами з індексу, а не з усім каталогом
+    """
+    min_habitability = request.args.get('min_habitability', 0, type=float)
+    habitable_zone = request.args.get('habitable_zone', '')
+    sort = request.args.get('sort', 'habitability')
+    limit = request.args.get('limit', 100, type=int)
+    
+    found = planets_df.iloc[rows].assign(**{distance_key: distances})
+    
+    if min_habitability > 0:
+        found = found[found['habitability_index'] >= min_habitability]
+    
+    if habitable_zone in HABITABLE_ZONE_COLUMNS:
+        found = found[found[HABITABLE_ZONE_COLUMNS[habitable_zone]]]
+    
+    if sort == 'distance':
+        found = found.sort_values(distance_key)
+    else:
+        found = found.sort_values('habitability_index', ascending=False)
+    
+    columns = ['pl_name', 'hostname', 'ra', 'dec', 'sy_dist', 'habitability_index', distance_key]
+    # Таблиця кодується через serialization.json_response (NaN -> null)
+    return {
+        'count': len(found),
+        'planets': found.head(limit)[columns]
+    }
+
+@exoplanets_bp.route('/api/nearby')
+@conditional_get
+@async_route
+async def api_nearby():
+    """
+    Планети в радіусі (пк) навколо Сонця або навколо зірки host (async версія)
+    """
+    try:
+        radius = request.args.get('radius', 30, type=float)
+        hostname = request.args.get('host', '')
+        
+        if not np.isfinite(radius):
+            return jsonify({'error': 'Параметр radius має бути скінченним числом'}), 400
+        
+        spatial_index = await load_spatial_index_async()
+        
+        if spatial_index is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        center = np.zeros(3)
+        if hostname:
+            host_index = await load_host_index_async()
+            group = host_index.find(hostname)
+            if group is None:
+                return jsonify({'error': 'Систему не знайдено'}), 404
+            center = spatial_index.positions[host_index.best_rows[group]]
+            if not np.isfinite(center).all():
+                return jsonify({'error': 'Для системи немає координат'}), 404
+        
+        rows, distances = spatial_index.sphere(center, radius)
+        
+        return serialization.json_response(spatial_results(spatial_index.planets_df, rows, distances, 'distance_pc'))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@exoplanets_bp.route('/api/cone')
+@conditional_get
+@async_route
+async def api_cone():
+    """
+    Планети в конусі навколо точки на небі (ra, dec, radius у градусах) (async версія)
+    """
+    try:
+        ra = request.args.get('ra', type=float)
+        dec = request.args.get('dec', type=float)
+        radius = request.args.get('radius', 1.0, type=float)
+        max_distance = request.args.get('max_distance', type=float)
+        
+        if ra is None or dec is None:
+            return jsonify({'error': 'Потрібні параметри ra та dec'}), 400
+        
+        if not np.isfinite([ra, dec, radius]).all():
+            return jsonify({'error': 'Параметри ra, dec та radius мають бути скінченними числами'}), 400
+        
+        spatial_index = await load_spatial_index_async()
+        
+        if spatial_index is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        rows, separations = spatial_index.cone(ra, dec, radius)
+        
+        if max_distance is not None:
+            near = spatial_index.planets_df['sy_dist'].to_numpy()[rows] <= max_distance
+            rows, separations = rows[near], separations[near]
+        
+        return serialization.json_response(spatial_results(spatial_index.planets_df, rows, separations, 'separation_deg'))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @exoplanets_bp.route('/search')
+@conditional_get
 @async_route
 async def search():
     """
@@ -231,7 +592,103 @@ async def search():
         
         results = planets_df[mask][['pl_name', 'hostname']].head(10)
         
-        return jsonify(results.to_dict('records'))
+        return serialization.json_response(results)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@exoplanets_bp.route('/system/<hostname>')
+@conditional_get
+@async_route
+async def system_detail(hostname):
+    """
+    Зоряна система: усі планети зірки та агрегати системи (async версія)
+    """
+    try:
+        host_index = await load_host_index_async()
+        
+        if host_index is None:
+            return render_template('system_detail.html', 
+                                 system=None, 
+                                 planets=[], 
+                                 error="Не вдалося завантажити дані"), 500
+        
+        group = host_index.find(hostname)
+        
+        if group is None:
+            return render_template('system_detail.html', 
+                                 system=None, 
+                                 planets=[], 
+                                 error="Систему не знайдено"), 404
+        
+        return render_template('system_detail.html', 
+                             system=host_index.summary(group), 
+                             planets=serialization.records(host_index.planets(group)), 
+                             error=None)
+    
+    except Exception as e:
+        return render_template('system_detail.html', 
+                             system=None, 
+                             planets=[], 
+                             error=str(e)), 500
+
+@exoplanets_bp.route('/api/system/<hostname>')
+@conditional_get
+@async_route
+async def api_system(hostname):
+    """
+    API endpoint для зоряної системи (async версія)
+    """
+    try:
+        host_index = await load_host_index_async()
+        
+        if host_index is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        group = host_index.find(hostname)
+        
+        if group is None:
+            return jsonify({'error': 'Систему не знайдено'}), 404
+        
+        # Пропущені параметри планет кодуються як null (jsonify видав би NaN)
+        return serialization.json_response({
+            'system': host_index.summary(group),
+            'planets': host_index.planets(group)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@exoplanets_bp.route('/api/systems')
+@conditional_get
+@precompressed
+@async_route
+async def api_systems():
+    """
+    Рейтинг зоряних систем за найпридатнішою планетою (async версія)
+    """
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 50, type=int)
+        min_planets = request.args.get('min_planets', 1, type=int)
+        
+        host_index = await load_host_index_async()
+        
+        if host_index is None:
+            return jsonify({'error': 'Не вдалося завантажити дані'}), 500
+        
+        start = (page - 1) * per_page
+        systems, total = host_index.top_systems(start, per_page, min_planets)
+        
+        return serialization.json_response({
+            'systems': systems,
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page
+            }
+        })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Налаштування gunicorn
+Запуск: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+# Імпорт модуля для роботи з операційною системою
+import os
+
+# Адреса та порт (Render передає порт через змінну PORT)
+bind = f"0.0.0.0:{os.environ.get('PORT', '9000')}"
+
+# Кількість процесів та потоків у кожному
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Додаток (і каталог, див. wsgi.py) завантажується в головному процесі до fork,
+# воркери отримують дані через copy-on-write замість власного завантаження
+preload_app = True
+
+# Завантаження каталогу з NASA при першому запуску може тривати довго
+timeout = 120
+
+
+def on_starting(server):
+    """Видаляє файли метрик воркерів попереднього запуску"""
+    from Project.metrics import metrics
+    metrics.clear()
@@ -6,6 +6,8 @@ Views (представлення) для модуля home
 
 # Імпорт необхідних компонентів Flask
 from flask import Blueprint, render_template, request, jsonify
+# Імпорт сервісу даних (прапорець готовності)
+from exoplanets.services import ExoplanetService
 
 # Створюємо Blueprint для модуля home
 # Blueprint - це спосіб організації маршрутів у Flask
@@ -46,3 +48,17 @@ def about():
     
     # Рендеримо шаблон з інформацією про проект
     return render_template('about.html', info=project_info)
+
+@home_bp.route('/ready')
+def ready():
+    """
+    Перевірка готовності для балансувальника (readiness probe)
+    
+    Маршрут: /ready
+    Метод: GET
+    
+    Повертає:
+        JSON: {'ready': bool} з кодом 200 або 503, поки каталог не завантажено
+    """
+    is_ready = ExoplanetService.ready
+    return jsonify({'ready': is_ready}), 200 if is_ready else 503
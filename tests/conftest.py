@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Спільні фікстури тестів
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+
+# Імпорт фреймворку тестування
+import pytest
+
+# Імпорт генератора синтетичних каталогів
+from benchmarks.synthetic import generate_catalog
+
+
+@pytest.fixture(scope='session')
+def workdir(tmp_path_factory):
+    """
+    Тимчасова робоча директорія з синтетичним каталогом у файлі кешу
+    Шляхи налаштувань (data/, cache/) відносні, тож тести не пишуть у репозиторій
+    """
+    from Project.settings import Config
+
+    path = tmp_path_factory.mktemp('workdir')
+    previous = os.getcwd()
+    os.chdir(path)
+    os.makedirs(os.path.dirname(Config.DATA_CACHE_FILE), exist_ok=True)
+    generate_catalog(2000, seed=1).to_csv(Config.DATA_CACHE_FILE, index=False)
+    yield path
+    os.chdir(previous)
+
+
+@pytest.fixture(scope='session')
+def app(workdir):
+    """Додаток з каталогом із робочої директорії"""
+    from app import create_app
+
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    """Тестовий клієнт додатку"""
+    return app.test_client()
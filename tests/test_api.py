@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Тести JSON-маршрутів: відповіді мають бути коректним JSON (NaN -> null)
+"""
+
+# Імпорт модуля для розбору відповідей
+import json
+
+
+def _strict_json(response):
+    """Розбирає тіло відповіді, відхиляючи NaN та Infinity"""
+    def reject(constant):
+        raise ValueError(f'Недопустима константа JSON: {constant}')
+    return json.loads(response.get_data(as_text=True), parse_constant=reject)
+
+
+def test_system_payload_is_valid_json(client):
+    """Пропущені параметри планет системи кодуються як null"""
+    systems = _strict_json(client.get('/exoplanets/api/systems?min_planets=2&per_page=1'))['systems']
+    response = client.get(f"/exoplanets/api/system/{systems[0]['hostname']}")
+
+    assert response.status_code == 200
+    payload = _strict_json(response)
+    assert payload['system']['planet_count'] == len(payload['planets']) >= 2
+    assert any(value is None for planet in payload['planets'] for value in planet.values())
+
+
+def test_spatial_payloads_are_valid_json(client):
+    """Планети без відстані у конусі та навколо Сонця кодуються з null"""
+    cone = client.get('/exoplanets/api/cone?ra=0&dec=0&radius=180&limit=5000')
+    nearby = client.get('/exoplanets/api/nearby?radius=100000&limit=5000')
+
+    assert cone.status_code == nearby.status_code == 200
+    planets = _strict_json(cone)['planets']
+    assert len(planets) == _strict_json(cone)['count']
+    assert any(planet['sy_dist'] is None for planet in planets)
+    assert _strict_json(nearby)['count'] > 0
+
+
+def test_planet_detail_is_valid_json(client):
+    """Пропущені параметри планети та її компонентів кодуються як null"""
+    found = client.post('/exoplanets/api/query', json={
+        'filter': [{'field': 'pl_orbeccen', 'op': 'isnull'}], 'fields': ['pl_name'], 'limit': 1
+    })
+    name = _strict_json(found)['planets'][0]['pl_name']
+    response = client.get(f'/api/planet/{name}')
+
+    assert response.status_code == 200
+    payload = _strict_json(response)
+    assert payload['planet']['pl_orbeccen'] is None
+    assert payload['habitability_components']['eccentricity']['value'] is None
+
+
+def test_json_routes_are_valid_json(client):
+    """Усі JSON-маршрути з даними каталогу дають коректний JSON"""
+    paths = [
+        '/api/stats',
+        '/exoplanets/api/similar?k=20',
+        '/exoplanets/api/systems?per_page=200',
+        '/exoplanets/search?q=SYN-00001',
+        '/analytics/api/habitability-distribution',
+        '/analytics/api/parameters-correlation',
+        '/analytics/api/discovery-timeline',
+        '/analytics/api/top-habitable',
+        '/analytics/api/discovery-methods',
+    ]
+    for path in paths:
+        response = client.get(path)
+        assert response.status_code == 200, path
+        _strict_json(response)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Тести умовних HTTP запитів (ETag / Last-Modified)
+"""
+
+# Імпорт фреймворку тестування
+import pytest
+
+# Імпорт сервісу каталогу
+from exoplanets.services import ExoplanetService
+
+# Маршрути з conditional_get (з precompressed та без)
+PATHS = ['/api/stats', '/exoplanets/api/planets?per_page=5']
+
+
+def _validators(client, path):
+    """ETag та Last-Modified свіжої відповіді"""
+    response = client.get(path)
+    assert response.status_code == 200
+    return response.headers['ETag'], response.headers['Last-Modified']
+
+
+def _forbid_snapshot(monkeypatch):
+    """Після цього виклику маршрут, який візьме знімок, завершиться помилкою"""
+    calls = []
+
+    def acquire(self, version=None):
+        calls.append(version)
+        raise AssertionError('знімок не мав завантажуватися')
+
+    monkeypatch.setattr(ExoplanetService, 'acquire_snapshot', acquire)
+    return calls
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_if_none_match_returns_304_without_snapshot(client, monkeypatch, path):
+    """Поточний ETag - 304 ще до завантаження знімка"""
+    etag, _ = _validators(client, path)
+    calls = _forbid_snapshot(monkeypatch)
+
+    response = client.get(path, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+    assert calls == []
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_if_modified_since_returns_304_without_snapshot(client, monkeypatch, path):
+    """Last-Modified поточної версії - 304 ще до завантаження знімка"""
+    _, modified = _validators(client, path)
+    calls = _forbid_snapshot(monkeypatch)
+
+    response = client.get(path, headers={'If-Modified-Since': modified})
+
+    assert response.status_code == 304
+    assert calls == []
+
+
+def test_stale_etag_gets_full_response(client):
+    """ETag іншої версії або параметрів - повна відповідь з новим ETag"""
+    etag, _ = _validators(client, '/api/stats')
+    other, _ = _validators(client, '/exoplanets/api/planets?per_page=5')
+
+    response = client.get('/api/stats', headers={'If-None-Match': other})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] == etag
+
+
+def test_error_responses_have_no_validators(client):
+    """Помилки не отримують ETag і не кешуються клієнтом як дані каталогу"""
+    response = client.get('/exoplanets/api/system/NO-SUCH-STAR')
+
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
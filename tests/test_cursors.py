@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Тести курсорів посторінкового перегляду
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+
+# Імпорт фреймворку тестування
+import pytest
+
+# Імпорт курсорів
+from exoplanets.cursors import encode_cursor, decode_cursor, CursorError
+# Імпорт налаштувань проекту
+from Project.settings import Config
+
+
+def test_cursor_round_trip():
+    """Розібраний курсор містить те, що було закодовано"""
+    token = encode_cursor('v1-abc', 'deadbeef', 40, 1234)
+
+    assert decode_cursor(token) == {
+        'version': 'v1-abc', 'query_key': 'deadbeef', 'position': 40, 'last_row': 1234
+    }
+
+
+@pytest.mark.parametrize('tamper', [
+    lambda token: token[:-2] + ('AA' if token[-2:] != 'AA' else 'BB'),
+    lambda token: token[:20],
+    lambda token: 'not a cursor',
+    lambda token: '',
+])
+def test_tampered_cursor_is_rejected(tamper):
+    """Змінений, обрізаний або довільний токен - CursorError"""
+    token = encode_cursor('v1-abc', 'deadbeef', 40, 1234)
+
+    with pytest.raises(CursorError):
+        decode_cursor(tamper(token))
+
+
+def test_cursor_signed_with_other_key_is_rejected(monkeypatch):
+    """Курсор іншого додатку (інший SECRET_KEY) не приймається"""
+    token = encode_cursor('v1-abc', 'deadbeef', 40, 1234)
+    monkeypatch.setattr(Config, 'SECRET_KEY', 'other-secret')
+
+    with pytest.raises(CursorError):
+        decode_cursor(token)
+
+
+def _touch_catalog():
+    """Нова версія каталогу: файл кешу з новим часом зміни"""
+    stat = os.stat(Config.DATA_CACHE_FILE)
+    mtime = stat.st_mtime_ns + 10 ** 9
+    os.utime(Config.DATA_CACHE_FILE, ns=(mtime, mtime))
+
+
+def test_cursor_survives_refresh_until_grace_period_ends(client, monkeypatch):
+    """Після оновлення каталогу курсор працює в пільговий період, потім - 410"""
+    first = client.get('/exoplanets/api/planets?per_page=5').get_json()
+    token = first['next_cursor']
+    expected = client.get(f'/exoplanets/api/planets?per_page=5&cursor={token}').get_json()['planets']
+
+    _touch_catalog()
+    # Запит без курсора переводить додаток на нову версію
+    assert client.get('/exoplanets/api/planets?per_page=5').status_code == 200
+
+    monkeypatch.setattr(Config, 'CURSOR_GRACE_PERIOD', 15 * 60)
+    during = client.get(f'/exoplanets/api/planets?per_page=5&cursor={token}')
+    assert during.status_code == 200
+    assert during.get_json()['planets'] == expected
+
+    monkeypatch.setattr(Config, 'CURSOR_GRACE_PERIOD', -1)
+    after = client.get(f'/exoplanets/api/planets?per_page=5&cursor={token}')
+    assert after.status_code == 410
+
+
+def test_forged_cursor_is_bad_request(client):
+    """Підроблений курсор у запиті - 400, а не 500"""
+    response = client.get('/exoplanets/api/planets?per_page=5&cursor=forged')
+
+    assert response.status_code == 400
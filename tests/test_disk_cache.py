@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Тести дискового кешу другого рівня
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+
+# Імпорт дискового кешу
+from Project import disk_cache
+from Project.disk_cache import DiskCache
+# Імпорт кешу відповідей та стиснутих відповідей
+from Project.cache import ResultCache
+from Project.compression import CompressedPayload
+
+
+def _age(cache, key, seconds):
+    """Робить запис давнішим на seconds секунд"""
+    path = cache._path(key)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_directory_is_created_on_first_write(tmp_path):
+    """Створення кешу не чіпає диск; директорія з'являється з першим записом"""
+    directory = tmp_path / 'cache' / 'responses'
+    cache = DiskCache(str(directory), 1024)
+
+    assert not directory.exists()
+    assert cache.get('missing') is None
+    assert cache.stats()['bytes'] == 0
+
+    cache.put('key', b'data')
+
+    assert cache.get('key') == b'data'
+    assert directory.is_dir()
+
+
+def test_write_is_atomic(tmp_path, monkeypatch):
+    """Невдалий запис не лишає тимчасових файлів і не псує попереднє значення"""
+    cache = DiskCache(str(tmp_path), 1024)
+    cache.put('key', b'old')
+
+    def fail(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(disk_cache.os, 'replace', fail)
+    cache.put('key', b'new')
+
+    assert cache.get('key') == b'old'
+    assert sorted(os.listdir(tmp_path)) == ['key.bin']
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    """Понад бюджет видаляються найдавніше використані файли (до 90% бюджету)"""
+    cache = DiskCache(str(tmp_path), 1000)
+    for position, key in enumerate(('a', 'b', 'c')):
+        cache.put(key, bytes(300))
+        _age(cache, key, 100 - position)
+    # Читання оновлює час використання - 'a' стає найновішим
+    assert cache.get('a') is not None
+
+    cache.put('d', bytes(300))
+
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in ('a', 'c', 'd'))
+    assert cache.stats()['bytes'] == 900
+
+
+def test_oversized_entry_is_not_written(tmp_path):
+    """Запис, більший за весь бюджет, не зберігається"""
+    cache = DiskCache(str(tmp_path / 'cache'), 100)
+    cache.put('big', bytes(101))
+
+    assert cache.get('big') is None
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_size_of_existing_files_is_counted(tmp_path):
+    """Новий процес бачить файли, записані попереднім (розмір для бюджету)"""
+    DiskCache(str(tmp_path), 1000).put('a', bytes(400))
+
+    assert DiskCache(str(tmp_path), 1000).stats()['bytes'] == 400
+
+
+def test_result_cache_reads_disk_after_restart(tmp_path):
+    """Відповідь з диска доступна новому кешу в пам'яті (після перезапуску)"""
+    payload = CompressedPayload(b'{"planets":[]}', 'application/json')
+    ResultCache('restart-test', 1024, str(tmp_path), 4096).put('key', payload)
+
+    cache = ResultCache('restart-test', 1024, str(tmp_path), 4096)
+    restored = cache.get('key')
+
+    assert restored is not None
+    assert (restored.payload, restored.mimetype) == (b'{"planets":[]}', 'application/json')
+    assert cache.stats()['disk_hits'] == 1
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Тести фасетного фільтра на бітових картах
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+# Імпорт фреймворку тестування
+import pytest
+
+# Імпорт фасетного індексу та опису фасетів
+from exoplanets.facets import FacetIndex, CATEGORY_FACETS, RANGE_FACETS, HABITABLE_ZONE_FACET
+# Імпорт конвеєра обробки каталогу
+from exoplanets.pipeline import IngestPipeline
+# Імпорт генератора синтетичних каталогів
+from benchmarks.synthetic import generate_catalog
+
+
+@pytest.fixture(scope='module')
+def planets_df():
+    """Оброблений каталог; кількість рядків не кратна 8 (неповний останній байт)"""
+    return IngestPipeline().run(generate_catalog(1003, seed=2))
+
+
+def _range_counts(values, edges):
+    """Кількість значень у кожному інтервалі [a, b) через pandas"""
+    bins = pd.cut(values, edges, right=False)
+    return bins.value_counts(sort=False).to_numpy().tolist()
+
+
+def test_counts_without_filters_match_value_counts(planets_df):
+    """Кількості фасетів без фільтрів збігаються з value_counts"""
+    index = FacetIndex(planets_df)
+    _, counts = index.select()
+
+    for column in CATEGORY_FACETS:
+        expected = {str(value): count for value, count in planets_df[column].value_counts().items()}
+        assert counts[column] == expected
+    for value, column in HABITABLE_ZONE_FACET.items():
+        assert counts['habitable_zone'][value] == int(planets_df[column].sum())
+    for column, edges in RANGE_FACETS.items():
+        assert list(counts[column].values()) == _range_counts(planets_df[column], edges)
+
+
+def test_select_matches_pandas_mask(planets_df):
+    """Результат і кількості з фільтрами збігаються з булевими масками pandas"""
+    index = FacetIndex(planets_df)
+    methods = ['Transit', 'Imaging']
+    bitmap, counts = index.select(
+        filters={'discoverymethod': methods, 'habitable_zone': ['optimistic']},
+        ranges={'pl_rade': (1.0, 4.0)}
+    )
+
+    method_mask = planets_df['discoverymethod'].isin(methods)
+    zone_mask = planets_df['in_hz_optimistic']
+    radius_mask = planets_df['pl_rade'].between(1.0, 4.0)
+    expected = method_mask & zone_mask & radius_mask
+
+    assert index.mask(bitmap).tolist() == expected.tolist()
+    # Кількість для фасету рахується без його власного фільтра
+    others = planets_df[zone_mask & radius_mask]['discoverymethod'].value_counts()
+    assert counts['discoverymethod'] == {
+        value: int(others.get(value, 0)) for value in counts['discoverymethod']
+    }
+    assert counts['habitable_zone']['optimistic'] == int(expected.sum())
+
+
+def test_ranked_rows_follow_habitability(planets_df):
+    """Рядки результату впорядковані за спаданням індексу, як стабільне сортування pandas"""
+    index = FacetIndex(planets_df)
+    bitmap, _ = index.select(filters={'discoverymethod': ['Radial Velocity']}, with_counts=False)
+
+    selected = planets_df.reset_index(drop=True)
+    selected = selected[selected['discoverymethod'] == 'Radial Velocity']
+    expected = selected.sort_values('habitability_index', ascending=False, kind='stable').index
+
+    assert index.ranked_rows(bitmap).tolist() == expected.tolist()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Тести метрик процесу та пулів потоків
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+# Імпорт модуля для серіалізації стану процесу
+import json
+# Імпорт модуля для запуску дочірнього процесу
+import subprocess
+import sys
+# Імпорт модуля для синхронізації потоків
+import threading
+
+# Імпорт реєстру метрик
+from Project.metrics import MetricsRegistry
+# Імпорт пулу потоків з контекстом запиту
+from Project.timing import ContextThreadPoolExecutor
+
+
+def _dead_pid():
+    """pid процесу, який уже завершився"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_executor_counts_queued_running_and_finished():
+    """Облік задач пулу без внутрішніх полів ThreadPoolExecutor"""
+    release = threading.Event()
+    executor = ContextThreadPoolExecutor(max_workers=1, thread_name_prefix='test-stats')
+    try:
+        first = executor.submit(release.wait)
+        second = executor.submit(release.wait)
+        third = executor.submit(release.wait)
+        third.cancel()
+        while executor.stats()['running'] == 0:
+            threading.Event().wait(0.001)
+
+        assert executor.stats() == {'queued': 1, 'running': 1, 'finished': 0}
+
+        release.set()
+        first.result()
+        second.result()
+    finally:
+        executor.shutdown(wait=True)
+
+    assert executor.stats() == {'queued': 0, 'running': 0, 'finished': 2}
+
+
+def test_dead_worker_files_are_removed(tmp_path):
+    """Стан завершеного воркера не підсумовується і видаляється"""
+    dead = tmp_path / f'{_dead_pid()}.json'
+    dead.write_text(json.dumps({
+        'counters': [['http_requests_total', [['method', 'GET']], 100]],
+        'histograms': [], 'collected': []
+    }))
+    registry = MetricsRegistry(str(tmp_path))
+    registry.inc('http_requests_total', {'method': 'GET'})
+
+    text = registry.render()
+
+    assert 'http_requests_total{method="GET"} 1\n' in text
+    assert not dead.exists()
+    assert (tmp_path / f'{os.getpid()}.json').exists()
+
+
+def test_reset_forgets_inherited_state(tmp_path):
+    """Після fork: лічильники колекторів обнуляються, файл з тим самим pid видаляється"""
+    registry = MetricsRegistry(str(tmp_path))
+    owned = {'hits': 5}
+    registry.register_collector(lambda: [], reset=lambda: owned.update(hits=0))
+    registry.inc('http_requests_total', {'method': 'GET'})
+    registry.flush()
+
+    registry.reset()
+
+    assert owned['hits'] == 0
+    assert not (tmp_path / f'{os.getpid()}.json').exists()
+    assert 'http_requests_total' not in registry.render()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Тести етапів конвеєра обробки каталогу
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+
+# Імпорт оцінки маси за радіусом та співвідношення маса-радіус
+from exoplanets.pipeline import mass_from_radius, MASS_RADIUS_RELATION, JUPITER_MASS
+
+
+def test_mass_from_radius_segment_boundaries():
+    """Радіус точно на межі сегмента отримує масу з наступного сегмента"""
+    (earth_upper, _, _), (neptune_upper, neptune_scale, neptune_slope) = MASS_RADIUS_RELATION
+    mass = mass_from_radius(np.array([earth_upper, neptune_upper]))
+
+    assert np.isfinite(mass).all()
+    assert mass[0] == (earth_upper / neptune_scale) ** (1.0 / neptune_slope)
+    assert mass[1] == JUPITER_MASS
+
+
+def test_mass_from_radius_is_continuous_at_boundary():
+    """Маса майже не змінюється при переході через межу земноподібних планет"""
+    upper = MASS_RADIUS_RELATION[0][0]
+    below, at = mass_from_radius(np.array([np.nextafter(upper, 0.0), upper]))
+
+    assert abs(at - below) / below < 0.05
+
+
+def test_mass_from_radius_unknown_or_invalid_radius():
+    """Невідомий або недодатний радіус - маса невідома"""
+    mass = mass_from_radius(np.array([np.nan, 0.0, -1.0]))
+
+    assert np.isnan(mass).all()
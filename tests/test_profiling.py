@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Тести профілювання запитів за токеном адміністратора
+"""
+
+# Імпорт модуля для роботи з файловою системою
+import os
+
+# Імпорт фреймворку тестування
+import pytest
+
+# Імпорт налаштувань проекту
+from Project.settings import Config
+
+
+@pytest.fixture
+def profiler(monkeypatch, tmp_path):
+    """Профайлер з токеном і окремою директорією профілів"""
+    monkeypatch.setattr(Config, 'PROFILER_TOKEN', 'admin-token')
+    monkeypatch.setattr(Config, 'PROFILER_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_header_token_saves_profile(client, profiler):
+    """Правильний токен у X-Profile - профіль збережено, ім'я файлу в заголовку"""
+    response = client.get('/api/stats', headers={'X-Profile': 'admin-token'})
+
+    assert response.status_code == 200
+    name = response.headers['X-Profile-File']
+    assert os.path.exists(os.path.join(profiler, name))
+
+
+@pytest.mark.parametrize('request_args', [
+    {'query_string': {'profile': 'admin-token'}},
+    {'headers': {'X-Profile': 'wrong'}},
+    {'headers': {'X-Profile': ''}},
+])
+def test_profile_is_not_taken_without_header_token(client, profiler, request_args):
+    """Токен у рядку запиту або неправильний токен - профіль не знімається"""
+    response = client.get('/api/stats', **request_args)
+
+    assert response.status_code == 200
+    assert 'X-Profile-File' not in response.headers
+    assert os.listdir(profiler) == []
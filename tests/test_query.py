@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Тести декларативних запитів: результат плану порівнюється з фільтром pandas
+"""
+
+# Імпорт фреймворку тестування
+import pytest
+
+# Імпорт виконавця запитів та помилки запиту
+from exoplanets.query import QueryEngine, QueryError
+# Імпорт знімка каталогу
+from exoplanets.catalog import CatalogSnapshot
+# Імпорт конвеєра обробки каталогу
+from exoplanets.pipeline import IngestPipeline
+# Імпорт генератора синтетичних каталогів
+from benchmarks.synthetic import generate_catalog
+
+
+@pytest.fixture(scope='module')
+def snapshot():
+    """Знімок обробленого синтетичного каталогу"""
+    planets_df = IngestPipeline().run(generate_catalog(1500, seed=5)).reset_index(drop=True)
+    return CatalogSnapshot(planets_df, 'test-query')
+
+
+def _ranked(frame):
+    """Рядки за спаданням індексу придатності (рейтинг за замовчуванням)"""
+    return frame.sort_values('habitability_index', ascending=False, kind='stable').index.tolist()
+
+
+def _run(snapshot, query):
+    """Усі рядки результату запиту по порядку"""
+    return QueryEngine().run(snapshot, dict(query, limit=None))['positions'].tolist()
+
+
+# Запит -> маска pandas; кожен запит проходить свій шлях виконання плану
+FILTER_CASES = {
+    'name_in': (
+        [{'field': 'pl_name', 'op': 'in', 'value': ['SYN-0000003 b', 'SYN-0000010 b', 'missing']}],
+        lambda df: df['pl_name'].isin(['SYN-0000003 b', 'SYN-0000010 b'])
+    ),
+    'facet_in_and_eq': (
+        [{'field': 'discoverymethod', 'op': 'in', 'value': ['Transit', 'Imaging']},
+         {'field': 'disc_year', 'op': 'eq', 'value': 2020}],
+        lambda df: df['discoverymethod'].isin(['Transit', 'Imaging']) & (df['disc_year'] == 2020)
+    ),
+    'habitable_zone': (
+        [{'field': 'in_hz_optimistic', 'op': 'eq', 'value': True}],
+        lambda df: df['in_hz_optimistic']
+    ),
+    'not_habitable_zone': (
+        [{'field': 'in_hz_conservative', 'op': 'eq', 'value': False}],
+        lambda df: ~df['in_hz_conservative']
+    ),
+    'range_combined': (
+        [{'field': 'pl_rade', 'op': 'gt', 'value': 1.0},
+         {'field': 'pl_rade', 'op': 'lte', 'value': 4.0},
+         {'field': 'sy_dist', 'op': 'between', 'value': [10, 500]}],
+        lambda df: (df['pl_rade'] > 1.0) & (df['pl_rade'] <= 4.0) & df['sy_dist'].between(10, 500)
+    ),
+    'scan': (
+        [{'field': 'st_teff', 'op': 'gte', 'value': 5000},
+         {'field': 'hostname', 'op': 'contains', 'value': '00001'},
+         {'field': 'pl_orbeccen', 'op': 'isnull'}],
+        lambda df: (df['st_teff'] >= 5000) & df['hostname'].str.contains('00001')
+                   & df['pl_orbeccen'].isna()
+    ),
+    'name_with_scan': (
+        [{'field': 'pl_name', 'op': 'in', 'value': [f'SYN-{i:07d} b' for i in range(50)]},
+         {'field': 'habitability_index', 'op': 'gt', 'value': 40}],
+        lambda df: df['pl_name'].isin([f'SYN-{i:07d} b' for i in range(50)]) & (df['habitability_index'] > 40)
+    ),
+}
+
+
+@pytest.mark.parametrize('case', FILTER_CASES)
+def test_filtered_rows_match_pandas(snapshot, case):
+    """Набір рядків та рейтинг збігаються з фільтром pandas"""
+    conditions, expected = FILTER_CASES[case]
+    planets_df = snapshot.planets_df
+    rows = _run(snapshot, {'filter': conditions})
+
+    assert rows == _ranked(planets_df[expected(planets_df)])
+
+
+def test_custom_sort_matches_pandas(snapshot):
+    """Сортування за кількома полями: відсутні значення в кінці"""
+    planets_df = snapshot.planets_df
+    rows = _run(snapshot, {
+        'filter': [{'field': 'discoverymethod', 'op': 'eq', 'value': 'Transit'}],
+        'sort': [{'field': 'sy_dist', 'order': 'asc'}, '-pl_rade']
+    })
+
+    expected = planets_df[planets_df['discoverymethod'] == 'Transit'].sort_values(
+        ['sy_dist', 'pl_rade'], ascending=[True, False], kind='stable', na_position='last')
+    assert rows == expected.index.tolist()
+
+
+def test_pages_are_slices_of_full_result(snapshot):
+    """offset/limit та курсор повертають послідовні зрізи одного результату"""
+    engine = QueryEngine()
+    query = {'filter': [{'field': 'pl_rade', 'op': 'lt', 'value': 3}]}
+    full = _run(snapshot, query)
+
+    first = engine.run(snapshot, dict(query, limit=20))
+    second = engine.run(snapshot, dict(query, offset=20, limit=20))
+
+    assert first['positions'].tolist() == full[:20]
+    assert second['positions'].tolist() == full[20:40]
+    assert first['total'] == len(full)
+    assert first['rows']['pl_name'].tolist() == snapshot.planets_df['pl_name'].iloc[full[:20]].tolist()
+
+
+def test_plan_cache_reuses_plan_for_same_shape():
+    """Запити з різними значеннями, але однаковою формою мають спільний план"""
+    engine = QueryEngine()
+    first, first_params = engine.compile({'filter': [{'field': 'pl_rade', 'op': 'gt', 'value': 1}]})
+    hits = QueryEngine.stats['hits']
+    second, second_params = engine.compile({'filter': [{'field': 'pl_rade', 'op': 'gt', 'value': 2}]})
+
+    assert first is second
+    assert (first_params, second_params) == ([1], [2])
+    assert QueryEngine.stats['hits'] == hits + 1
+
+
+def test_result_cache_is_bounded_by_bytes(snapshot, monkeypatch):
+    """Кеш впорядкованих результатів витісняє найдавніші записи за бюджетом пам'яті"""
+    monkeypatch.setattr(QueryEngine._results, 'max_bytes', len(snapshot) * 8)
+    QueryEngine._results.clear()
+    engine = QueryEngine()
+    results = [engine.run(snapshot, {'filter': [{'field': 'pl_rade', 'op': 'gt', 'value': value}]})
+               for value in (0.5, 1, 2)]
+
+    stats = QueryEngine._results.stats()
+    assert stats['bytes'] <= stats['max_bytes']
+    assert stats['bytes'] == sum(result['total'] for result in results[-stats['entries']:]) * 8
+    assert stats['evictions'] >= 1
+
+
+def test_unknown_field_is_rejected(snapshot):
+    """Неіснуюче поле - помилка запиту, а не KeyError"""
+    with pytest.raises(QueryError):
+        QueryEngine().run(snapshot, {'filter': [{'field': 'nope', 'op': 'eq', 'value': 1}]})
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Тести зведення наборів параметрів
+"""
+
+# Імпорт бібліотеки для роботи з даними
+import pandas as pd
+
+# Імпорт функції зведення наборів параметрів
+from exoplanets.reduction import reduce_parameter_sets
+
+
+def _catalog(names):
+    """Мінімальна таблиця ps з одним виміряним параметром"""
+    return pd.DataFrame({
+        'pl_name': names,
+        'pl_rade': [1.0 + i for i in range(len(names))],
+        'pl_radeerr1': [0.1] * len(names),
+        'pl_radeerr2': [-0.1] * len(names),
+        'default_flag': [1] * len(names),
+    })
+
+
+def test_single_parameter_sets_have_count_column():
+    """Без дублікатів колонка n_parameter_sets теж присутня"""
+    catalog = _catalog(['A b', 'B b'])
+    reduced = reduce_parameter_sets(catalog)
+
+    assert reduced['n_parameter_sets'].tolist() == [1, 1]
+    # Вхідна таблиця не змінюється
+    assert 'n_parameter_sets' not in catalog.columns
+
+
+def test_duplicate_parameter_sets_are_counted():
+    """Кілька наборів однієї планети зводяться в один рядок"""
+    reduced = reduce_parameter_sets(_catalog(['A b', 'A b', 'B b']))
+
+    assert reduced['pl_name'].tolist() == ['A b', 'B b']
+    assert reduced['n_parameter_sets'].tolist() == [2, 1]
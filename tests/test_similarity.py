@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Тести пошуку схожих планет
+"""
+
+# Імпорт бібліотеки для числових обчислень
+import numpy as np
+
+# Імпорт модуля схожості (розмір блоку змінюється в тестах)
+from exoplanets import similarity
+# Імпорт індексу схожості та його параметрів
+from exoplanets.similarity import SimilarityIndex, SIMILARITY_FEATURES, MIN_SHARED_FEATURES
+# Імпорт генератора синтетичних каталогів
+from benchmarks.synthetic import generate_catalog
+
+
+def _brute_force(planets_df, row):
+    """Відстані до всіх планет перебором пар, незалежно від матричної форми"""
+    features = []
+    for column, _, log_scale in SIMILARITY_FEATURES:
+        values = planets_df[column].to_numpy(np.float64)
+        if log_scale:
+            values = np.log10(np.where(values > 0, values, np.nan))
+        features.append((values - np.nanmean(values)) / (np.nanstd(values) or 1.0))
+    features = np.column_stack(features)
+
+    query = features[row]
+    known = ~np.isnan(query)
+    distances = np.full(len(features), np.inf)
+    for other in range(len(features)):
+        common = known & ~np.isnan(features[other])
+        if other == row or common.sum() < min(MIN_SHARED_FEATURES, known.sum()):
+            continue
+        squared = ((features[other, common] - query[common]) ** 2).sum()
+        distances[other] = np.sqrt(squared * len(SIMILARITY_FEATURES) / common.sum())
+    return distances
+
+
+def test_blocked_query_matches_brute_force(monkeypatch):
+    """Блокова kNN з масками пропусків дає тих самих сусідів, що й перебір"""
+    # Маленькі блоки - запит проходить через кілька меж блоків
+    monkeypatch.setattr(similarity, 'BLOCK_SIZE', 37)
+    planets_df = generate_catalog(300, seed=3)
+    # Планета без радіуса та маси порівнюється лише за рештою параметрів
+    row = 5
+    planets_df.loc[row, ['pl_rade', 'pl_masse']] = np.nan
+    index = SimilarityIndex(planets_df)
+
+    expected = _brute_force(planets_df, row)
+    order = np.argsort(expected, kind='stable')[:10]
+    found = index.similar_to(planets_df['pl_name'][row], k=10)
+
+    assert [neighbour[0] for neighbour in found] == order.tolist()
+    np.testing.assert_allclose([neighbour[1] for neighbour in found], expected[order], rtol=1e-9)
+    # Спільних параметрів не більше, ніж відомо для запитаної планети
+    assert all(neighbour[2] <= len(SIMILARITY_FEATURES) - 2 for neighbour in found)
+
+
+def test_planets_without_enough_shared_parameters_are_skipped():
+    """Планета з менш ніж MIN_SHARED_FEATURES спільними параметрами не є сусідом"""
+    planets_df = generate_catalog(50, seed=4)
+    columns = [column for column, _, _ in SIMILARITY_FEATURES]
+    planets_df.loc[0, columns[:-1]] = np.nan
+    index = SimilarityIndex(planets_df)
+
+    rows = [neighbour[0] for neighbour in index.similar_to(planets_df['pl_name'][1], k=len(planets_df))]
+
+    assert 0 not in rows
+    assert 1 not in rows
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Тести пулу потоків з контекстом запиту
+"""
+
+# Імпорт модуля для змінних контексту
+import contextvars
+# Імпорт модуля для ідентифікаторів потоків
+import threading
+
+# Імпорт модуля вимірювання часу (список обгорток змінюється в тестах)
+from Project import timing
+from Project.timing import ContextThreadPoolExecutor, register_task_wrapper
+# Імпорт профілю запиту
+from Project.profiling import RequestProfile, run_tracked, _profile
+
+# Значення контексту, яке має побачити задача пулу
+_marker = contextvars.ContextVar('marker', default=None)
+
+
+def test_task_runs_in_submitting_context(monkeypatch):
+    """Задача бачить контекст запиту і проходить через зареєстровані обгортки"""
+    monkeypatch.setattr(timing, '_task_wrappers', [])
+    calls = []
+
+    def wrapper(fn, *args, **kwargs):
+        calls.append(_marker.get())
+        return fn(*args, **kwargs)
+
+    register_task_wrapper(wrapper)
+    _marker.set('request')
+    with ContextThreadPoolExecutor(max_workers=1, thread_name_prefix='test-context') as executor:
+        result = executor.submit(lambda value: (_marker.get(), value), 42).result()
+
+    assert result == ('request', 42)
+    assert calls == ['request']
+
+
+def test_profiler_tracks_pool_threads():
+    """Профайлер реєструє обгортку: потік пулу входить у профіль запиту на час задачі"""
+    assert run_tracked in timing._task_wrappers
+    profile = RequestProfile(forced=True)
+    token = _profile.set(profile)
+    try:
+        with ContextThreadPoolExecutor(max_workers=1, thread_name_prefix='test-profile') as executor:
+            seen = executor.submit(lambda: set(profile.threads)).result()
+    finally:
+        _profile.reset(token)
+
+    assert len(seen) == 2
+    assert profile.threads == {threading.get_ident()}
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+Точка входу для production сервера (gunicorn)
+Каталог завантажується при імпорті, тобто в головному процесі до fork
+"""
+
+# Імпорт фабрики додатку
+from app import create_app
+
+# Додаток з уже завантаженим, обробленим та проіндексованим каталогом
+app = create_app(warm=True)